@@ -24,52 +24,123 @@ _Proudly made on Planet Earth._
 
 # PEP396:  https://www.python.org/dev/peps/pep-0396/
 from janis_core.__meta__ import __version__
-from janis_core.toolbox.toolbox import JanisShed
-import janis_core.toolbox.entrypoints as entrypoints
-
-# Tools
-from janis_core.tool.tool import Tool, ToolType, TOutput, TInput
-from janis_core.workflow.workflow import (
-    Workflow,
-    WorkflowBuilder,
-    WorkflowBase,
-    DynamicWorkflow,
-)
-from janis_core.tool.commandtool import (
-    CommandTool,
-    CommandToolBuilder,
-    ToolArgument,
-    ToolInput,
-    ToolOutput,
-)
-from janis_core.code.pythontool import PythonTool, CodeTool
-
-# Types
-
-from janis_core.types.data_types import DataType
-from janis_core.types.common_data_types import (
-    Boolean,
-    String,
-    Int,
-    Float,
-    Double,
-    File,
-    Directory,
-    Array,
-    Filename,
-    Stdout,
-    Stderr,
-    GenericFileWithSecondaries,
+
+"""
+The names below are loaded on first access (PEP 562) rather than at import, 
+so 'import janis_core' (and the CLI) doesn't load every type, operator and translator up front. 
+name -> (module, attribute). attribute None means the module itself.
+"""
+
+_LAZY_EXPORTS = {
+    # Toolbox
+    "JanisShed": ("janis_core.toolbox.toolbox", "JanisShed"),
+    "entrypoints": ("janis_core.toolbox.entrypoints", None),
+
+    # Tools
+    "Tool": ("janis_core.tool.tool", "Tool"),
+    "ToolType": ("janis_core.tool.tool", "ToolType"),
+    "TOutput": ("janis_core.tool.tool", "TOutput"),
+    "TInput": ("janis_core.tool.tool", "TInput"),
+    "Workflow": ("janis_core.workflow.workflow", "Workflow"),
+    "WorkflowBuilder": ("janis_core.workflow.workflow", "WorkflowBuilder"),
+    "WorkflowBase": ("janis_core.workflow.workflow", "WorkflowBase"),
+    "DynamicWorkflow": ("janis_core.workflow.workflow", "DynamicWorkflow"),
+    "CommandTool": ("janis_core.tool.commandtool", "CommandTool"),
+    "CommandToolBuilder": ("janis_core.tool.commandtool", "CommandToolBuilder"),
+    "ToolArgument": ("janis_core.tool.commandtool", "ToolArgument"),
+    "ToolInput": ("janis_core.tool.commandtool", "ToolInput"),
+    "ToolOutput": ("janis_core.tool.commandtool", "ToolOutput"),
+    "PythonTool": ("janis_core.code.pythontool", "PythonTool"),
+    "CodeTool": ("janis_core.code.pythontool", "CodeTool"),
+
+    # Types
+    "DataType": ("janis_core.types.data_types", "DataType"),
+    "Boolean": ("janis_core.types.common_data_types", "Boolean"),
+    "String": ("janis_core.types.common_data_types", "String"),
+    "Int": ("janis_core.types.common_data_types", "Int"),
+    "Float": ("janis_core.types.common_data_types", "Float"),
+    "Double": ("janis_core.types.common_data_types", "Double"),
+    "File": ("janis_core.types.common_data_types", "File"),
+    "Directory": ("janis_core.types.common_data_types", "Directory"),
+    "Array": ("janis_core.types.common_data_types", "Array"),
+    "Filename": ("janis_core.types.common_data_types", "Filename"),
+    "Stdout": ("janis_core.types.common_data_types", "Stdout"),
+    "Stderr": ("janis_core.types.common_data_types", "Stderr"),
+    "GenericFileWithSecondaries": ("janis_core.types.common_data_types", "GenericFileWithSecondaries"),
+
+    # Misc
+    "Logger": ("janis_core.utils.logger", "Logger"),
+    "LogLevel": ("janis_core.utils.logger", "LogLevel"),
+    "SupportedTranslation": ("janis_core.translation_deps.supportedtranslations", "SupportedTranslation"),
+    "ScatterDescription": ("janis_core.utils.scatter", "ScatterDescription"),
+    "ScatterMethod": ("janis_core.utils.scatter", "ScatterMethod"),
+    "ScatterMethods": ("janis_core.utils.scatter", "ScatterMethods"),
+    "CaptureType": ("janis_core.hints", "CaptureType"),
+    "Engine": ("janis_core.hints", "Engine"),
+    "HINTS": ("janis_core.hints", "HINTS"),
+    "Hint": ("janis_core.hints", "Hint"),
+    "HintEnum": ("janis_core.hints", "HintEnum"),
+    "HintArray": ("janis_core.hints", "HintArray"),
+    "get_value_for_hints_and_ordered_resource_tuple": ("janis_core.utils", "get_value_for_hints_and_ordered_resource_tuple"),
+    "Metadata": ("janis_core.utils.metadata", "Metadata"),
+    "WorkflowMetadata": ("janis_core.utils.metadata", "WorkflowMetadata"),
+    "ToolMetadata": ("janis_core.utils.metadata", "ToolMetadata"),
+    "apply_secondary_file_format_to_filename": ("janis_core.utils.secondary", "apply_secondary_file_format_to_filename"),
+    "JanisTransformation": ("janis_core.transformation", "JanisTransformation"),
+    "JanisTransformationGraph": ("janis_core.transformation", "JanisTransformationGraph"),
+}
+
+# modules previously star-imported: any of their public names (eg operators) are exported
+_STAR_MODULES = (
+    "janis_core.operators",
+    "janis_core.tool.documentation",
 )
-from janis_core.operators import *
-
-# Misc
-from janis_core.tool.documentation import *
-from janis_core.utils.logger import Logger, LogLevel
-from janis_core.translation_deps.supportedtranslations import SupportedTranslation
-from janis_core.utils.scatter import ScatterDescription, ScatterMethod, ScatterMethods
-from janis_core.hints import CaptureType, Engine, HINTS, Hint, HintEnum, HintArray
-from janis_core.utils import get_value_for_hints_and_ordered_resource_tuple
-from janis_core.utils.metadata import Metadata, WorkflowMetadata, ToolMetadata
-from janis_core.utils.secondary import apply_secondary_file_format_to_filename
-from janis_core.transformation import JanisTransformation, JanisTransformationGraph
+
+
+def __getattr__(name: str):
+    import importlib
+    import pkgutil
+
+    if name == "__all__":
+        return _load_all()
+    
+    if name in _LAZY_EXPORTS:
+        module_name, attr = _LAZY_EXPORTS[name]
+        value = importlib.import_module(module_name)
+        if attr is not None:
+            value = getattr(value, attr)
+    
+    elif any(info.name == name for info in pkgutil.iter_modules(__path__)):
+        # subpackage (eg 'from janis_core import settings') 
+        value = importlib.import_module(f"{__name__}.{name}")
+    
+    else:
+        for module_name in _STAR_MODULES:
+            exports = _star_exports(importlib.import_module(module_name))
+            if name in exports:
+                value = exports[name]
+                break
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+def _star_exports(module) -> dict:
+    """the names 'from module import *' would bind"""
+    if hasattr(module, "__all__"):
+        return {name: getattr(module, name) for name in module.__all__}
+    return {k: v for k, v in vars(module).items() if not k.startswith("_")}
+
+def _load_all() -> list[str]:
+    # 'from janis_core import *': everything, as if imported eagerly
+    for name in _LAZY_EXPORTS:
+        __getattr__(name)
+    for module_name in _STAR_MODULES:
+        import importlib
+        for name, value in _star_exports(importlib.import_module(module_name)).items():
+            globals().setdefault(name, value)
+    return [name for name in globals() if not name.startswith("_")]
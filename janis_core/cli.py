@@ -2,23 +2,45 @@
 
 import argparse
 import sys 
+from typing import Any
 
 from janis_core.ingestion import SupportedIngestion 
 from janis_core.translation_deps.supportedtranslations import SupportedTranslation
-from janis_core.ingestion import ingest
-from janis_core.translations import translate
 
 
 def main() -> None:
     sysargs = sys.argv[1:]
     args_namespace = parse_args(sysargs)
     args_dict = interpret_args(args_namespace)
-    do_translate(args_dict)
+    if args_dict['batch']:
+        do_batch_translate(args_dict)
+    else:
+        do_translate(args_dict)
 
 def do_translate(args: dict[str, str]) -> None:
+    # imported here so 'janis translate --help' doesn't load every ingestor / translator
+    from janis_core.ingestion import ingest
+    from janis_core.translations import translate
     internal = ingest(args['infile'], args['from']) 
     return translate(internal, dest_fmt=args['to'], mode=args['mode'], export_path=args['outdir'], as_workflow=args['as_workflow'])
 
+def do_batch_translate(args: dict[str, Any]) -> None:
+    from janis_core.translations.batch import read_manifest
+    from janis_core.translations.batch import build_jobs
+    from janis_core.translations.batch import translate_many
+    infiles = read_manifest(args['batch'])
+    jobs = build_jobs(infiles, args['from'], args['to'], args['outdir'], mode=args['mode'], as_workflow=args['as_workflow'])
+    results = translate_many(jobs, workers=args['jobs'])
+    
+    # summary
+    failed = [r for r in results if not r.success]
+    print(f'translated {len(results) - len(failed)}/{len(results)} files to {args["outdir"]}')
+    for result in failed:
+        assert(result.error)
+        print(f'FAILED {result.job.infile}: {result.error.strip().splitlines()[-1]}')
+    if failed:
+        sys.exit(1)
+
 def interpret_args(args: argparse.Namespace) -> dict[str, str]:
     out: dict[str, str] = {}
     for key, val in args._get_kwargs():  # workaround for '--from' name: usually a python error.
@@ -34,6 +56,10 @@ def interpret_args(args: argparse.Namespace) -> dict[str, str]:
             out['outdir'] = val
         elif key == 'as_workflow':
             out['as_workflow'] = val
+        elif key == 'batch':
+            out['batch'] = val
+        elif key == 'jobs':
+            out['jobs'] = val
     return out
 
 def parse_args(sysargs: list[str]) -> argparse.Namespace:
@@ -42,6 +68,19 @@ def parse_args(sysargs: list[str]) -> argparse.Namespace:
     parser.add_argument(
         "infile", 
         help="Path to input file",
+        nargs="?",
+    )
+    parser.add_argument(
+        "--batch",
+        help="Translate each file listed in this manifest (one path per line, relative to the manifest) \
+        instead of infile. Each is written to its own folder in the output directory.",
+        type=str,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of files translated at once in batch mode (default: number of CPUs).",
+        type=int,
     )
     parser.add_argument(
         "--from",
@@ -78,5 +117,8 @@ def parse_args(sysargs: list[str]) -> argparse.Namespace:
         default="extended"
     )
 
-    return parser.parse_args(sysargs)
+    args = parser.parse_args(sysargs)
+    if (args.infile is None) == (args.batch is None):
+        parser.error('provide either infile or --batch')
+    return args
 
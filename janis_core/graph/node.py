@@ -5,9 +5,10 @@
 """
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, TYPE_CHECKING
 
-from janis_core.tool.tool import TInput, TOutput
+if TYPE_CHECKING:
+    from janis_core.tool.tool import TInput, TOutput
 
 NodeLabel = str
 
@@ -87,13 +88,13 @@ class Node(object):
         return False
 
     @abstractmethod
-    def inputs(self) -> Dict[str, TInput]:
+    def inputs(self) -> Dict[str, "TInput"]:
         raise Exception(
             f"Subclass {type(self)} must implement inputs, return dict: key: ToolInput"
         )
 
     @abstractmethod
-    def outputs(self) -> Dict[str, TOutput]:
+    def outputs(self) -> Dict[str, "TOutput"]:
         raise Exception(
             f"Subclass {type(self)} must implement outputs, return dict: key: ToolOutput"
         )
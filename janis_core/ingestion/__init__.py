@@ -3,4 +3,6 @@
 # public ingest api
 
 from .main import ingest
+from .main import ingest_many
+from .main import IngestResult
 from .SupportedIngestion import SupportedIngestion
@@ -2,6 +2,8 @@
 
 from .fileio import safe_init_file
 from .fileio import safe_init_folder
+from .fileio import atomic_write
+from .fileio import JsonFileCache
 
 
 from .graph import add_step_edges_to_graph
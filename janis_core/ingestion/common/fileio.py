@@ -1,7 +1,13 @@
 
 
+import json
 import os 
 import shutil
+import threading
+from typing import Any, Callable, Optional
+from uuid import uuid4
+from filelock import FileLock
+
 PERMISSIONS=0o777
 
 def safe_init_file(path: str, override: bool=False, contents: str='') -> None:
@@ -14,4 +20,91 @@ def safe_init_folder(path: str, override: bool=False) -> None:
     if override:
         if os.path.isdir(path):
             shutil.rmtree(path)
-    os.makedirs(path, PERMISSIONS, exist_ok=True)
\ No newline at end of file
+    os.makedirs(path, PERMISSIONS, exist_ok=True)
+
+def atomic_write(path: str, contents: str | bytes) -> None:
+    """
+    writes to a temp file then renames over path. 
+    readers (including other processes) never see a partially written file.
+    """
+    dirname = os.path.dirname(path)
+    safe_init_folder(dirname)
+    tmp_path = f'{path}.{os.getpid()}.{uuid4().hex}.tmp'
+    mode = 'wb' if isinstance(contents, bytes) else 'w'
+    try:
+        with open(tmp_path, mode) as fp:
+            fp.write(contents)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class JsonFileCache:
+    """
+    json file shared by threads & processes (eg a persistent cache of web requests).
+    read() reloads the file whenever it has changed (mtime, size) since last load.
+    update() re-reads the file under a file lock before merging & writing, so
+    entries added by other processes aren't lost.
+    subclasses provide the path (which may change via settings) and default contents.
+    """
+
+    def __init__(self) -> None:
+        self.data: Any = self.default()
+        self.loaded_path: Optional[str] = None
+        self.signature: Optional[tuple[int, int]] = None
+        self.thread_lock = threading.RLock()
+
+    @property
+    def path(self) -> str:
+        raise NotImplementedError
+
+    def default(self) -> Any:
+        """contents when the file is missing or corrupt"""
+        return {}
+
+    def read(self) -> Any:
+        """file contents, reloaded if changed since last read"""
+        with self.thread_lock:
+            self._refresh()
+            return self.data
+
+    def update(self, merge: Callable[[Any], None]) -> Any:
+        """applies merge() to the current file contents and saves. returns the new contents"""
+        with self.thread_lock:
+            path = self.path
+            safe_init_folder(os.path.dirname(path))
+            with FileLock(f'{path}.lock'):
+                # always reloaded: a concurrent write can leave the same (mtime, size) signature
+                data = self._load(path)
+                merge(data)
+                atomic_write(path, json.dumps(data))
+                self.loaded_path = path
+                self.data = data
+                self.signature = _file_signature(path)
+            return data
+
+    def _refresh(self) -> None:
+        path = self.path
+        if self.loaded_path != path:
+            self.loaded_path = path
+            self.data = self.default()
+            self.signature = None
+        if not os.path.exists(path):
+            return
+        signature = _file_signature(path)
+        if signature != self.signature:
+            self.data = self._load(path)
+            self.signature = signature
+
+    def _load(self, path: str) -> Any:
+        try:
+            with open(path, 'r') as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return self.default()  # missing or corrupt: rebuilt as entries are added
+
+def _file_signature(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
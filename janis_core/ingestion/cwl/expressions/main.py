@@ -1,9 +1,11 @@
 
 
 import os
+from functools import lru_cache
 from lark import Lark
 from lark import Tree
 from lark import Token
+from lark.exceptions import LarkError
 from typing import Tuple, Any, Optional
 import regex as re
 from copy import deepcopy
@@ -15,6 +17,7 @@ from janis_core.messages import LogLine
 from janis_core.messages import ErrorCategory
 
 GRAMMAR_PATH = f'{os.path.dirname(os.path.abspath(__file__))}/grammar.ebnf'
+LALR_GRAMMAR_PATH = f'{os.path.dirname(os.path.abspath(__file__))}/grammar_lalr.ebnf'
 
 def parse_expression(
     expr: Any, 
@@ -113,6 +116,55 @@ def get_token_for_expr(expr: str, loglines: list[LogLine]) -> Optional[str]:
     return None
 
 
+
+"""
+Expression parsing engine.
+Expressions are parsed with an LALR port of grammar.ebnf (grammar_lalr.ebnf).
+The few the LALR grammar can't handle fall back to the original Earley grammar.
+Parsers are built on first use, and the LALR parser is serialised by lark (cache=True)
+so later runs load it rather than rebuilding.
+Parse trees are kept in an LRU cache keyed by expression text. Trees are never
+modified by ExpressionParser, so each call still builds fresh janis objects from them.
+"""
+
+@lru_cache(maxsize=None)
+def lalr_parser() -> Lark:
+    with open(LALR_GRAMMAR_PATH) as fp:
+        grammar = fp.read()
+    return Lark(grammar, start='the_text', parser='lalr', cache=True)
+
+@lru_cache(maxsize=None)
+def earley_parser() -> Lark:
+    with open(GRAMMAR_PATH) as fp:
+        grammar = fp.read()
+    return Lark(grammar, start='the_text')
+
+@lru_cache(maxsize=4096)
+def parse_tree(expr: str) -> Optional[Tree]:
+    """parse tree for expr, or None if it can't be parsed"""
+    try:
+        return _strip_whitespace_text(lalr_parser().parse(expr))
+    except LarkError:
+        pass
+    try:
+        return earley_parser().parse(expr)
+    except LarkError:
+        return None
+
+def _strip_whitespace_text(tree: Tree) -> Tree:
+    # whitespace-only text at either end is dropped (as the Earley grammar does)
+    if tree.data != 'the_text':
+        return tree
+    parts = list(tree.children)
+    if parts and parts[0].data == 'text' and parts[0].children[0].isspace():
+        parts = parts[1:]
+    if parts and parts[-1].data == 'text' and parts[-1].children[0].isspace():
+        parts = parts[:-1]
+    if len(parts) == 1:
+        return parts[0]
+    return Tree(tree.data, parts)
+
+
 class ExpressionParser:
 
     def __init__(self, context: str, workflow: Optional[j.WorkflowBuilder]=None):
@@ -152,13 +204,11 @@ class ExpressionParser:
         'div': j.DivideOperator,
     }
     
-    with open(GRAMMAR_PATH) as fp:
-        grammar = fp.read()
-    parser = Lark(grammar, start='the_text')
-
     def parse(self, expr: str) -> Tuple[Any, bool]:
+        tree = parse_tree(expr)
+        if tree is None:
+            return None, False
         try:
-            tree = self.parser.parse(expr)
             return self.parse_node(tree), True
         except Exception as e:
             return None, False
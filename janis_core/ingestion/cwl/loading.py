@@ -1,5 +1,5 @@
 
-import ruamel.yaml
+import os
 from typing import Any, Optional
 from janis_core import settings
 from janis_core.messages import log_message
@@ -10,17 +10,41 @@ from .preprocessing import handle_inline_cltool_identifiers
 
 DEFAULT_PARSER_VERSION = "v1.2"
 
+"""
+Each cwl document is read & parsed (YAML) once: the tree used to find the cwlVersion
+is handed to cwl_utils (load_document_by_yaml) rather than parsed again. 
+cwl_utils modifies the tree while loading, so it is only used for that one load.
+The cwl_utils fetcher (http session & cache) is created once per version and 
+shared by every document loaded during an ingest (see clear_document_cache()).
+These caches are module globals, cleared by each top-level parse(): like the message
+log & settings, this means cwl ingestion is not thread-safe. 
+Run concurrent ingests in separate processes (see ingestion.ingest_many()).
+"""
+
+_YAML_CACHE: dict[str, Any] = {}
+_FETCHERS: dict[str, Any] = {}
+
+def clear_document_cache() -> None:
+    _YAML_CACHE.clear()
+    _FETCHERS.clear()
+
+def _doc_path(doc: str) -> str:
+    if doc.startswith("file://"):
+        doc = doc[7:]
+    return os.path.abspath(doc)
+
+def load_yaml(doc: str) -> Any:
+    """reads & parses a cwl document using the cwl_utils YAML loader"""
+    from cwl_utils.parser.cwl_v1_2 import yaml_no_ts
+    path = _doc_path(doc)
+    if path not in _YAML_CACHE:
+        with open(path) as fp:
+            _YAML_CACHE[path] = yaml_no_ts().load(fp)
+    return _YAML_CACHE[path]
 
 def load_cwl_version(doc: str) -> str:
     """loads a cwl document & returns the version field"""
-    
-    # adjust file path
-    if doc.startswith("file://"):
-        doc = doc[6:]
-
-    # load tool into memory
-    with open(doc) as fp:
-        tool_dict = ruamel.yaml.load(fp, Loader=ruamel.yaml.Loader) # type: ignore
+    tool_dict = load_yaml(doc)
     
     if "cwlVersion" not in tool_dict:
         if settings.ingest.cwl.REQUIRE_CWL_VERSION: 
@@ -41,7 +65,11 @@ def load_cwl_document(doc: str, version: Optional[str]=None) -> Any:
         version = load_cwl_version(doc)
 
     cwl_utils = load_cwl_utils_from_version(version)
-    loaded_doc = cwl_utils.load_document(doc)  # type: ignore
+    tree = load_yaml(doc)
+    _YAML_CACHE.pop(_doc_path(doc), None)  # modified by cwl_utils during load
+    uri = cwl_utils.file_uri(_doc_path(doc))
+    loading_options = cwl_utils.LoadingOptions(fetcher=_get_fetcher(cwl_utils), fileuri=uri)
+    loaded_doc = cwl_utils.load_document_by_yaml(tree, uri, loading_options)  # type: ignore
 
     # convert yaml datatypes to python datatypes
     loaded_doc = convert_cwl_types_to_python(loaded_doc, cwl_utils)
@@ -52,6 +80,12 @@ def load_cwl_document(doc: str, version: Optional[str]=None) -> Any:
 
     return loaded_doc
 
+def _get_fetcher(cwl_utils: Any) -> Any:
+    # LoadingOptions() sets up a fetcher (http session & cache): done once per version
+    if cwl_utils.__name__ not in _FETCHERS:
+        _FETCHERS[cwl_utils.__name__] = cwl_utils.LoadingOptions().fetcher
+    return _FETCHERS[cwl_utils.__name__]
+
 
 
 def convert_etool_to_cltool(etool: Any, version: str) -> Any:
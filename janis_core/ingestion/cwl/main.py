@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import os
+import copy
 
 from typing import Any, Optional
 import janis_core as j
@@ -13,6 +14,7 @@ CommandLineTool = CommandLineTool_1_0 | CommandLineTool_1_1 | CommandLineTool_1_
 
 from janis_core.workflow.workflow import StepNode, OutputNode
 from janis_core.utils.errors import UnsupportedError
+from janis_core.utils.logger import Logger
 from janis_core.messages import log_message
 from janis_core.messages import ErrorCategory
 
@@ -21,6 +23,7 @@ from ..common import get_id_entity
 from .loading import load_cwl_version
 from .loading import load_cwl_utils_from_version
 from .loading import load_cwl_document
+from .loading import clear_document_cache
 from .loading import convert_etool_to_cltool
 
 from ..common import add_step_edges_to_graph
@@ -33,30 +36,49 @@ from .parsing.workflow import WorkflowStepModifierParser
 
 
 
-parsed_cache = {}
+"""
+parsed_cache: janis entities ingested from external 'run:' files, so a tool referenced 
+by many steps is only loaded, validated & converted once. 
+keyed by (resolved path, mtime). each step receives its own copy of the entity. 
+cleared for each top-level parse(), as messages logged during ingestion are per ingest.
+(so, along with loading.py caches, a parse() isn't thread-safe: use processes for concurrent ingests)
+"""
+parsed_cache: dict[tuple[str, int], j.Tool] = {}
 
 def parse(doc: str, base_uri: Optional[str]=None) -> j.Tool:
     # main entry point to ingest a cwl file    
-    initial_wd = os.getcwd()
-    if base_uri:
-        _swap_directory(base_uri)
-
-    parser = CWlParser(doc, base_uri)
+    parsed_cache.clear()
+    clear_document_cache()
+    return _parse(doc, base_uri)
+
+def parse_cached(doc: str, base_uri: Optional[str]=None) -> j.Tool:
+    """parse(), reusing the entity if this file was already ingested"""
+    path = _resolve_path(doc, base_uri)
+    key = (path, os.stat(path).st_mtime_ns)
+    if key in parsed_cache:
+        Logger.debug(f"cwl ingest cache hit: {path}")
+    else:
+        parsed_cache[key] = _parse(doc, base_uri)
+    return copy.deepcopy(parsed_cache[key])
+
+def _resolve_path(doc: str, base_uri: Optional[str]=None) -> str:
+    return os.path.realpath(_absolute_path(doc, base_uri))
+
+def _absolute_path(doc: str, base_uri: Optional[str]=None) -> str:
+    # relative docs are resolved against base_uri (not the working directory)
+    if doc.startswith("file://"):
+        doc = doc[7:]
+    if base_uri and not os.path.isabs(doc):
+        if base_uri.startswith("file://"):
+            base_uri = base_uri[7:]
+        doc = os.path.join(base_uri, doc)
+    return os.path.abspath(doc)
+
+def _parse(doc: str, base_uri: Optional[str]=None) -> j.Tool:
+    # no os.chdir(): paths are resolved here, so the working directory is never changed
+    parser = CWlParser(_absolute_path(doc, base_uri), base_uri)
     cwl_entity = load_cwl_document(parser.doc, parser.version)
-    janis_entity = parser.ingest(cwl_entity)
-
-    if base_uri:
-        _revert_directory(initial_wd)
-
-    return janis_entity
-
-def _swap_directory(directory: str) -> None:
-    if directory.startswith("file://"):
-        directory = directory[6:]
-    os.chdir(directory)
-
-def _revert_directory(directory: str) -> None:
-    os.chdir(directory)
+    return parser.ingest(cwl_entity)
 
 
 
@@ -129,7 +151,7 @@ class CWlParser:
         if isinstance(cwlstp.run, (self.cwl_utils.CommandLineTool, self.cwl_utils.Workflow)):
             tool = self.ingest(cwlstp.run)
         else:
-            tool = parse(cwlstp.run, os.path.dirname(self.doc))
+            tool = parse_cached(cwlstp.run, os.path.dirname(self.doc))
 
         # if _foreach is not None:
         #     wf.has_scatter = True
@@ -1,9 +1,13 @@
 
 
-
+import hashlib
+import os
+import pickle
 import yaml
-from typing import Optional
+from typing import Any, Optional
 from janis_core.settings.ingest.galaxy import DATATYPES_YAML
+from janis_core.settings.ingest.galaxy import DATATYPES_COMPILED
+from janis_core.ingestion.common import atomic_write
 
 from .JanisDatatype import JanisDatatype
 
@@ -13,25 +17,30 @@ class DatatypeRegister:
     def __init__(self):
         self.format_map: dict[str, JanisDatatype] = {}
         self.extension_map: dict[str, JanisDatatype] = {}
+        self.populated: bool = False
 
     def get_from_extension(self, extension: str) -> Optional[JanisDatatype]:
+        self.populate()
         if extension in self.extension_map:
             return self.extension_map[extension]
 
     def get_from_format(self, format: str) -> Optional[JanisDatatype]:
+        self.populate()
         if format in self.format_map:
             return self.format_map[format]
 
-    def populate(self) -> None:
+    def populate(self, force: bool=False) -> None:
         """
         func loads the combined datatype yaml then converts it to dict with format as keys
         provides structue where we can search all the galaxy and janis types given what we see
         in galaxy 'format' attributes.
+        only happens once per process (unless force=True). 
         """
-        path = DATATYPES_YAML
-        with open(path, 'r') as fp:
-            datatypes = yaml.safe_load(fp)
-        for type_data in datatypes['types']:
+        if self.populated and not force:
+            return
+        self.format_map = {}
+        self.extension_map = {}
+        for type_data in load_datatypes():
             janistype = self._init_type(type_data)
             
             # multiple keys per datatype
@@ -39,6 +48,7 @@ class DatatypeRegister:
             if janistype.extensions is not None:
                 for ext in janistype.extensions.split(','):
                     self.extension_map[ext] = janistype
+        self.populated = True
 
     def _init_type(self, dtype: dict[str, str]) -> JanisDatatype:
         return JanisDatatype(
@@ -50,6 +60,54 @@ class DatatypeRegister:
         )
 
 
+### LOADING ###
+
+"""
+Parsing janis_types.yaml is slow, so a precompiled (pickled) copy of its
+contents is shipped alongside as janis_types.pickle. 
+The pickle stores the md5 of the yaml it was built from. If the yaml has since 
+been edited, the yaml is parsed instead and the pickle is rebuilt (if writable).
+"""
+
+def load_datatypes() -> list[dict[str, Any]]:
+    yaml_md5 = _yaml_md5()
+    compiled = _load_compiled()
+    if compiled is not None and compiled['yaml_md5'] == yaml_md5:
+        return compiled['types']
+    types = _load_yaml()
+    try:
+        compile_datatypes(types, yaml_md5)
+    except OSError:
+        pass  # read-only install: keep using the yaml
+    return types
+
+def compile_datatypes(types: Optional[list[dict[str, Any]]]=None, yaml_md5: Optional[str]=None) -> None:
+    """(re)builds janis_types.pickle from janis_types.yaml"""
+    types = types if types is not None else _load_yaml()
+    yaml_md5 = yaml_md5 if yaml_md5 is not None else _yaml_md5()
+    compiled = {'yaml_md5': yaml_md5, 'types': types}
+    atomic_write(DATATYPES_COMPILED, pickle.dumps(compiled, protocol=4))
+
+def _load_yaml() -> list[dict[str, Any]]:
+    with open(DATATYPES_YAML, 'r') as fp:
+        datatypes = yaml.safe_load(fp)
+    return datatypes['types']
+
+def _load_compiled() -> Optional[dict[str, Any]]:
+    if not os.path.exists(DATATYPES_COMPILED):
+        return None
+    try:
+        with open(DATATYPES_COMPILED, 'rb') as fp:
+            return pickle.load(fp)
+    except Exception:
+        return None
+
+def _yaml_md5() -> str:
+    with open(DATATYPES_YAML, 'rb') as fp:
+        return hashlib.md5(fp.read()).hexdigest()
+
+
 # SINGLETON
 register = DatatypeRegister()
 
+
@@ -1,10 +1,12 @@
 
 from . import patterns
+from .compiled import compile_pattern
 
 from .matches import get_matches
 from .matches import get_next_word
 from .matches import get_preceeding_dashes
 from .matches import get_quoted_sections
+from .matches import QuotedSections
 from .matches import find_unquoted
 
 from .checks import is_int
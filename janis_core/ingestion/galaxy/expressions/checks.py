@@ -9,6 +9,7 @@ from .patterns import (
 )
 
 from .matches import get_matches
+from .compiled import compile_pattern
 
 def is_int(the_string: str) -> bool:
     matches = get_matches(the_string, INTEGER)
@@ -41,6 +42,6 @@ def has_var(the_string: str) -> bool:
 
 def is_present(word: str, text: str) -> bool:
     pattern = rf'(^|[\t ]){word}(?=\s).*$'
-    if re.findall(pattern, text, re.MULTILINE):
+    if compile_pattern(pattern, re.MULTILINE).search(text):
         return True
     return False
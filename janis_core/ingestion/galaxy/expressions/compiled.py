@@ -0,0 +1,30 @@
+
+
+from functools import lru_cache
+import regex as re
+
+from . import patterns
+
+"""
+Compiled regex patterns.
+Everything in patterns.py is compiled once at import (REGISTRY).
+Patterns built at runtime (eg per param name) are compiled on first use
+and kept in an LRU cache, so are not recompiled for each call.
+"""
+
+REGISTRY: dict[str, re.Pattern[str]] = {
+    value: re.compile(value)
+    for name, value in vars(patterns).items()
+    if name.isupper() and isinstance(value, str)
+}
+
+
+def compile_pattern(expression: str, flags: int=0) -> re.Pattern[str]:
+    """returns the compiled form of expression"""
+    if flags == 0 and expression in REGISTRY:
+        return REGISTRY[expression]
+    return _compile_dynamic(expression, flags)
+
+@lru_cache(maxsize=2048)
+def _compile_dynamic(expression: str, flags: int) -> re.Pattern[str]:
+    return re.compile(expression, flags)
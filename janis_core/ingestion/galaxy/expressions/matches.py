@@ -1,58 +1,74 @@
 
 
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Optional, Tuple
 import regex as re
-import numpy as np
 
 from .patterns import QUOTED_SECTION 
+from .compiled import compile_pattern
 
 
 def get_matches(the_string: str, expression: str) -> list[re.Match[str]]:
-    matches = re.finditer(expression, the_string)
+    matches = compile_pattern(expression).finditer(the_string)
     return [m for m in matches]
 
 def get_next_word(word: str, delim: str, text: str) -> Optional[str]:
     NEXT_WORD = r'(?<=(?:\s|^))' + f'{word}{delim}' + r'+?([\w\d\'"${}\\_.\-\:/]+)(?=\s|$)'
-    matches = re.finditer(NEXT_WORD, text)
-    matches = [m for m in matches]
-    if matches:
-        value = matches[0].group(1)
+    match = compile_pattern(NEXT_WORD).search(text)
+    if match:
+        value = match.group(1)
         value = value.strip('"\'')
         return value
     return None
 
 def get_preceeding_dashes(search_term: str, text: str) -> list[str]:
     PRECEEDING_DASHES = r'(?<![$.{])(-+?)' + fr'({search_term})' + r'(?=[\s=:]|$|[\'"])'
-    matches = re.finditer(PRECEEDING_DASHES, text)
+    matches = compile_pattern(PRECEEDING_DASHES).finditer(text)
     return [m.group(1) for m in matches]
 
-def get_quoted_sections(the_string: str):
-    # find the areas of the string which are quoted
-    matches = re.finditer(QUOTED_SECTION, the_string)
-    quoted_sections = [(m.start(), m.end()) for m in matches]
+class QuotedSections:
+    """
+    index of the quoted sections of a string.
+    sections are non-overlapping, so are held as sorted start / end offsets 
+    and queried with bisect (no per-character mask).
+    """
 
-    # transform to mask
-    quotes_mask = np.zeros(len(the_string)) # type: ignore
-    for start, end in quoted_sections:
-        quotes_mask[start: end] = 1
-    
-    return quotes_mask
+    def __init__(self, the_string: str) -> None:
+        matches = compile_pattern(QUOTED_SECTION).finditer(the_string)
+        spans = [(m.start(), m.end()) for m in matches]
+        self.starts: tuple[int, ...] = tuple(start for start, _ in spans)
+        self.ends: tuple[int, ...] = tuple(end for _, end in spans)
+
+    def __getitem__(self, pos: int) -> bool:
+        return self.is_quoted(pos)
+
+    def is_quoted(self, pos: int) -> bool:
+        """whether the character at pos is within a quoted section"""
+        i = bisect_right(self.starts, pos) - 1
+        return i >= 0 and pos < self.ends[i]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """whether any character in [start, end) is within a quoted section"""
+        if start >= end:
+            return False
+        i = bisect_right(self.ends, start)
+        return i < len(self.starts) and self.starts[i] < end
+
+@lru_cache(maxsize=1024)
+def get_quoted_sections(the_string: str) -> QuotedSections:
+    # the same lines / statements are checked repeatedly: built once per string
+    return QuotedSections(the_string)
 
 def find_unquoted(the_string: str, pattern: str) -> Tuple[int, int]:
     """
     finds the pattern in string. ensures section is not quoted. 
     """
     # find quoted sections of input string
-    quotes_mask = get_quoted_sections(the_string)
+    quoted_sections = get_quoted_sections(the_string)
     
-    # get pattern match locations
-    matches = re.finditer(pattern, the_string)
-    match_spans = [(m.start(), m.end()) for m in matches]
-
-    # check each match to see if its in a quoted section
-    if len(match_spans) > 0:
-        for start, end in match_spans:
-            if sum(quotes_mask[start: end]) == 0:
-                # return position of first unquoted match
-                return start, end
+    # return position of first unquoted match
+    for m in compile_pattern(pattern).finditer(the_string):
+        if not quoted_sections.overlaps(m.start(), m.end()):
+            return m.start(), m.end()
     return -1, -1
@@ -75,6 +75,7 @@ class SimpleInlineBoolAnnotator:
         self.command = command
         self.main_stmt = main_stmt
         self.xmltool = xmltool
+        self.appearences = analysis.index_appearences(main_stmt)
 
     def annotate(self) -> None:
         components: list[InputComponent] = []
@@ -120,7 +121,7 @@ class SimpleInlineBoolAnnotator:
         <param name="ignore_overlaps" argument="-x/--ignore-overlaps" type="boolean" truevalue="-x" falsevalue="" checked="False" label="Disable read-pair overlap detection" />
         <param name="skip_anomalous_read_pairs" argument="-A/--count-orphans" type="boolean" truevalue="-A" falsevalue="" checked="False" label="Do not discard anomalous read pairs" />
         """
-        appearence = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
+        appearence = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
 
         # ensure that cmdstr appearence is a single word, and that word is a variable
         if not analysis.is_simple_variable(appearence.text):
@@ -165,7 +166,7 @@ class SimpleInlineBoolAnnotator:
         <param argument="--reference" type="boolean" value="False" truevalue="mm10" falsevalue="hg38"...
         
         """
-        appearence = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
+        appearence = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
 
         # param has argument & both options have values
         if analysis.is_simple_option(appearence.text):
@@ -188,7 +189,7 @@ class SimpleInlineBoolAnnotator:
 
     def handle_as_simple_option(self, param: XMLBoolParam) -> list[InputComponent]:
         components: list[InputComponent] = []
-        appearence = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
+        appearence = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
         
         if analysis.is_simple_option(appearence.text):
             prefix, separator, param_ref = analysis.extract_simple_option(appearence.text)
@@ -219,6 +220,7 @@ class SimpleMultilineBoolAnnotator:
         self.command = command
         self.main_stmt = main_stmt
         self.xmltool = xmltool
+        self.appearences = analysis.index_appearences(main_stmt)
 
     def annotate(self) -> None:
         # components we will extract
@@ -237,7 +239,7 @@ class SimpleMultilineBoolAnnotator:
             update_command(self.command, component)
     
     def is_simple_multiline_bool(self, param: XMLParam) -> bool:
-        appearences = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.MULTILINE_BOOL)
+        appearences = self.appearences.get(param, filter_to=CmdstrReferenceType.MULTILINE_BOOL)
         for appearence in appearences:
             prefix = self.get_simple_prefix(appearence.text)
             if prefix:
@@ -245,7 +247,7 @@ class SimpleMultilineBoolAnnotator:
         return False
 
     def handle_simple_multiline_bool(self, param: XMLParam) -> InputComponent:
-        appearences = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.MULTILINE_BOOL)
+        appearences = self.appearences.get(param, filter_to=CmdstrReferenceType.MULTILINE_BOOL)
         for appearence in appearences:
             prefix = self.get_simple_prefix(appearence.text)
             if prefix:
@@ -276,6 +278,7 @@ class SimpleSelectAnnotator:
         self.command = command
         self.main_stmt = main_stmt
         self.xmltool = xmltool
+        self.appearences = analysis.index_appearences(main_stmt)
 
     def annotate(self) -> None:
         components: list[InputComponent] = []
@@ -327,27 +330,27 @@ class SimpleSelectAnnotator:
         return flags
     
     def looks_like_simple_option_selector(self, param: XMLSelectParam) -> bool:
-        appearence = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
+        appearence = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
         if analysis.is_simple_option(appearence.text):
             return True
         return False
     
     def handle_as_simple_option_selector(self, param: XMLSelectParam) -> Option:
-        appearence = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
+        appearence = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
         prefix, separator, value = analysis.extract_simple_option(appearence.text)
         option = factory.option(prefix=prefix, separator=separator, gxparam=param)
         option.values.add(value)
         return option
     
     def looks_like_compound_option_selector(self, param: XMLSelectParam) -> bool:
-        appearence = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
+        appearence = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
         if analysis.is_compound_option(appearence.text):
             # print('--- FOUND COMPOUND OPTION ---')
             return True
         return False
     
     def handle_as_compound_option_selector(self, param: XMLSelectParam) -> Option:
-        appearence = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
+        appearence = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
         prefix, separator, param_ref = analysis.extract_compound_option(appearence.text)
         option = factory.option(prefix=prefix, separator=separator, gxparam=param)
         option.values.add(param_ref)
@@ -368,6 +371,7 @@ class OptionParamAnnotator:
         self.command = command
         self.main_stmt = main_stmt
         self.xmltool = xmltool
+        self.appearences = analysis.index_appearences(main_stmt)
 
     def annotate(self) -> None:
         components: list[InputComponent] = []
@@ -385,7 +389,7 @@ class OptionParamAnnotator:
             update_command(self.command, comp)
 
     def looks_like_simple_option(self, param: XMLParam) -> bool:
-        appearences = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)
+        appearences = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)
         
         # ensure single inline plain text appearence (all appearences are the same)
         # need to do it this way due to macros or reuse of the same param in different logic blocks
@@ -402,7 +406,7 @@ class OptionParamAnnotator:
 
     def handle_as_simple_option(self, param: XMLParam) -> Tuple[InputComponent, str]:
         # create option
-        appearence = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
+        appearence = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)[0]
         prefix, separator, value = analysis.extract_simple_option(appearence.text)
         option = factory.option(prefix=prefix, separator=separator, gxparam=param)
         option.values.add(value)
@@ -425,6 +429,7 @@ class LocalCmdstrAnnotator:
         self.command = command
         self.main_stmt = main_stmt
         self.xmltool = xmltool
+        self.appearences = analysis.index_appearences(main_stmt)
 
     def annotate(self) -> None:
         identified_components: list[CommandComponent] = []
@@ -440,7 +445,7 @@ class LocalCmdstrAnnotator:
 
         for param in available_params:
             pooled_components: list[CommandComponent] = []
-            appearences = analysis.get_cmdstr_appearences(self.main_stmt, param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)
+            appearences = self.appearences.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)
             
             for appearence in appearences:
                 epath_count = 0
@@ -2,9 +2,11 @@
 
 import regex as re
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum, auto
 from typing import Optional, Tuple
 from janis_core.ingestion.galaxy.gxtool.model import XMLTool
+from janis_core.ingestion.galaxy.expressions import compile_pattern
 
 from ...text.simplification.simplify import simplify_cmd
 from ...model import XMLParam, XMLBoolParam, XMLSelectParam
@@ -24,6 +26,8 @@ LINUX_CMD_MATCHER = r'(^|.*? )(set |ln |cp |mv |export |mkdir |tar |ls |head |wg
 CHEETAH_MACRO_MATCHER = r'(^|.*? )(#set |#import |#from |#silent |#echo ).*?$'
 CHEETAH_CONDITIONAL_MATCHER = r'(^|.*? )(#if |#unless |#else if |#elif ).*?$'
 CHEETAH_LOOP_MATCHER = r'(^|.*? )(#for |#while ).*?$'
+VARIABLE_REFERENCE = r'\$([\w.]+)'
+VARIABLE_NAME = r'[\w.]+'
 
 class CmdstrReferenceType(Enum):
     MULTILINE_BOOL              = auto()
@@ -51,44 +55,44 @@ def is_bool_select(token: Token) -> bool:
     return False
 
 def is_blank(phrase: str) -> bool:
-    if re.search(BLANK, phrase):
+    if compile_pattern(BLANK).search(phrase):
         return True
     return False
 
 def is_prefix(phrase: str) -> bool:
     phrase = phrase.strip()
-    if re.search(SIMPLE_PREFIX, phrase):
+    if compile_pattern(SIMPLE_PREFIX).search(phrase):
         return True
     return False
 
 def is_simple_flags(phrase: str) -> bool:
     words = phrase.strip().split()
     for word in words:
-        if not re.search(SIMPLE_PREFIX, word):
+        if not compile_pattern(SIMPLE_PREFIX).search(word):
             return False
     return True
 
 def is_simple_variable(phrase: str) -> bool:
     phrase = phrase.strip()
-    if re.search(SIMPLE_VARIABLE, phrase):
+    if compile_pattern(SIMPLE_VARIABLE).search(phrase):
         return True
     return False
 
 def is_simple_phrase(phrase: str) -> bool:
-    if re.search(SIMPLE_PHRASE, phrase):
+    if compile_pattern(SIMPLE_PHRASE).search(phrase):
         return True
     return False
 
 
 def is_compound_option(phrase: str) -> bool:
     phrase = phrase.strip()
-    if re.search(SIMPLE_COMPOUND_OPTION, phrase):
+    if compile_pattern(SIMPLE_COMPOUND_OPTION).search(phrase):
         return True
     return False
 
 def extract_compound_option(phrase: str) -> Tuple[str, str, str]:
     phrase = phrase.strip()
-    match = re.search(SIMPLE_COMPOUND_OPTION, phrase)
+    match = compile_pattern(SIMPLE_COMPOUND_OPTION).search(phrase)
     if not match:
         raise RuntimeError
     prefix = match.group(1)
@@ -98,13 +102,13 @@ def extract_compound_option(phrase: str) -> Tuple[str, str, str]:
 
 def is_simple_option(phrase: str) -> bool:
     phrase = phrase.strip()
-    if re.search(SIMPLE_OPTION, phrase):
+    if compile_pattern(SIMPLE_OPTION).search(phrase):
         return True
     return False
 
 def extract_simple_option(phrase: str) -> Tuple[str, str, str]:
     phrase = phrase.strip()
-    match = re.search(SIMPLE_OPTION, phrase)
+    match = compile_pattern(SIMPLE_OPTION).search(phrase)
     if not match:
         raise RuntimeError
     prefix = match.group(1)
@@ -134,32 +138,77 @@ def get_cmdstr_appearences(
     filter_to: Optional[CmdstrReferenceType | list[CmdstrReferenceType]]=None
     ) -> list[CmdstrReference]:
     """find all appearences of a param or string in the cmdstr, according to the CmdstrReferenceTypes we can look for. """
+    return index_appearences(cmdstr).get(param, filter_to=filter_to)
 
-    # find appearences in cmdstr
-    appearences = _get_all_appearences(cmdstr, param)
-    
-    # filter if required
-    if isinstance(filter_to, CmdstrReferenceType):
-        filter_to = [filter_to]
-    if filter_to:
-        appearences = [x for x in appearences if x.rtype in filter_to]
-    return appearences
+@lru_cache(maxsize=64)
+def index_appearences(cmdstr: str) -> 'AppearenceIndex':
+    """the AppearenceIndex for cmdstr. shared by each annotator (and step) using the same cmdstr."""
+    return AppearenceIndex(cmdstr)
+
+
+class AppearenceIndex:
+    """
+    appearences of params in a command string.
+    the cmdstr is simplified and scanned for $references once. 
+    each param's appearences are then only searched for in the lines which reference it, 
+    and kept for the next annotator asking about that param. 
+    """
+
+    def __init__(self, cmdstr: str) -> None:
+        self.cmdstr = simplify_cmd(cmdstr, purpose='parsing')
+        self.appearences: dict[str, list[CmdstrReference]] = {}
+        self.references: dict[str, list[Tuple[int, int]]] = {}
+        self._index_references()
+
+    def get(
+        self, 
+        param: XMLParam, 
+        filter_to: Optional[CmdstrReferenceType | list[CmdstrReferenceType]]=None
+        ) -> list[CmdstrReference]:
+        if param.name not in self.appearences:
+            self.appearences[param.name] = self._find_appearences(param.name)
+        appearences = self.appearences[param.name]
+        
+        # filter if required
+        if isinstance(filter_to, CmdstrReferenceType):
+            filter_to = [filter_to]
+        if filter_to:
+            return [x for x in appearences if x.rtype in filter_to]
+        return list(appearences)
+
+    def _index_references(self) -> None:
+        """maps each referenced $name to the (start, end) of the lines it appears on"""
+        line_start = 0
+        for line in self.cmdstr.split('\n'):
+            # line end includes the newline: matchers look ahead for it
+            line_end = min(line_start + len(line) + 1, len(self.cmdstr))
+            for name in set(compile_pattern(VARIABLE_REFERENCE).findall(line)):
+                self.references.setdefault(name, []).append((line_start, line_end))
+            line_start += len(line) + 1
+
+    def _find_appearences(self, name: str) -> list[CmdstrReference]:
+        if compile_pattern(VARIABLE_NAME).fullmatch(name):
+            # '$name' only appears in lines with a reference starting with name (eg $name, $name.ext) 
+            spans = sorted(set(span for ref, refspans in self.references.items() if ref.startswith(name) for span in refspans))
+            if not spans:
+                return []
+        else:
+            spans = [(0, len(self.cmdstr))]
+        
+        refs: list[CmdstrReference] = []
+        refs += _get_multiline_appearences(self.cmdstr, name)
+        for start, end in spans:
+            refs += _get_inline_appearences(self.cmdstr, name, start, end)
+        return refs
     
 
 ### PRIVATE HELPERS ###
-
-def _get_all_appearences(cmdstr: str, param: XMLParam) -> list[CmdstrReference]:
-    cmdstr = simplify_cmd(cmdstr, purpose='parsing')
-    refs: list[CmdstrReference] = []
-    refs += _get_multiline_appearences(cmdstr, param)
-    refs += _get_inline_appearences(cmdstr, param)
-    return refs
     
-def _get_multiline_appearences(cmdstr: str, param: XMLParam) -> list[CmdstrReference]:
+def _get_multiline_appearences(cmdstr: str, name: str) -> list[CmdstrReference]:
     """only checking for multiline bool pattern at this stage. may add others.""" 
-    return _get_multiline_bool_pattern_refs(cmdstr, param)
+    return _get_multiline_bool_pattern_refs(cmdstr, name)
 
-def _get_multiline_bool_pattern_refs(cmdstr: str, param: XMLParam) -> list[CmdstrReference]:
+def _get_multiline_bool_pattern_refs(cmdstr: str, name: str) -> list[CmdstrReference]:
     """ 
     checking for this situation:
     #if $out.filtCounts:
@@ -167,11 +216,11 @@ def _get_multiline_bool_pattern_refs(cmdstr: str, param: XMLParam) -> list[Cmdst
     #end if
     """
     # set up base search term
-    pname = param.name.replace(r'.', r'\.')
+    pname = name.replace(r'.', r'\.')
     pattern = MULTILINE_BOOL_MATCHER.replace('__PARAM_NAME__', pname)
     
     # find all matches
-    iterator = re.finditer(pattern, cmdstr, re.MULTILINE)
+    iterator = compile_pattern(pattern, re.MULTILINE).finditer(cmdstr)
     matches = [m for m in iterator]
     
     reflist: list[CmdstrReference] = []
@@ -184,25 +233,26 @@ def _get_multiline_bool_pattern_refs(cmdstr: str, param: XMLParam) -> list[Cmdst
             reflist.append(ref)
     return reflist
 
-def _get_inline_appearences(cmdstr: str, param: XMLParam) -> list[CmdstrReference]:
+def _get_inline_appearences(cmdstr: str, name: str, start: int, end: int) -> list[CmdstrReference]:
+    """inline appearences within cmdstr[start:end] (whole lines: matches never span lines)"""
     # set up base search term
-    pname = param.name.replace(r'.', r'\.')
+    pname = name.replace(r'.', r'\.')
     pattern = INLINE_PARAM_MATCHER.replace('__PARAM_NAME__', pname)
 
     # all follow same pattern
-    iterator = re.finditer(pattern, cmdstr, re.MULTILINE)
+    iterator = compile_pattern(pattern, re.MULTILINE).finditer(cmdstr, start, end)
     matches = [m for m in iterator]
     
     reflist: list[CmdstrReference] = []
     for match in matches:
         text = match.group(0)
-        if re.search(LINUX_CMD_MATCHER, text):
+        if compile_pattern(LINUX_CMD_MATCHER).search(text):
             ref = CmdstrReference(cmdstr, match.start(), text, CmdstrReferenceType.INLINE_LINUX_CMD)
-        elif re.search(CHEETAH_MACRO_MATCHER, text):
+        elif compile_pattern(CHEETAH_MACRO_MATCHER).search(text):
             ref = CmdstrReference(cmdstr, match.start(), text, CmdstrReferenceType.INLINE_CHEETAH_MACRO)
-        elif re.search(CHEETAH_CONDITIONAL_MATCHER, text):
+        elif compile_pattern(CHEETAH_CONDITIONAL_MATCHER).search(text):
             ref = CmdstrReference(cmdstr, match.start(), text, CmdstrReferenceType.INLINE_CHEETAH_CONDITIONAL)
-        elif re.search(CHEETAH_LOOP_MATCHER, text):
+        elif compile_pattern(CHEETAH_LOOP_MATCHER).search(text):
             ref = CmdstrReference(cmdstr, match.start(), text, CmdstrReferenceType.INLINE_CHEETAH_LOOP)
         else:
             ref = CmdstrReference(cmdstr, match.start(), text, CmdstrReferenceType.INLINE_PLAIN_TEXT)
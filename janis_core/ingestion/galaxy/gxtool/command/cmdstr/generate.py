@@ -54,7 +54,7 @@ class CommandStringFactory:
 
         # has to be reverse order otherwise m.start() and m.end() are out of place
         for m in sorted(delim_matches, key=lambda x: x.start(), reverse=True): 
-            if quoted_sections[m.start()] == False and quoted_sections[m.end()] == False:
+            if not quoted_sections.is_quoted(m.start()) and not quoted_sections.is_quoted(m.end()):
                 left_split = text[:m.start()]
                 right_split = text[m.end():]
                 statements = [right_split] + statements # prepend
@@ -1,6 +1,7 @@
 
 
-from typing import Any
+import weakref
+from typing import Any, Callable
 
 from ..text.simplification.aliases import resolve_aliases
 from ..text.simplification.main_statement import mark_main_statement
@@ -8,6 +9,40 @@ from ..text.cheetah.evaluation import sectional_evaluate
 from ..text.simplification.simplify import simplify_cmd
 
 from janis_core.ingestion.galaxy.gxtool.model import XMLTool
+from .cmdstr.RealisedTokenValues import RealisedTokens
+from .tokenise import tokenise_text
+
+
+class VanillaCommandCache:
+    """
+    Per-XMLTool results of the vanilla command pipeline.
+    These only depend on the XMLTool (not the workflow step), so are computed once
+    and reused by each step using the same XMLTool (see load_xmltool_cached).
+    Entries are dropped when the XMLTool is garbage collected, and recomputed 
+    if its raw_command changes.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[weakref.ref[XMLTool], str, dict[str, Any]]] = {}
+
+    def get(self, xmltool: XMLTool, name: str, func: Callable[[XMLTool], Any]) -> Any:
+        key = id(xmltool)
+        entry = self._entries.get(key)
+        if entry is None or entry[0]() is not xmltool or entry[1] != xmltool.raw_command:
+            ref = weakref.ref(xmltool, lambda _: self._entries.pop(key, None))
+            entry = (ref, xmltool.raw_command, {})
+            self._entries[key] = entry
+        artefacts = entry[2]
+        if name not in artefacts:
+            artefacts[name] = func(xmltool)
+        return artefacts[name]
+
+    def clear(self) -> None:
+        self._entries = {}
+
+
+# SINGLETON
+VANILLA_CACHE = VanillaCommandCache()
 
 
 def load_vanilla_command_str(xmltool: XMLTool) -> str:
@@ -16,6 +51,23 @@ def load_vanilla_command_str(xmltool: XMLTool) -> str:
     simplifies the command (removing cheetah comments, standardising galaxy dynamic vars)
     resolves aliases (temporary variables) back to original params
     """
+    return VANILLA_CACHE.get(xmltool, 'text', _load_vanilla_command_str)
+
+def load_vanilla_main_statement(xmltool: XMLTool) -> str:
+    """the main statement of the vanilla command (see mark_main_statement)"""
+    return VANILLA_CACHE.get(xmltool, 'mainstmt_text', _load_vanilla_main_statement)
+
+def tokenise_vanilla_main_statement(xmltool: XMLTool) -> list[RealisedTokens]:
+    """tokens of the vanilla main statement. shared between steps: treat as read-only."""
+    return VANILLA_CACHE.get(xmltool, 'mainstmt_tokens', _tokenise_vanilla_main_statement)
+
+def _load_vanilla_main_statement(xmltool: XMLTool) -> str:
+    return load_vanilla_command_str(xmltool).split('__JANIS_MAIN__')[1]
+
+def _tokenise_vanilla_main_statement(xmltool: XMLTool) -> list[RealisedTokens]:
+    return tokenise_text(load_vanilla_main_statement(xmltool), xmltool)
+
+def _load_vanilla_command_str(xmltool: XMLTool) -> str:
     text = xmltool.raw_command
     text = simplify_cmd(text, 'main_statement')
     text = mark_main_statement(text, xmltool)
@@ -5,7 +5,8 @@ from typing import Optional, Any
 from janis_core.ingestion.galaxy.gxtool.model import XMLTool
 from janis_core.ingestion.galaxy.gxworkflow.tool_state.load import load_tool_state
 
-from .loading import load_vanilla_command_str
+from .loading import load_vanilla_main_statement
+from .loading import tokenise_vanilla_main_statement
 from .loading import load_templated_command_str
 from .cmdstr.DynamicCommandStatement import DynamicCommandStatement
 # from .cmdstr.CommandString import CommandString
@@ -59,8 +60,7 @@ class CommandFactory:
         # remove post 
         # all annotators except Local/GlobalCmdstrAnnotator - supply main as text
         # Local/GlobalCmdstrAnnotator - supply supply pre & main, only start greedy search from main
-        cmdtext = load_vanilla_command_str(self.xmltool)
-        mainstmt_text = cmdtext.split('__JANIS_MAIN__')[1]
+        mainstmt_text = load_vanilla_main_statement(self.xmltool)
 
         if 'SimpleInlineBoolAnnotator' in self.annotators:
             SimpleInlineBoolAnnotator(self.command, mainstmt_text, self.xmltool).annotate()
@@ -98,10 +98,9 @@ class CommandFactory:
             mainstmt_dynamic = DynamicCommandStatement(mainstmt_text, mainstmt_tokens)
             stmts_dynamic.append(mainstmt_dynamic)
 
-        # vanilla xml
-        cmdtext = load_vanilla_command_str(self.xmltool)
-        mainstmt_text = cmdtext.split('__JANIS_MAIN__')[1]    
-        mainstmt_tokens = tokenise_text(mainstmt_text, self.xmltool)
+        # vanilla xml (same for each step: cached per XMLTool)
+        mainstmt_text = load_vanilla_main_statement(self.xmltool)
+        mainstmt_tokens = tokenise_vanilla_main_statement(self.xmltool)
         mainstmt_dynamic = DynamicCommandStatement(mainstmt_text, mainstmt_tokens)
         stmts_dynamic.append(mainstmt_dynamic)
         
@@ -1,4 +1,8 @@
 
 
 from .main import load_xmltool
+from .cache import load_xmltool_cached
+from .cache import clear_xmltool_cache
 from .encoding import unicodify
+from .session import get_session
+from .session import teardown_session
@@ -0,0 +1,115 @@
+
+
+import hashlib
+import os
+import pickle
+from typing import Optional
+
+from janis_core import settings
+from janis_core.__meta__ import __version__
+from janis_core.ingestion.common import atomic_write
+
+from ..model import XMLTool
+from ...utils import galaxy as utils
+from .main import load_xmltool
+
+
+def wrapper_digest(path: str) -> str:
+    """md5 of the tool xml at 'path' and each macro xml it imports"""
+    md5 = hashlib.md5()
+    for filepath in [path] + utils.get_imported_macros(path):
+        with open(filepath, 'rb') as fp:
+            md5.update(fp.read())
+    return md5.hexdigest()
+
+
+class XMLToolCache:
+    """
+    Content-addressed store of parsed XMLTools for the current ingest run.
+    Entries are keyed by the absolute path of the tool xml, plus a hash of the
+    tool xml and each macro xml it imports.
+    Editing the wrapper (or its macros) therefore produces a new key.
+    """
+
+    def __init__(self) -> None:
+        self._tools: dict[tuple[str, str], XMLTool] = {}
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def get(self, path: str) -> Optional[XMLTool]:
+        return self._tools.get(self.key(path))
+
+    def add(self, path: str, xmltool: XMLTool) -> None:
+        self._tools[self.key(path)] = xmltool
+
+    def clear(self) -> None:
+        self._tools = {}
+
+    def key(self, path: str) -> tuple[str, str]:
+        path = os.path.abspath(path)
+        return (path, wrapper_digest(path))
+
+
+class XMLToolDiskCache:
+    """
+    Persistent store of parsed XMLTools, shared between janis runs.
+    Opt-in via settings.ingest.galaxy.ENABLE_TOOL_CACHE.
+
+    Each entry is a pickled XMLTool saved as '<xml name>-<digest>.pickle'.
+    The digest covers the janis_core version and the contents of the tool xml
+    and its macros. A toolshed (owner, repo, revision) fixes those contents,
+    so entries are invalidated automatically when janis_core is upgraded or
+    the wrapper files change.
+    """
+
+    @property
+    def path(self) -> str:
+        return settings.ingest.galaxy.TOOL_CACHE_DIR
+
+    def get(self, path: str) -> Optional[XMLTool]:
+        filepath = self.entry_path(path)
+        if not os.path.exists(filepath):
+            return None
+        try:
+            with open(filepath, 'rb') as fp:
+                return pickle.load(fp)
+        except Exception:
+            # corrupt or incompatible entry: treat as a miss (will be overwritten)
+            return None
+
+    def add(self, path: str, xmltool: XMLTool) -> None:
+        # written via temp file & rename so concurrent runs never see partial entries
+        atomic_write(self.entry_path(path), pickle.dumps(xmltool))
+
+    def entry_path(self, path: str) -> str:
+        md5 = hashlib.md5(__version__.encode())
+        md5.update(wrapper_digest(path).encode())
+        basename = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.path, f'{basename}-{md5.hexdigest()}.pickle')
+
+
+# SINGLETONS
+CACHE = XMLToolCache()
+DISK_CACHE = XMLToolDiskCache()
+
+def load_xmltool_cached(path: str) -> XMLTool:
+    """
+    returns the parsed XMLTool for the tool xml at 'path'.
+    each distinct wrapper is only loaded once per run.
+    if enabled, also checks / updates the persistent tool cache.
+    """
+    xmltool = CACHE.get(path)
+    if xmltool is not None:
+        return xmltool
+    if settings.ingest.galaxy.ENABLE_TOOL_CACHE:
+        xmltool = DISK_CACHE.get(path)
+    if xmltool is None:
+        xmltool = load_xmltool(path)
+        if settings.ingest.galaxy.ENABLE_TOOL_CACHE:
+            DISK_CACHE.add(path, xmltool)
+    CACHE.add(path, xmltool)
+    return xmltool
+
+def clear_xmltool_cache() -> None:
+    CACHE.clear()
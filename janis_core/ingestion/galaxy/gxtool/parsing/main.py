@@ -1,6 +1,5 @@
 
 import os
-import tempfile
 import regex as re
 from typing import Any 
  
@@ -8,7 +7,6 @@ from galaxy.tools import create_tool_from_source
 from galaxy.tools.parameters.basic import ToolParameter
 from galaxy.tool_util.parser import get_tool_source
 from galaxy.tool_util.parser.output_objects import ToolOutput
-from galaxy.model import History
 
 from ..model import XMLDataParam
 from ..model import XMLConfigfile
@@ -24,8 +22,8 @@ from ..model import XMLTestRegister
 
 from ...expressions.patterns import GX_TOOL_SCRIPT
 from ...expressions.matches import get_matches
-from ..mock import MockApp, MockObjectStore
 
+from .session import get_session
 from .param_flattener import XMLParamFlattener
 from .outputs import parse_output_param
 from .inputs import parse_input_param
@@ -39,29 +37,13 @@ def load_xmltool(path: str) -> XMLTool:
     return factory.create()
 
 def _load_galaxy_tool(path: str) -> Any:
-    app = _get_app()
+    app = get_session().get_app()
     tool_source = get_tool_source(path)
     tool = create_tool_from_source(app, tool_source)
     tool.assert_finalized()
     return tool
 
 
-
-def _get_app() -> MockApp:
-    # basic details
-    app = MockApp()
-    app.job_search = None
-    app.object_store = MockObjectStore()
-    # config
-    app.config.new_file_path = os.path.join(tempfile.mkdtemp(), "new_files")
-    app.config.admin_users = "grace@thebest.com"
-    app.config.len_file_path = "moocow"
-    # database
-    
-    app.model.context.add(History())
-    app.model.context.flush()
-    return app
-
 class GalaxyToolFactory:
     def __init__(self, gxtool: Any, xmlpath: str):
         self.gxtool = gxtool
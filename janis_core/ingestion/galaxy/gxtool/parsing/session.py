@@ -0,0 +1,81 @@
+
+
+import atexit
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from galaxy.model import History
+
+from ..mock import MockApp, MockObjectStore
+
+
+class ToolLoadingSession:
+    """
+    Long-lived galaxy MockApp used to load tool xmls.
+    Building a MockApp is expensive (datatypes registry, in-memory database etc),
+    so it is created once on first use then reused for each subsequent tool.
+    Per-tool state is reset before each tool is loaded.
+    """
+
+    def __init__(self) -> None:
+        self._app: Optional[MockApp] = None
+        self._tmpdir: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self._app is not None
+
+    def get_app(self) -> MockApp:
+        """returns the session MockApp, ready to load the active tool (runtime.tool)"""
+        if self._app is None:
+            self._app = self._init_app()
+        self._reset_app(self._app)
+        return self._app
+
+    def teardown(self) -> None:
+        """disposes of the MockApp and removes its temporary files"""
+        if self._app is not None:
+            self._app.model.context.remove()
+            self._app.model.engine.dispose()
+            self._app = None
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def _init_app(self) -> MockApp:
+        # basic details
+        app = MockApp()
+        app.job_search = None
+        # config
+        self._tmpdir = tempfile.mkdtemp()
+        app.config.new_file_path = os.path.join(self._tmpdir, "new_files")
+        app.config.admin_users = "grace@thebest.com"
+        app.config.len_file_path = "moocow"
+        # database
+        app.model.context.add(History())
+        app.model.context.flush()
+        return app
+
+    def _reset_app(self, app: MockApp) -> None:
+        # forget objects created while loading the previous tool
+        app.model.context.expunge_all()
+        app.object_store = MockObjectStore()
+        app.dataset_counter = 1
+        # tool data tables are specific to the xml directory of each tool
+        app.config.tool_data_path = None
+        app.config.tool_data_table_config_path = None
+        app.config.set_tool_data_attrs()
+        app.tool_data_tables = app.grace_init_data_tables()
+
+
+_SESSION = ToolLoadingSession()
+
+def get_session() -> ToolLoadingSession:
+    return _SESSION
+
+def teardown_session() -> None:
+    _SESSION.teardown()
+
+atexit.register(teardown_session)
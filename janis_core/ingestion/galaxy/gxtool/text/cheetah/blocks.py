@@ -1,6 +1,8 @@
 
 
 from __future__ import annotations
+import re
+from functools import lru_cache
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Optional
@@ -23,8 +25,44 @@ def get_blocks(ptr: int, lines: list[str], indent_level: int) -> list[CheetahBlo
     return factory.get_blocks()
 
 def get_next_block(ptr: int, lines: list[str]) -> CheetahBlock:
-    blocks = get_blocks(ptr=ptr, lines=lines[ptr:], indent_level=0)
-    return blocks[0]
+    return BlockScanner(lines).next_block(ptr)
+
+
+class BlockScanner:
+    """
+    finds the next top-level cheetah block starting at a given line.
+    gives the same block as get_blocks(ptr, lines[ptr:], 0)[0] but stops scanning
+    at the end of that block, rather than splitting all remaining lines into blocks.
+    
+    self.lines is referenced (not copied) so edits made between calls are seen.
+    """
+
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+
+    def next_block(self, ptr: int) -> CheetahBlock:
+        tracker = constructs.ConstructTracker()
+        active: list[BlockLine] = []
+        for i in range(ptr, len(self.lines)):
+            line = self.lines[i]
+            indent = tracker.stack.depth
+            if indent == 0 and active:
+                # line begins a new block: previous block complete
+                block = self._make_block(active)
+                if block is not None:
+                    return block
+                active = []
+            tracker.update(line)
+            active.append(BlockLine(line_num=i, indent=indent, text=line))
+        if active:
+            block = self._make_block(active)
+            if block is not None:
+                return block
+        raise IndexError(f'no cheetah block at or after line {ptr}')
+
+    def _make_block(self, active: list[BlockLine]) -> Optional[CheetahBlock]:
+        blocks = BlockFactory(offset=0, block_lines=active, indent_level=0).get_blocks()
+        return blocks[0] if blocks else None
 
 
 @dataclass
@@ -134,6 +172,43 @@ class BlockFactory:
 
 
 
+# masked child blocks appear in templates as lines holding the block uuid 
+IDENTIFIER_LINE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.MULTILINE)
+
+def normalise_identifiers(source: str) -> tuple[str, dict[str, str]]:
+    """
+    swaps block identifiers (random uuids) for placeholders numbered by appearance,
+    so the same cheetah block always gives the same template source.
+    returns the normalised source & {placeholder: identifier}.
+    """
+    identifiers: dict[str, str] = {}
+    placeholders: dict[str, str] = {}
+    def replace(match: re.Match[str]) -> str:
+        identifier = match.group(0)
+        if identifier not in placeholders:
+            placeholder = f'__JANIS_BLOCK_{len(placeholders)}__'
+            placeholders[identifier] = placeholder
+            identifiers[placeholder] = identifier
+        return placeholders[identifier]
+    return IDENTIFIER_LINE.sub(replace, source), identifiers
+
+def restore_identifiers(text: str, identifiers: dict[str, str]) -> str:
+    for placeholder, identifier in identifiers.items():
+        text = text.replace(placeholder, identifier)
+    return text
+
+@lru_cache(maxsize=4096)
+def compile_template(source: str) -> Optional[type[Template]]:
+    """
+    compiles cheetah source to a Template class, instantiated per evaluation with a searchList.
+    sources which fail to compile return None (also cached, so aren't retried).
+    """
+    try:
+        return Template.compile(source=source) # type: ignore
+    except Exception:
+        return None
+
+
 class EvaluationStrategy(ABC):
     def __init__(self, lines: list[str], input_dict: dict[str, Any]):
         self.lines = lines
@@ -153,10 +228,15 @@ class EvaluationStrategy(ABC):
     
     def evaluate_template(self, source_lines: list[str]) -> Optional[list[str]]:
         """performs cheetah evaluation of template"""
+        source = utils.join_lines(source_lines)
+        source, identifiers = normalise_identifiers(source)
+        template_class = compile_template(source)
+        if template_class is None:
+            return None
         try:
-            source = utils.join_lines(source_lines)
-            t = Template(source, searchList=[self.input_dict]) # type: ignore
+            t = template_class(searchList=[self.input_dict]) # type: ignore
             evaluation = str(unicodify(t))
+            evaluation = restore_identifiers(evaluation, identifiers)
             return utils.split_lines(evaluation)
         except:
             return None
@@ -2,7 +2,7 @@
 from typing import Any
 from collections import defaultdict
 
-from .blocks import get_next_block 
+from .blocks import BlockScanner
 from .blocks import CheetahBlock
 from .. import utils
 
@@ -61,9 +61,11 @@ class PartialCheetahEvaluator:
         return eval_lines
 
     def evaluation_worker(self) -> list[str]:
+        # scanner only reads as far as the end of each block (see BlockScanner)
+        scanner = BlockScanner(self.lines)
         while self.ptr < len(self.lines):
             # do evaluation
-            block = get_next_block(self.ptr, self.lines)
+            block = scanner.next_block(self.ptr)
             block.evaluate(self.input_dict)
             # update metrics, original lines & line ptr
             self.metrics.add(block)
@@ -73,9 +75,8 @@ class PartialCheetahEvaluator:
     
     def update_lines(self, block: CheetahBlock) -> None:
         if block.evaluated:
-            old_lines_top = self.lines[:block.start]
-            old_lines_bottom = self.lines[block.stop + 1:]
-            self.lines = old_lines_top + block.lines + old_lines_bottom
+            # evaluation preserves line count, so lines can be edited in place
+            self.lines[block.start:block.stop + 1] = block.lines
     
     def update_ptr(self, block: CheetahBlock) -> None:
         if block.evaluated:
@@ -39,7 +39,7 @@ def split_text_statements(text: str) -> list[str]:
         
         offset = 0
         for m in delim_matches:
-            if quoted_sections[m.start()] == False and quoted_sections[m.end() - 1] == False:
+            if not quoted_sections.is_quoted(m.start()) and not quoted_sections.is_quoted(m.end() - 1):
                 current_stmt += line[offset:m.end()]
                 statements.append(current_stmt)
                 current_stmt = ''
@@ -0,0 +1,116 @@
+
+
+import tarfile
+import time
+import requests
+import bioblend
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, TypeVar
+
+from janis_core import settings
+from janis_core.ingestion.galaxy.gxwrappers import Wrapper
+from janis_core.ingestion.galaxy.gxwrappers import WrapperCache
+from janis_core.ingestion.galaxy.gxwrappers import request_single_wrapper
+from janis_core.ingestion.galaxy.gxwrappers.downloads.wrappers import download_wrapper
+from janis_core.ingestion.galaxy.gxwrappers.downloads.wrappers import is_downloaded
+
+from .metadata import get_local
+from .metadata import most_recent
+
+"""
+Warms the wrapper caches for a galaxy workflow before its steps are parsed.
+
+Toolshed steps are collected up-front and deduplicated, then
+1. wrapper details are requested for tool versions missing from the WrapperCache
+2. wrapper tarballs are downloaded for (owner, repo, revision)s missing from the DownloadCache
+each using a bounded thread pool (settings.ingest.galaxy.PREFETCH_WORKERS).
+
+Parsing then runs as normal, finding each wrapper locally.
+"""
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+_TRANSIENT_ERRORS = (
+    requests.RequestException,
+    bioblend.ConnectionError,
+    tarfile.TarError,
+    ConnectionError,
+)
+_BACKOFF = 0.5  # seconds, doubled each attempt
+
+
+def prefetch_wrappers(galaxy: dict[str, Any]) -> None:
+    gxsteps = [s for s in galaxy['steps'].values() if s['type'] == 'tool' and 'tool_shed_repository' in s]
+    _prefetch_details(gxsteps)
+    # the testing wrappers dir is read-only test data
+    if not settings.testing.TESTMODE:
+        _prefetch_downloads(gxsteps)
+
+def _prefetch_details(gxsteps: list[dict[str, Any]]) -> None:
+    queries: dict[tuple[str, ...], dict[str, Any]] = {}
+    for gxstep in gxsteps:
+        key = _details_key(gxstep)
+        if key not in queries and not get_local(gxstep):
+            queries[key] = gxstep
+
+    wrappers = run_concurrent(_request_details, queries.values())
+
+    # WrapperCache writes are done here rather than in worker threads
+    cache = WrapperCache()
+    for wrapper in wrappers:
+        cache.add(wrapper)
+
+def _prefetch_downloads(gxsteps: list[dict[str, Any]]) -> None:
+    revisions: set[tuple[str, str, str]] = set()
+    for gxstep in gxsteps:
+        wrappers = get_local(gxstep)
+        if wrappers:
+            wrapper = most_recent(wrappers)
+            if not is_downloaded(wrapper.repo, wrapper.revision):
+                revisions.add((wrapper.owner, wrapper.repo, wrapper.revision))
+
+    run_concurrent(_download, sorted(revisions))
+
+def _details_key(gxstep: dict[str, Any]) -> tuple[str, ...]:
+    repository = gxstep['tool_shed_repository']
+    return (
+        repository['tool_shed'],
+        repository['owner'],
+        repository['name'],
+        gxstep['tool_id'].rsplit('/', 2)[-2],
+        gxstep['tool_version'],
+    )
+
+def _request_details(gxstep: dict[str, Any]) -> Wrapper:
+    tool_shed, owner, repo, tool_id, tool_build = _details_key(gxstep)
+    return with_retries(request_single_wrapper, tool_shed, owner, repo, tool_id, tool_build)
+
+def _download(revision: tuple[str, str, str]) -> None:
+    owner, repo, revision_id = revision
+    with_retries(download_wrapper, owner, repo, revision_id)
+
+
+### HELPERS ###
+
+def run_concurrent(func: Callable[[T], R], items: Iterable[T]) -> list[R]:
+    """applies func to each item using a bounded thread pool. re-raises the first error."""
+    items = list(items)
+    if not items:
+        return []
+    workers = max(1, min(settings.ingest.galaxy.PREFETCH_WORKERS, len(items)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, item) for item in items]
+        return [f.result() for f in futures]
+
+def with_retries(func: Callable[..., R], *args: Any) -> R:
+    """calls func(*args), retrying transient network errors with exponential backoff"""
+    attempts = max(1, settings.ingest.galaxy.PREFETCH_RETRIES)
+    for attempt in range(attempts):
+        try:
+            return func(*args)
+        except _TRANSIENT_ERRORS:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(_BACKOFF * 2 ** attempt)
+    raise RuntimeError  # unreachable
@@ -1,45 +1,112 @@
 
 
 import os
+import shutil
 import tarfile
+import tempfile
 from typing import Optional
 
 from janis_core import settings
 from janis_core.ingestion.common import safe_init_folder
+from .index import TOOL_INDEX
 
 
-class DownloadCache: 
+class DownloadCache:
     """
     keeps track of the location of downloaded wrapper folders.
     DownloadCache.get() will return the local path to a tool xml if already downloaded
-    DownloadCache.add() saves a tar as a download and notes its path. 
+    DownloadCache.add() saves a tar as a download and notes its path.
+    the folder listing is held in memory and only re-read on a miss.
+
+    tars are extracted into a staging dir then each wrapper folder is renamed
+    into place, so a wrapper folder is only ever visible once fully extracted.
     """
 
+    def __init__(self) -> None:
+        self.folders: dict[tuple[str, str], str] = {}
+        self.loaded_path: Optional[str] = None
+
     @property
     def path(self) -> str:
         if settings.testing.TESTMODE:
             return settings.ingest.galaxy.TESTING_WRAPPERS_DIR
         else:
             return settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR
-    
+
     def get(self, query_repo: str, query_revision: str) -> Optional[str]:
         """returns the local file path for the tool xml if already downloaded or None"""
-        for folder in self._load():
-            repo, revision = folder.split('-', 1)
-            if repo == query_repo and revision == query_revision:
-                return f'{self.path}{os.sep}{folder}'
-        return None
+        if self.loaded_path != self.path:
+            self._load()
+        folder = self.folders.get((query_repo, query_revision))
+        if folder is None or not os.path.isdir(f'{self.path}{os.sep}{folder}'):
+            # may have been downloaded (or removed) by another process
+            self._load()
+            folder = self.folders.get((query_repo, query_revision))
+        if folder is None:
+            return None
+        return f'{self.path}{os.sep}{folder}'
+
+    @property
+    def downloads_path(self) -> str:
+        """downloaded tarballs & extraction staging dirs (ignored by get())"""
+        return f'{self.path}{os.sep}.downloads'
 
     def add(self, tar: tarfile.TarFile) -> None:
         self._save(tar)
 
     def _save(self, tar: tarfile.TarFile) -> None:
-        safe_init_folder(self.path)
-        tar.extractall(path=self.path)
+        members = tar.getmembers()
+        _validate_members(members)
+        safe_init_folder(self.downloads_path)
+        staging = tempfile.mkdtemp(prefix='staging.', dir=self.downloads_path)
+        try:
+            tar.extractall(path=staging, members=members)
+            for folder in os.listdir(staging):
+                if os.path.isdir(f'{staging}{os.sep}{folder}'):
+                    self._move_into_place(f'{staging}{os.sep}{folder}', folder)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _move_into_place(self, src: str, folder: str) -> None:
+        folder_path = f'{self.path}{os.sep}{folder}'
+        try:
+            os.rename(src, folder_path)
+        except OSError:
+            # already present (eg extracted by another process)
+            if not os.path.isdir(folder_path):
+                raise
+        # incrementally update folder listing & tool index with new wrapper folder
+        self._register(folder)
+        TOOL_INDEX.index_wrapper(folder_path)
 
-    def _load(self) -> set[str]:
+    def _load(self) -> None:
         safe_init_folder(self.path)
-        folders = os.listdir(self.path)
-        folders = [f for f in folders if os.path.isdir(f'{self.path}{os.sep}{f}')]
-        return set(folders)
+        self.loaded_path = self.path
+        self.folders = {}
+        for folder in os.listdir(self.path):
+            if os.path.isdir(f'{self.path}{os.sep}{folder}'):
+                self._register(folder)
+
+    def _register(self, folder: str) -> None:
+        if '-' not in folder or folder.startswith('.'):
+            return
+        repo, revision = folder.split('-', 1)
+        self.folders[(repo, revision)] = folder
+
 
+def _validate_members(members: list[tarfile.TarInfo]) -> None:
+    """rejects tars which would write outside the extraction dir, or are unreasonably large"""
+    total_size = 0
+    for member in members:
+        name = os.path.normpath(member.name)
+        if os.path.isabs(name) or name.startswith('..'):
+            raise tarfile.TarError(f'unsafe path in wrapper tar: {member.name}')
+        if member.issym() or member.islnk():
+            target = os.path.normpath(os.path.join(os.path.dirname(name), member.linkname))
+            if os.path.isabs(member.linkname) or target.startswith('..'):
+                raise tarfile.TarError(f'unsafe link in wrapper tar: {member.name}')
+        if not (member.isfile() or member.isdir() or member.issym() or member.islnk()):
+            raise tarfile.TarError(f'unsupported member in wrapper tar: {member.name}')
+        total_size += member.size
+    if total_size > settings.ingest.galaxy.MAX_WRAPPER_SIZE:
+        raise tarfile.TarError(f'wrapper tar exceeds {settings.ingest.galaxy.MAX_WRAPPER_SIZE} bytes when extracted')
@@ -0,0 +1,159 @@
+
+
+import os
+import xml.etree.ElementTree as et
+from typing import Any, Optional
+
+from janis_core import settings
+from janis_core.ingestion.common import JsonFileCache
+
+"""
+ToolIndex flat file structure:
+{
+    'builtin': {
+        'galaxy_version': '22.1.1',
+        'tools': {
+            tool_id: [absolute path to xml],
+            ...
+        }
+    },
+    'wrappers': {
+        [wrapper folder path]: {
+            'mtime': [folder mtime in ns],
+            'tools': {
+                tool_id: [xml filename],
+                ...
+            }
+        },
+        ...
+    }
+}
+"""
+
+
+class ToolIndex(JsonFileCache):
+    """
+    Persistent tool_id -> xml path lookups for galaxy builtin tools and downloaded wrappers.
+    Saves parsing every xml in a directory each time we look for a tool_id.
+
+    The builtin section is rebuilt when the installed galaxy version changes.
+    Each wrapper folder is re-indexed when its mtime changes, or when
+    it is (re)extracted (see DownloadCache.add()).
+    Other processes may update the file too: new entries are merged into the
+    file contents (re-read under a file lock) before saving.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.galaxy_version: str = ''
+
+    @property
+    def path(self) -> str:
+        return settings.ingest.galaxy.TOOL_INDEX
+
+    def default(self) -> dict[str, Any]:
+        return {'builtin': {}, 'wrappers': {}}
+
+    def get_builtin(self, tool_id: str) -> Optional[str]:
+        """returns path to builtin tool xml with id='tool_id'"""
+        data = self.read()
+        if not self.galaxy_version:
+            self.galaxy_version = _galaxy_version()
+        if data['builtin'].get('galaxy_version') != self.galaxy_version:
+            data = self._index_builtins()
+        path = data['builtin']['tools'].get(tool_id)
+        if path is not None and not os.path.exists(path):
+            # galaxy reinstalled somewhere else
+            data = self._index_builtins()
+            path = data['builtin']['tools'].get(tool_id)
+        return path
+
+    def get_wrapper(self, wrapper_dir: str, tool_id: str) -> Optional[str]:
+        """returns filename of xml with id='tool_id' within wrapper_dir"""
+        data = self.read()
+        wrapper_dir = os.path.abspath(wrapper_dir)
+        entry = data['wrappers'].get(wrapper_dir)
+        if entry is None or entry['mtime'] != _mtime(wrapper_dir):
+            entry = self.index_wrapper(wrapper_dir)
+        return entry['tools'].get(tool_id)
+
+    def index_wrapper(self, wrapper_dir: str) -> dict[str, Any]:
+        """(re)indexes a single wrapper folder. returns its entry"""
+        wrapper_dir = os.path.abspath(wrapper_dir)
+        entry = {
+            'mtime': _mtime(wrapper_dir),
+            'tools': index_directory(wrapper_dir),
+        }
+        self._save(wrappers={wrapper_dir: entry})
+        return entry
+
+    def _index_builtins(self) -> dict[str, Any]:
+        tools: dict[str, str] = {}
+        for directory in get_builtin_tool_directories():
+            for tool_id, xml in index_directory(directory).items():
+                if tool_id not in tools:
+                    tools[tool_id] = os.path.join(directory, xml)
+        builtin = {
+            'galaxy_version': self.galaxy_version,
+            'tools': tools,
+        }
+        return self._save(builtin=builtin)
+
+    def _save(
+        self, 
+        builtin: Optional[dict[str, Any]]=None, 
+        wrappers: Optional[dict[str, Any]]=None
+        ) -> dict[str, Any]:
+        """merges the new sections / entries into the index file. returns the merged index"""
+        def merge(data: dict[str, Any]) -> None:
+            if builtin is not None:
+                data['builtin'] = builtin
+            if wrappers is not None:
+                data['wrappers'].update(wrappers)
+        return self.update(merge)
+
+def index_directory(directory: str) -> dict[str, str]:
+    """returns {tool_id: xml filename} for each tool xml in directory"""
+    out: dict[str, str] = {}
+    xmls = [x for x in os.listdir(directory) if x.endswith('.xml') and 'macros' not in x]
+    for xml in xmls:
+        try:
+            root = et.parse(os.path.join(directory, xml)).getroot()
+        except et.ParseError:
+            continue
+        tool_id = root.attrib.get('id')
+        if tool_id is not None and tool_id not in out:
+            out[str(tool_id)] = xml
+    return out
+
+def get_builtin_tool_directories() -> list[str]:
+    out: list[str] = []
+    out += _get_builtin_tools_directories()
+    out += _get_datatype_converter_directories()
+    return out
+
+def _get_builtin_tools_directories() -> list[str]:
+    import galaxy.tools
+    tools_folder = str(galaxy.tools.__file__).rsplit('/', 1)[0]
+    bundled_folders = os.listdir(f'{tools_folder}/bundled')
+    bundled_folders = [f for f in bundled_folders if not f.startswith('__')]
+    bundled_folders = [f'{tools_folder}/bundled/{f}' for f in bundled_folders]
+    bundled_folders = [f for f in bundled_folders if os.path.isdir(f)]
+    return [tools_folder] + bundled_folders
+
+def _get_datatype_converter_directories() -> list[str]:
+    import galaxy.datatypes
+    datatypes_folder = str(galaxy.datatypes.__file__).rsplit('/', 1)[0]
+    converters_folder = f'{datatypes_folder}/converters'
+    return [converters_folder]
+
+def _galaxy_version() -> str:
+    from importlib.metadata import version
+    return version('galaxy-app')
+
+def _mtime(directory: str) -> int:
+    return os.stat(directory).st_mtime_ns
+
+
+# SINGLETON
+TOOL_INDEX = ToolIndex()
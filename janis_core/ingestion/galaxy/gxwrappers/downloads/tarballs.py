@@ -0,0 +1,122 @@
+
+
+import hashlib
+import json
+import os
+import re
+import requests
+import urllib3
+from typing import Any, Optional
+from filelock import FileLock
+
+from janis_core import settings
+from janis_core.ingestion.common import atomic_write
+from janis_core.ingestion.common import safe_init_folder
+
+"""
+Streaming downloads of toolshed wrapper tarballs.
+
+Each tarball is streamed to '<name>.part' then renamed to '<name>' once the
+full body has been received. A sidecar '<name>.json' records the response ETag,
+sha256 and size of the completed download.
+- interrupted downloads are resumed using a Range request (If-Range: etag)
+- completed downloads are revalidated using If-None-Match, so a 304
+  reuses the local tarball rather than downloading again
+- a local tarball which no longer matches its recorded sha256 is discarded
+"""
+
+CHUNK_SIZE = 1024 * 64
+
+
+class IncompleteDownloadError(requests.RequestException):
+    pass
+
+
+def download_tarball(url: str, path: str) -> str:
+    """downloads url to path (if needed) and returns path"""
+    safe_init_folder(os.path.dirname(path))
+    with FileLock(f'{path}.lock'):
+        return _download(url, path)
+
+def discard_tarball(path: str) -> None:
+    """removes a downloaded tarball (eg corrupt) so it is fetched again next time"""
+    for filepath in [path, f'{path}.part', f'{path}.json']:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+def _download(url: str, path: str) -> str:
+    part_path = f'{path}.part'
+    meta = _load_meta(path)
+    headers: dict[str, str] = {}
+
+    if os.path.exists(path):
+        if meta.get('sha256') != _sha256(path):
+            discard_tarball(path)
+            meta = {}
+        elif meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        else:
+            # no etag to revalidate with. toolshed revisions are immutable.
+            return path
+
+    elif os.path.exists(part_path) and meta.get('etag'):
+        headers['Range'] = f'bytes={os.path.getsize(part_path)}-'
+        headers['If-Range'] = meta['etag']
+
+    with requests.get(url, headers=headers, stream=True, timeout=settings.ingest.galaxy.TOOLSHED_TIMEOUT) as response:
+        if response.status_code == 304:
+            return path
+        response.raise_for_status()
+
+        etag = response.headers.get('ETag')
+        _save_meta(path, {'etag': etag})
+        resumed = response.status_code == 206
+        sha = hashlib.sha256()
+        if resumed:
+            with open(part_path, 'rb') as fp:
+                for chunk in iter(lambda: fp.read(CHUNK_SIZE), b''):
+                    sha.update(chunk)
+
+        with open(part_path, 'ab' if resumed else 'wb') as fp:
+            try:
+                # raw stream: tarballs may be served with Content-Encoding: gzip
+                for chunk in response.raw.stream(CHUNK_SIZE, decode_content=False):
+                    fp.write(chunk)
+                    sha.update(chunk)
+            except urllib3.exceptions.HTTPError as e:
+                # connection dropped: keep .part so the next attempt can resume
+                raise IncompleteDownloadError(f'incomplete download of {url}') from e
+
+        expected = _expected_size(response)
+        received = os.path.getsize(part_path)
+        if expected is not None and received != expected:
+            raise IncompleteDownloadError(f'incomplete download of {url}: received {received} of {expected} bytes')
+
+    os.replace(part_path, path)
+    _save_meta(path, {'etag': etag, 'sha256': sha.hexdigest(), 'size': received})
+    return path
+
+def _expected_size(response: requests.Response) -> Optional[int]:
+    if response.status_code == 206:
+        # Content-Range: bytes 100-999/1000
+        match = re.match(r'bytes \d+-\d+/(\d+)', response.headers.get('Content-Range', ''))
+        return int(match.group(1)) if match else None
+    length = response.headers.get('Content-Length')
+    return int(length) if length is not None else None
+
+def _sha256(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def _load_meta(path: str) -> dict[str, Any]:
+    try:
+        with open(f'{path}.json', 'r') as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+def _save_meta(path: str, meta: dict[str, Any]) -> None:
+    atomic_write(f'{path}.json', json.dumps(meta))
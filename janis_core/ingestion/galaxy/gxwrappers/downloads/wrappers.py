@@ -1,15 +1,18 @@
 
-import requests
 import tarfile
+import threading
 import os
 from typing import Optional
 
 from janis_core import settings
-from janis_core.ingestion.galaxy.utils import galaxy as utils
 from janis_core.ingestion.galaxy.gxwrappers.downloads.cache import DownloadCache
+from janis_core.ingestion.galaxy.gxwrappers.downloads.index import TOOL_INDEX
+from janis_core.ingestion.galaxy.gxwrappers.downloads.tarballs import download_tarball
+from janis_core.ingestion.galaxy.gxwrappers.downloads.tarballs import discard_tarball
 
 
 CACHE: DownloadCache = DownloadCache()
+_CACHE_LOCK = threading.Lock()
 
 
 def fetch_xml(owner: str, repo: str, revision: str, tool_id: str) -> str:
@@ -34,33 +37,7 @@ def fetch_xml(owner: str, repo: str, revision: str, tool_id: str) -> str:
 
 def get_builtin_tool_path(tool_id: str) -> Optional[str]:
     """returns path to xml file with id='tool_id'"""
-    tool_directories = _get_builtin_tool_directories()
-    for directory in tool_directories:
-        xmlfile = utils.get_xml_by_id(directory, tool_id)
-        if xmlfile:
-            return os.path.join(directory, xmlfile)
-    return None
-
-def _get_builtin_tool_directories() -> list[str]:
-    out: list[str] = []
-    out += _get_builtin_tools_directories()
-    out += _get_datatype_converter_directories()
-    return out
-
-def _get_builtin_tools_directories() -> list[str]:
-    import galaxy.tools
-    tools_folder = str(galaxy.tools.__file__).rsplit('/', 1)[0]
-    bundled_folders = os.listdir(f'{tools_folder}/bundled')
-    bundled_folders = [f for f in bundled_folders if not f.startswith('__')]
-    bundled_folders = [f'{tools_folder}/bundled/{f}' for f in bundled_folders]
-    bundled_folders = [f for f in bundled_folders if os.path.isdir(f)]
-    return [tools_folder] + bundled_folders
-
-def _get_datatype_converter_directories() -> list[str]:
-    import galaxy.datatypes
-    datatypes_folder = str(galaxy.datatypes.__file__).rsplit('/', 1)[0]
-    converters_folder = f'{datatypes_folder}/converters'
-    return [converters_folder]
+    return TOOL_INDEX.get_builtin(tool_id)
 
 def _fetch_builtin(tool_id: str) -> Optional[str]:
     return get_builtin_tool_path(tool_id)
@@ -68,25 +45,39 @@ def _fetch_builtin(tool_id: str) -> Optional[str]:
 def _fetch_cache(repo: str, revision: str, tool_id: str) -> Optional[str]:
     wrapper = CACHE.get(repo, revision)
     if wrapper:
-        xml = utils.get_xml_by_id(wrapper, tool_id)
+        xml = TOOL_INDEX.get_wrapper(wrapper, tool_id)
         if xml:
             return os.path.join(wrapper, xml)
     return None
 
 def _fetch_toolshed(owner: str, repo: str, revision: str, tool_id: str) -> Optional[str]:
     # download and add to cache
-    url = _get_url_via_revision(owner, repo, revision)
-    # logging.msg_downloading_tool(url)
-    tar = _download_wrapper(url)
-    CACHE.add(tar)
+    download_wrapper(owner, repo, revision)
     # fetch from cache
     return _fetch_cache(repo, revision, tool_id)
 
-def _get_url_via_revision(owner: str, repo: str, revision: str) -> str:
-    return f'https://toolshed.g2.bx.psu.edu/repos/{owner}/{repo}/archive/{revision}.tar.gz'
+def is_downloaded(repo: str, revision: str) -> bool:
+    return CACHE.get(repo, revision) is not None
 
-def _download_wrapper(url: str) -> tarfile.TarFile:
-    response = requests.get(url, stream=True)
-    return tarfile.open(fileobj=response.raw, mode='r:gz')
+def download_wrapper(owner: str, repo: str, revision: str) -> None:
+    """
+    downloads the wrapper tarball from the toolshed and adds to cache. 
+    safe to call from multiple threads (see prefetch_wrappers()).
+    """
+    url = _get_url_via_revision(owner, repo, revision)
+    # logging.msg_downloading_tool(url)
+    tarball = download_tarball(url, f'{CACHE.downloads_path}{os.sep}{repo}-{revision}.tar.gz')
+    try:
+        with tarfile.open(tarball, mode='r:gz') as tar:
+            with _CACHE_LOCK:
+                if not is_downloaded(repo, revision):
+                    CACHE.add(tar)
+    except tarfile.TarError:
+        # corrupt or rejected tarball: fetch again next time
+        discard_tarball(tarball)
+        raise
+
+def _get_url_via_revision(owner: str, repo: str, revision: str) -> str:
+    return f'{settings.ingest.galaxy.TOOLSHED_URL}/repos/{owner}/{repo}/archive/{revision}.tar.gz'
 
 
@@ -0,0 +1,70 @@
+
+
+from typing import Any, Optional
+
+from janis_core import settings
+from janis_core.ingestion.common import JsonFileCache
+
+"""
+RevisionCache flat file structure:
+{
+    [tool_shed]/[owner]/[repo]: {
+        'revisions': [ordered installable revisions, oldest first],
+        'details': {
+            revision: {
+                'owner': 'iuc',
+                'repo': 'abricate',
+                'revision': 'c2ef298da409',
+                'date_created': [repo date],
+                'tools': [
+                    {'id': 'abricate', 'version': '1.0.1', 'requirements': [{'name': 'abricate', 'version': '1.0.1'}]},
+                    ...
+                ]
+            },
+            revision: None,     # revision with no installable tools
+            ...
+        }
+    },
+    ...
+}
+"""
+
+
+class RevisionCache(JsonFileCache):
+    """
+    Persistent store of toolshed responses for each repository revision.
+    Toolshed revisions are immutable, so details for a revision never need to be
+    requested twice. The ordered revision list can grow as new revisions are published,
+    so is refreshed by ToolshedAPIInteractor if no cached revision satisfies a query.
+    """
+
+    @property
+    def path(self) -> str:
+        return settings.ingest.galaxy.REVISION_CACHE
+
+    def get_revisions(self, key: str) -> Optional[list[str]]:
+        data = self.read()
+        if key in data:
+            return list(data[key]['revisions'])
+        return None
+
+    def has_details(self, key: str, revision: str) -> bool:
+        data = self.read()
+        return key in data and revision in data[key]['details']
+
+    def get_details(self, key: str, revision: str) -> Optional[dict[str, Any]]:
+        return self.read()[key]['details'][revision]
+
+    def set_revisions(self, key: str, revisions: list[str]) -> None:
+        def merge(data: dict[str, Any]) -> None:
+            data.setdefault(key, {'revisions': [], 'details': {}})['revisions'] = revisions
+        self.update(merge)
+
+    def set_details(self, key: str, revision: str, details: Optional[dict[str, Any]]) -> None:
+        def merge(data: dict[str, Any]) -> None:
+            data.setdefault(key, {'revisions': [], 'details': {}})['details'][revision] = details
+        self.update(merge)
+
+
+# SINGLETON
+REVISION_CACHE = RevisionCache()
@@ -1,48 +1,158 @@
 
 
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Optional
 from datetime import datetime
 from bioblend.toolshed import ToolShedInstance
+from packaging.version import InvalidVersion
+from packaging.version import parse as parse_version
 
 from janis_core.ingestion.galaxy.gxtool.model import XMLRequirement
 from janis_core.ingestion.galaxy.gxtool.model import XMLCondaRequirement
 from janis_core.ingestion.galaxy.gxwrappers import Wrapper
 from janis_core.ingestion.galaxy.runtime.dates import JANIS_DATE_FMT
 from janis_core.ingestion.galaxy.runtime.dates import TOOLSHED_DATE_FMT
+from .revisions import REVISION_CACHE
 
 
 def request_single_wrapper(tool_shed: str, owner: str, repo: str, tool_id: str, tool_build: str) -> Wrapper:
     api_interactor = ToolshedAPIInteractor(tool_shed, owner, repo, tool_id, tool_build)
-    print(f"making galaxy API request for {api_interactor.tool_id} v{api_interactor.tool_build}")
     wrapper = api_interactor.get_single_wrapper()
     return wrapper
 
 
 @dataclass
 class ToolshedAPIInteractor:
+    """
+    finds the most recent repository revision containing tool_id at tool_build. 
+    
+    revision details are cached (see RevisionCache), and each cached revision lists 
+    every tool & version it contains, so later queries for any tool in the repo 
+    usually need no API requests. 
+    
+    tool versions generally increase with repository revisions, so revisions are
+    bisected on tool version before falling back to a newest-first scan. 
+    if bisection shows a cached revision list doesn't have the version, the list
+    is refreshed first (the version is likely in a newly published revision).
+    """
     tool_shed: str
     owner: str
     repo: str
     tool_id: str
     tool_build: str
+    _ts: Optional[ToolShedInstance] = field(default=None, init=False, repr=False)
+
+    @property
+    def key(self) -> str:
+        return f'{self.tool_shed}/{self.owner}/{self.repo}'
 
     # TODO MULTIPLE REQUEST ATTEMPTS WITH TIMEOUT???
     def get_single_wrapper(self) -> Wrapper:
-        ts = ToolShedInstance(f"https://{self.tool_shed}/")
-        revisions = ts.repositories.get_ordered_installable_revisions(self.repo, self.owner) # type: ignore
+        revisions = REVISION_CACHE.get_revisions(self.key)
+        if revisions is not None:
+            wrapper = self._search(revisions, scan_if_missing=False)
+            if wrapper:
+                return wrapper
+        
+        # not cached, or tool version may be in a newly published revision
+        revisions = self._request_revisions()
         if not revisions:
             raise RuntimeError
-        for revision in reversed(revisions):
-            revision_data = ts.repositories.get_repository_revision_install_info(self.repo, self.owner, revision) # type: ignore
-            if revision_data and len(revision_data[0]) > 0:  # type: ignore
-                repo_wrappers = self._galaxy_revision_info_to_wrappers(revision_data) # type: ignore
-                tool_wrapper = self._select_version_match_strict(repo_wrappers)
-                if tool_wrapper:
-                    return tool_wrapper
+        wrapper = self._search(revisions)
+        if wrapper:
+            return wrapper
         raise RuntimeError
 
+    def _search(self, revisions: list[str], scan_if_missing: bool=True) -> Optional[Wrapper]:
+        """revisions are ordered oldest first"""
+        bisectable, index = self._bisect(revisions)
+        if index is not None:
+            return self._get_match(revisions[index])
+        if bisectable and not scan_if_missing:
+            return None
+        
+        # fallback: newest-first (as cached revisions are free, only uncached ones cost requests)
+        for revision in reversed(revisions):
+            wrapper = self._get_match(revision)
+            if wrapper:
+                return wrapper
+        return None
+
+    def _bisect(self, revisions: list[str]) -> tuple[bool, Optional[int]]:
+        """
+        returns (bisectable, index of the newest revision with tool_build). 
+        index is None if the versions show tool_build isn't in revisions.
+        """
+        try:
+            target = parse_version(self.tool_build)
+        except InvalidVersion:
+            return False, None
+        # upper bound: first revision with a newer tool version
+        lo, hi = 0, len(revisions)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            version = self._get_tool_version(revisions[mid])
+            if version is None:
+                return False, None  # tool absent from this revision: can't bisect
+            if version == self.tool_build:
+                lo = mid + 1
+                continue
+            try:
+                parsed = parse_version(version)
+            except InvalidVersion:
+                return False, None
+            if parsed < target:
+                lo = mid + 1
+            elif parsed > target:
+                hi = mid
+            else:
+                return False, None  # equivalent but differently written versions
+        # revisions[lo - 1] was checked during bisection (no request)
+        if lo > 0 and self._get_tool_version(revisions[lo - 1]) == self.tool_build:
+            return True, lo - 1
+        return True, None
+
+    def _get_tool_version(self, revision: str) -> Optional[str]:
+        details = self._get_details(revision)
+        if details is not None:
+            for tool in details['tools']:
+                if tool['id'] == self.tool_id:
+                    return tool['version']
+        return None
+
+    def _get_match(self, revision: str) -> Optional[Wrapper]:
+        details = self._get_details(revision)
+        if details is None:
+            return None
+        repo_wrappers = self._details_to_wrappers(details)
+        return self._select_version_match_strict(repo_wrappers)
+
+    def _get_details(self, revision: str) -> Optional[dict[str, Any]]:
+        if not REVISION_CACHE.has_details(self.key, revision):
+            self._request_details(revision)
+        return REVISION_CACHE.get_details(self.key, revision)
+
+    def _get_toolshed(self) -> ToolShedInstance:
+        if self._ts is None:
+            print(f"making galaxy API request for {self.tool_id} v{self.tool_build}")
+            self._ts = ToolShedInstance(f"https://{self.tool_shed}/")
+        return self._ts
+
+    def _request_revisions(self) -> list[str]:
+        ts = self._get_toolshed()
+        revisions = ts.repositories.get_ordered_installable_revisions(self.repo, self.owner) # type: ignore
+        REVISION_CACHE.set_revisions(self.key, list(revisions or []))
+        return list(revisions or [])
+
+    def _request_details(self, revision: str) -> None:
+        ts = self._get_toolshed()
+        revision_data = ts.repositories.get_repository_revision_install_info(self.repo, self.owner, revision) # type: ignore
+        details = None
+        if revision_data and len(revision_data[0]) > 0:  # type: ignore
+            details = self._parse_revision_data(revision_data) # type: ignore
+        REVISION_CACHE.set_details(self.key, revision, details)
+
     def _select_version_match_strict(self, wrappers: list[Wrapper]) -> Optional[Wrapper]:
         for wrapper in wrappers:
             if wrapper.tool_id == self.tool_id and wrapper.tool_build == self.tool_build:
@@ -55,24 +165,40 @@ class ToolshedAPIInteractor:
                 return wrapper
         return wrappers[0]
 
-    def _galaxy_revision_info_to_wrappers(self, revision_data: list[dict[str, Any]]) -> list[Wrapper]:
-        wrappers: list[Wrapper] = []
+    def _parse_revision_data(self, revision_data: list[dict[str, Any]]) -> dict[str, Any]:
+        """summarises a revision install info response to the fields we use"""
         repository, metadata, install_info = revision_data
-        for tool_info in metadata['valid_tools']:
-            details = {
-                'owner': repository['owner'],
-                'repo': repository['name'],
-                'revision': self._parse_revision(install_info),
-                'tool_id': tool_info['id'],
-                'tool_build': tool_info['version'],
-                'date_created': self._parse_date_created(revision_data),
-                'requirements': self._parse_requirements(tool_info),
-            }
-            wrappers.append(Wrapper(details))
+        return {
+            'owner': repository['owner'],
+            'repo': repository['name'],
+            'revision': self._parse_revision(install_info),
+            'date_created': self._parse_date_created(revision_data),
+            'tools': [{
+                'id': tool_info['id'],
+                'version': tool_info['version'],
+                'requirements': [
+                    {'name': req['name'], 'version': req['version']} 
+                    for req in tool_info['requirements'] if req['type'] == 'package'
+                ]
+            } for tool_info in metadata.get('valid_tools', [])]
+        }
+
+    def _details_to_wrappers(self, details: dict[str, Any]) -> list[Wrapper]:
+        wrappers: list[Wrapper] = []
+        for tool in details['tools']:
+            wrappers.append(Wrapper({
+                'owner': details['owner'],
+                'repo': details['repo'],
+                'revision': details['revision'],
+                'tool_id': tool['id'],
+                'tool_build': tool['version'],
+                'date_created': details['date_created'],
+                'requirements': self._parse_requirements(tool),
+            }))
         return wrappers
 
     def _parse_requirements(self, tool_info: dict[str, Any]) -> list[XMLRequirement]:
-        return [XMLCondaRequirement(req['name'], req['version']) for req in tool_info['requirements'] if req['type'] == 'package']
+        return [XMLCondaRequirement(req['name'], req['version']) for req in tool_info['requirements']]
 
     def _parse_revision(self, install_info: dict[str, Any]) -> str:
         return list(install_info.values())[0][2]
@@ -82,6 +208,3 @@ class ToolshedAPIInteractor:
         repository = data[0]
         new_date = datetime.strptime(repository['create_time'], TOOLSHED_DATE_FMT)
         return new_date.strftime(JANIS_DATE_FMT)
-
-
-
@@ -1,11 +1,11 @@
 
 
-import json
-import os
-from typing import Optional
+from collections import defaultdict
+from typing import Any, Optional
+
+from janis_core import settings
 from janis_core.ingestion.galaxy.gxwrappers import Wrapper
-from janis_core.ingestion.common import safe_init_file
-from janis_core.settings.ingest.galaxy import WRAPPER_CACHE
+from janis_core.ingestion.common import JsonFileCache
 
 """
 WrapperCache flat file structure:
@@ -28,31 +28,102 @@ WrapperCache flat file structure:
 """
 
 
+class WrapperIndex(JsonFileCache):
+    """
+    In-memory copy of a WrapperCache flat file.
+    Entries are indexed by tool_id and by (repo, revision) so lookups don't
+    need to scan every wrapper.
+    The index is rebuilt whenever the file is modified by another process.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self.indexed: Optional[dict[str, list[dict[str, Any]]]] = None
+        self.by_tool_id: dict[str, list[dict[str, Any]]] = {}
+        self.by_revision: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        super().__init__()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def refresh(self) -> None:
+        """rebuilds the indexes if the file changed since last load"""
+        with self.thread_lock:
+            self._build(self.read())
+
+    def add(self, entry: dict[str, Any]) -> None:
+        """adds the entry (if not present) and saves to file"""
+        def merge(cache: dict[str, list[dict[str, Any]]]) -> None:
+            entries = cache.setdefault(entry['tool_id'], [])
+            if not any(x['revision'] == entry['revision'] for x in entries):
+                entries.append(entry)
+        with self.thread_lock:
+            self._build(self.update(merge))
+
+    def all(self) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        for entries in self.by_tool_id.values():
+            out += entries
+        return out
+
+    def exists(self, wrapper: Wrapper) -> bool:
+        for entry in self.by_tool_id.get(wrapper.tool_id, []):
+            if entry['revision'] == wrapper.revision:
+                return True
+        return False
+
+    def _build(self, cache: dict[str, list[dict[str, Any]]]) -> None:
+        if cache is self.indexed:
+            return
+        by_tool_id: dict[str, list[dict[str, Any]]] = {}
+        by_revision: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+        for entries in cache.values():
+            for entry in entries:
+                by_tool_id.setdefault(entry['tool_id'], []).append(entry)
+                by_revision[(entry['repo'], entry['revision'])].append(entry)
+        self.by_tool_id = by_tool_id
+        self.by_revision = by_revision
+        self.indexed = cache
+
 
+# one index per cache file, shared by all WrapperCache instances in this process
+_INDEXES: dict[str, WrapperIndex] = {}
 
+def _get_index(path: str) -> WrapperIndex:
+    if path not in _INDEXES:
+        _INDEXES[path] = WrapperIndex(path)
+    index = _INDEXES[path]
+    index.refresh()
+    return index
 
 
 class WrapperCache:
 
+    @property
+    def path(self) -> str:
+        return settings.ingest.galaxy.WRAPPER_CACHE
+
     def get(
-        self, 
+        self,
         tool_id: Optional[str]=None,
         tool_build: Optional[str]=None,
         owner: Optional[str]=None,
         repo: Optional[str]=None,
         revision: Optional[str]=None
     ) -> list[Wrapper]:
-        """loads cache then returns each Wrapper satisfying the query"""
-        # load cache and get relevant wrapper in dict form
-        cache = self._load()
-
-        wrappers: list[dict[str, str]] = []
-        for wrapper_list in cache.values():
-            wrappers += wrapper_list
-        
-        # this can be more elegant ofc
+        """returns each Wrapper in the cache satisfying the query"""
+        index = _get_index(self.path)
+
+        # narrow using the indexes
         if tool_id:
-            wrappers = [x for x in wrappers if x['tool_id'] == tool_id]
+            wrappers = index.by_tool_id.get(tool_id, [])
+        elif repo and revision:
+            wrappers = index.by_revision.get((repo, revision), [])
+        else:
+            wrappers = index.all()
+
+        # filter on remaining fields
         if tool_build:
             wrappers = [x for x in wrappers if x['tool_build'] == tool_build]
         if owner:
@@ -61,50 +132,17 @@ class WrapperCache:
             wrappers = [x for x in wrappers if x['repo'] == repo]
         if revision:
             wrappers = [x for x in wrappers if x['revision'] == revision]
-        
+
         # cast to Wrapper instances
         return [Wrapper(w) for w in wrappers]
-    
+
     def add(self, wrapper: Wrapper) -> None:
         """adds the Wrapper to our cache and saves to file"""
-        # load cache 
-        cache = self._load() 
-
-        # alter cache if needed
-        self._ensure_key(wrapper.tool_id, cache)
-        if not self.exists(wrapper, cache):
-            cache[wrapper.tool_id].append(wrapper.to_dict())
-        
-        # write
-        self._save(cache) 
-
-    def exists(self, wrapper: Wrapper, cache: dict[str, list[dict[str, str]]]) -> bool:
-        """checks if the wrapper is already in cache"""
-        if wrapper.tool_id in cache:
-            for entry in cache[wrapper.tool_id]:
-                if entry['revision'] == wrapper.revision:
-                    return True
-        return False
+        index = _get_index(self.path)
+        if index.exists(wrapper):
+            return
+        index.add(wrapper.to_dict())
 
-    def _load(self) -> dict[str, list[dict[str, str]]]:
-        """loads cache from flat file"""
-        path = WRAPPER_CACHE
-        if not os.path.exists(path):
-            safe_init_file(path, contents='{}')
-        with open(path, 'r') as fp:
-            return json.load(fp)
-    
-    def _save(self, cache: dict[str, list[dict[str, str]]]) -> None:
-        """saves our cache to file"""
-        path = WRAPPER_CACHE
-        if not os.path.exists(path):
-            safe_init_file(path, contents='{}')
-        with open(path, 'w') as fp:
-            json.dump(cache, fp)
-
-    def _ensure_key(self, key: str, cache: dict[str, list[dict[str, str]]]) -> None:    
-        """ensures { key: [] } in cache"""
-        if key not in cache:
-            cache[key] = []
-            
-    
+    def exists(self, wrapper: Wrapper) -> bool:
+        """checks if the wrapper is already in cache"""
+        return _get_index(self.path).exists(wrapper)
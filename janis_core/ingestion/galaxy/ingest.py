@@ -12,18 +12,22 @@ from janis_core import Tool
 from janis_core.ingestion.galaxy import runtime
 from janis_core.ingestion.galaxy import internal_mapping
 from janis_core.ingestion.galaxy.runtime.startup import tool_setup
-from janis_core.ingestion.galaxy.gxtool.parsing import load_xmltool
+from janis_core.ingestion.galaxy.gxtool.parsing import load_xmltool_cached
+from janis_core.ingestion.galaxy.gxtool.parsing import clear_xmltool_cache
 from janis_core.ingestion.galaxy.gxtool.command import gen_command
 
 from janis_core.ingestion.galaxy.internal_model.tool.generate import gen_tool
 from janis_core.ingestion.galaxy.internal_model.tool import ITool as InternalTool
+from janis_core.ingestion.galaxy.internal_model.tool.containers import prefetch_containers
 from janis_core.ingestion.galaxy.internal_model.workflow import Workflow
+from janis_core.ingestion.galaxy.internal_model.workflow import WorkflowStep
 from janis_core.ingestion.galaxy.internal_model.workflow import StepMetadata
 from janis_core.ingestion.galaxy.utils import galaxy as galaxy_utils
 
 from janis_core.ingestion.galaxy.gxworkflow.parsing.metadata import ingest_metadata
 from janis_core.ingestion.galaxy.gxworkflow.parsing.inputs import ingest_workflow_inputs
 from janis_core.ingestion.galaxy.gxworkflow.parsing.step import ingest_workflow_steps
+from janis_core.ingestion.galaxy.gxworkflow.parsing.tool_step.prefetch import prefetch_wrappers
 from janis_core.ingestion.galaxy.gxworkflow.parsing.tool_step.outputs import ingest_workflow_steps_outputs
 from janis_core.ingestion.galaxy.gxwrappers import request_single_wrapper
 
@@ -89,7 +93,7 @@ def ingest_tool(path: str, gxstep: Optional[dict[str, Any]]=None) -> InternalToo
     """
     datatypes.populate()
     runtime.tool.tool_path = path
-    galaxy = load_xmltool(path)
+    galaxy = load_xmltool_cached(path)
     command = gen_command(galaxy, gxstep)
     internal = gen_tool(galaxy, command, gxstep)
     return internal
@@ -107,9 +111,13 @@ def ingest_workflow(path: str) -> Workflow:
     Overall process for galaxy ingest is: galaxy -> *internal* -> janis_core model.
     """
     datatypes.populate()
+    clear_xmltool_cache()
     galaxy = _load_galaxy_workflow(path)
     internal = Workflow()
 
+    # resolving & downloading toolshed wrappers for all steps up-front (concurrently)
+    prefetch_wrappers(galaxy)
+
     # ingesting workflow entities to internal
     ingest_metadata(internal, galaxy)
     ingest_workflow_inputs(internal, galaxy)
@@ -134,13 +142,24 @@ def ingest_workflow(path: str) -> Workflow:
 
 # (this function should probably be elsewhere)
 def ingest_workflow_tools(janis: Workflow, galaxy: dict[str, Any]) -> None:
+    # each tool step mapped (and its wrapper fetched) once
+    steps: list[tuple[dict[str, Any], WorkflowStep, dict[str, Optional[str]], str]] = []
     for gx_step in galaxy['steps'].values():
         if gx_step['type'] == 'tool':
             j_step = internal_mapping.step(gx_step['id'], janis, galaxy)
             args = _gen_ingest_settings_for_step(j_step.metadata)
-            tool_setup(args)
-            tool = ingest_tool(runtime.tool.tool_path, gx_step)
-            j_step.set_tool(tool)
+            runtime.tool.set(from_args=args)
+            steps.append((gx_step, j_step, args, runtime.tool.tool_path))
+
+    # resolving containers for all steps up-front (concurrently)
+    prefetch_containers(load_xmltool_cached(tool_path) for _, _, _, tool_path in steps)
+
+    for gx_step, j_step, args, tool_path in steps:
+        tool_setup(args)
+        # XMLTool is shared between steps using the same wrapper (see load_xmltool_cached).
+        # Command & ITool are generated per step as they depend on the step tool_state.
+        tool = ingest_tool(tool_path, gx_step)
+        j_step.set_tool(tool)
 
 def _is_galaxy_local_tool(uri: str) -> bool:
     _, ext = os.path.splitext(uri)
@@ -1,32 +1,137 @@
 
 
-from galaxy.tool_util.deps.mulled.util import quay_versions
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional
+
 from galaxy.tool_util.deps.mulled.util import v2_image_name
 from galaxy.tool_util.deps.mulled.util import build_target
 
 from janis_core import settings
+from janis_core.ingestion.common import JsonFileCache
 from janis_core.ingestion.galaxy.gxtool.model import XMLTool
+from janis_core.ingestion.galaxy.gxtool.model import XMLRequirement
+from .registries import get_registry
 
 
 DEFAULT_CONTAINER = 'quay.io/biocontainers/python:3.10.1'
 
+"""
+ContainerCache flat file structure:
+{
+    [requirement key]: {
+        'container': 'quay.io/biocontainers/abricate:1.0.1--ha8f3691_2',
+        'timestamp': [unix time resolved],
+    },
+    ...
+}
+requirement key is the sorted 'name=version' of each requirement, comma separated.
+"""
+
+
+class ContainerCache(JsonFileCache):
+    """
+    Persistent store of resolved containers, keyed by requirement set.
+    Entries older than settings.ingest.galaxy.CONTAINER_CACHE_TTL are re-resolved
+    (new builds of a package version may have been published).
+    Disabled via settings.ingest.galaxy.DISABLE_CONTAINER_CACHE.
+    """
+
+    @property
+    def path(self) -> str:
+        return settings.ingest.galaxy.CONTAINER_CACHE
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.read().get(key)
+        if entry is None:
+            return None
+        if time.time() - entry['timestamp'] > settings.ingest.galaxy.CONTAINER_CACHE_TTL:
+            return None
+        return entry['container']
+
+    def add(self, entries: dict[str, str]) -> None:
+        """adds {key: container} entries and saves to file"""
+        if not entries:
+            return
+        now = time.time()
+        def merge(data: dict[str, Any]) -> None:
+            for key, container in entries.items():
+                data[key] = {'container': container, 'timestamp': now}
+        self.update(merge)
+
+
+# SINGLETON
+CACHE = ContainerCache()
+
 
 def resolve_dependencies_as_container(xmltool: XMLTool) -> str:
     # for each of the galaxy requirements, find a useable container from quay.io.
-    # return the container url. 
+    # return the container url.
     if settings.testing.TESTING_USE_DEFAULT_CONTAINER:
         return DEFAULT_CONTAINER
 
     elif len(xmltool.metadata.requirements) == 0:
         return DEFAULT_CONTAINER
-    
+
     elif len(xmltool.metadata.requirements) == 1:
         req = xmltool.metadata.requirements[0]
-        tags = quay_versions('biocontainers', req.name)
-        version_tags = [x for x in tags if x.startswith(req.version)]
-        return f'quay.io/biocontainers/{req.name}:{version_tags[0]}'
-    
+        key = requirements_key(xmltool.metadata.requirements)
+        container = _get_cached(key)
+        if container is None:
+            container = _resolve_single(req)
+            _set_cached({key: container})
+        return container
+
     else:
+        # mulled image names are derived from the requirements (no lookup needed)
         items = [build_target(req.name, version=req.version) for req in xmltool.metadata.requirements]
         resource = v2_image_name(items)
-        return f'quay.io/biocontainers/{resource}'
\ No newline at end of file
+        return f'quay.io/biocontainers/{resource}'
+
+def prefetch_containers(xmltools: Iterable[XMLTool]) -> None:
+    """
+    resolves the containers for many tools at once (eg each step of a workflow).
+    each distinct requirement set missing from the cache is looked up once, concurrently.
+    """
+    if settings.testing.TESTING_USE_DEFAULT_CONTAINER:
+        return
+    if settings.ingest.galaxy.DISABLE_CONTAINER_CACHE:
+        return
+
+    todo: dict[str, XMLRequirement] = {}
+    for xmltool in xmltools:
+        if len(xmltool.metadata.requirements) == 1:
+            key = requirements_key(xmltool.metadata.requirements)
+            if key not in todo and _get_cached(key) is None:
+                todo[key] = xmltool.metadata.requirements[0]
+    if not todo:
+        return
+
+    workers = max(1, min(settings.ingest.galaxy.PREFETCH_WORKERS, len(todo)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {key: executor.submit(_resolve_single, req) for key, req in todo.items()}
+        resolved: dict[str, str] = {}
+        for key, future in futures.items():
+            try:
+                resolved[key] = future.result()
+            except Exception:
+                pass  # retried (and reported) when the tool itself is ingested
+    _set_cached(resolved)
+
+def requirements_key(requirements: list[XMLRequirement]) -> str:
+    return ','.join(sorted(f'{req.name}={req.version}' for req in requirements))
+
+def _resolve_single(req: XMLRequirement) -> str:
+    tags = get_registry().get_tags(req.name)
+    version_tags = [x for x in tags if x.startswith(req.version)]
+    return f'quay.io/biocontainers/{req.name}:{version_tags[0]}'
+
+def _get_cached(key: str) -> Optional[str]:
+    if settings.ingest.galaxy.DISABLE_CONTAINER_CACHE:
+        return None
+    return CACHE.get(key)
+
+def _set_cached(entries: dict[str, str]) -> None:
+    if settings.ingest.galaxy.DISABLE_CONTAINER_CACHE:
+        return
+    CACHE.add(entries)
@@ -0,0 +1,69 @@
+
+
+import json
+import threading
+from typing import Optional, Protocol
+
+import requests
+from galaxy.tool_util.deps.mulled.util import quay_versions
+
+from janis_core import settings
+
+
+class ContainerRegistry(Protocol):
+    """source of available image tags for a biocontainers package"""
+
+    def get_tags(self, name: str) -> list[str]:
+        ...
+
+
+class QuayRegistry:
+    """biocontainers on quay.io (network)"""
+
+    def __init__(self) -> None:
+        self.local = threading.local()
+
+    def get_tags(self, name: str) -> list[str]:
+        # requests sessions aren't thread-safe: one per thread, reused for each lookup
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.session()
+        return quay_versions('biocontainers', name, session=self.local.session)
+
+
+class LocalRegistry:
+    """
+    offline stand-in for quay.io.
+    reads a json file mapping package name -> list of image tags, eg
+    {"abricate": ["1.0.1--ha8f3691_2", "0.9.8--h1341992_0"], ...}
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'r') as fp:
+            self.tags: dict[str, list[str]] = json.load(fp)
+
+    def get_tags(self, name: str) -> list[str]:
+        return self.tags.get(name, [])
+
+
+_REGISTRY: Optional[ContainerRegistry] = None
+_REGISTRY_PATH: Optional[str] = None  # CONTAINER_REGISTRY the registry was built for ('' = quay.io). None if set_registry()
+
+def get_registry() -> ContainerRegistry:
+    """
+    the registry used to resolve containers.
+    a LocalRegistry if settings.ingest.galaxy.CONTAINER_REGISTRY is set, otherwise quay.io.
+    built once per configured path.
+    """
+    global _REGISTRY, _REGISTRY_PATH
+    path = settings.ingest.galaxy.CONTAINER_REGISTRY or ''
+    if _REGISTRY is None or (_REGISTRY_PATH is not None and _REGISTRY_PATH != path):
+        _REGISTRY = LocalRegistry(path) if path else QuayRegistry()
+        _REGISTRY_PATH = path
+    return _REGISTRY
+
+def set_registry(registry: Optional[ContainerRegistry]) -> None:
+    """plug in a different registry. None restores the default."""
+    global _REGISTRY, _REGISTRY_PATH
+    _REGISTRY = registry
+    _REGISTRY_PATH = None
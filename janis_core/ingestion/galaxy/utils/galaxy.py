@@ -2,7 +2,6 @@
 import os
 import json
 import xml.etree.ElementTree as et
-from typing import Optional
 
 
 def is_galaxy_workflow(path: str) -> bool:
@@ -32,15 +31,6 @@ def get_xml_id(filepath: str) -> str:
     root = tree.getroot()
     return str(root.attrib['id']) # type: ignore
 
-def get_xml_by_id(wrapper_dir: str, query_id: str) -> Optional[str]:
-    xmls = [x for x in os.listdir(wrapper_dir) if x.endswith('.xml') and 'macros' not in x]
-    for xml in xmls:
-        path = os.path.join(wrapper_dir, xml)
-        tool_id = get_xml_id(path)
-        if query_id == tool_id:
-            return xml
-    return None 
-
 def get_macros(wrapper_dir: str) -> list[str]:
     out: list[str] = []    
     xmls = [x for x in os.listdir(wrapper_dir) if x.endswith('.xml')]
@@ -49,3 +39,19 @@ def get_macros(wrapper_dir: str) -> list[str]:
         if is_macro_xml(path):
             out.append(path)
     return out
+
+def get_imported_macros(filepath: str) -> list[str]:
+    """returns paths to each macro xml imported by the xml at filepath (including nested imports)"""
+    out: list[str] = []
+    queue = [filepath]
+    while queue:
+        current = queue.pop(0)
+        root = et.parse(current).getroot()
+        for elem in root.iter('import'):
+            if not elem.text:
+                continue
+            path = os.path.join(os.path.dirname(current), elem.text.strip())
+            if os.path.exists(path) and path not in out:
+                out.append(path)
+                queue.append(path)
+    return out
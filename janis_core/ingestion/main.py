@@ -1,8 +1,12 @@
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
+import pickle
+import traceback
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
 if TYPE_CHECKING:
     from janis_core import Tool
+    from janis_core.messages import LogLine
 
 def ingest_galaxy(uri: str) -> Tool:
     from .galaxy import parse_galaxy
@@ -21,7 +25,6 @@ def ingest(
     fmt: str, 
     build_galaxy_tool_images: bool = False, 
     ) -> Tool:
-    from janis_core import settings
     from janis_core.messages import configure_logging
     from .SupportedIngestion import SupportedIngestion
 
@@ -30,11 +33,7 @@ def ingest(
     configure_logging()                         
     
     # set ingest settings
-    settings.ingest.SOURCE = fmt                     
-    settings.validation.STRICT_IDENTIFIERS = False
-    settings.validation.VALIDATE_STRINGFORMATTERS = False
-    if build_galaxy_tool_images:
-        settings.ingest.galaxy.GEN_IMAGES = True
+    _configure_settings(fmt, build_galaxy_tool_images)
 
     # do ingest
     assert(fmt in SupportedIngestion.all())  # validate format
@@ -45,4 +44,79 @@ def ingest(
         return ingest_cwl(path)
     elif fmt == 'wdl':
         return ingest_wdl(path)
-    raise Exception
\ No newline at end of file
+    raise Exception
+
+@dataclass
+class IngestResult:
+    path: str
+    tool: Optional[Tool] = None
+    error: Optional[str] = None     # traceback if the ingest failed
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def ingest_many(
+    paths: list[str], 
+    fmt: str, 
+    workers: Optional[int] = None,
+    build_galaxy_tool_images: bool = False, 
+    ) -> list[IngestResult]:
+    """
+    ingest() for many files, run concurrently in a pool of worker processes 
+    (settings & the message log are per-process, so ingests can't share one).
+    returns a result for each path, in the same order as paths. 
+    a failed ingest doesn't stop the others: see IngestResult.error.
+    messages logged by each ingest are added to the message log of this process.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from janis_core.messages import configure_logging
+    from janis_core.messages import log_message
+    from janis_core.utils import get_mp_context
+    from .SupportedIngestion import SupportedIngestion
+
+    assert(fmt in SupportedIngestion.all())  # validate format
+    configure_logging()
+    _configure_settings(fmt, build_galaxy_tool_images)
+    preload_ingestor(fmt)
+
+    results: list[IngestResult] = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_mp_context()) as executor:
+        futures = [executor.submit(_ingest_worker, path, fmt, build_galaxy_tool_images) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                pickled_tool, loglines = future.result()
+                tool = pickle.loads(pickled_tool)
+            except Exception:
+                results.append(IngestResult(path, error=traceback.format_exc()))
+                continue
+            for line in loglines:
+                log_message(line.entity_uuid, line.message, line.category)
+            results.append(IngestResult(path, tool=tool))
+    return results
+
+def _ingest_worker(path: str, fmt: str, build_galaxy_tool_images: bool) -> tuple[bytes, list[LogLine]]:
+    from janis_core.messages import load_loglines
+    from janis_core.messages import temporary_message_log
+    
+    # each worker logs to its own file (ingest() clears the log when it starts)
+    with temporary_message_log():
+        tool = ingest(path, fmt, build_galaxy_tool_images=build_galaxy_tool_images)
+        loglines = load_loglines()
+    # pickled here: a tool which can't be unpickled fails this path only (not the pool)
+    return pickle.dumps(tool), loglines
+
+def preload_ingestor(fmt: str) -> None:
+    """imports the ingestor for fmt (before starting worker processes, so forked workers don't each import it)"""
+    import importlib
+    if fmt in ['galaxy', 'cwl', 'wdl']:
+        importlib.import_module(f'{__package__}.{fmt}')
+
+def _configure_settings(fmt: str, build_galaxy_tool_images: bool) -> None:
+    from janis_core import settings
+    settings.ingest.SOURCE = fmt                     
+    settings.validation.STRICT_IDENTIFIERS = False
+    settings.validation.VALIDATE_STRINGFORMATTERS = False
+    if build_galaxy_tool_images:
+        settings.ingest.galaxy.GEN_IMAGES = True
@@ -5,6 +5,7 @@ from .enums import FormatCategory
 from .enums import ErrorCategory
 from .logfile import LogFile
 from .logfile import LogLine
+from .logfile import MessageStore
 
 # logging functions
 # from .owner import get_owner_uuid
@@ -12,6 +13,8 @@ from .main import configure_logging
 from .main import info_ingesting_tool
 from .main import info_ingesting_workflow
 from .main import log_message
+from .main import flush_messages
+from .main import temporary_message_log
 
 # injection functions
 from .main import load_loglines
@@ -4,7 +4,6 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from janis_core import CommandToolBuilder, CodeTool, WorkflowBuilder
 
-from Levenshtein import distance as levenshtein_distance
 import regex as re
 from typing import Optional, Tuple
 from abc import ABC, abstractmethod
@@ -18,6 +17,8 @@ from .enums import FormatCategory
 
 ### MISC CONSTANTS ###
 
+INDENT = re.compile(r'[ \t]*')
+
 COMMENTER_MAP = {
     'nextflow': '//',
     'cwl': '#',
@@ -168,7 +169,12 @@ class WorkflowInjector(MessageInjector):
         - if messages, find step call
         - if found, get indent
         - inject message block above step call with correct indent
+        Step calls are located once in the text (before any messages are added), 
+        then all message blocks are inserted in a single pass. 
         """
+        calls: Optional[StepCallIndex] = None
+        insertions: list[Tuple[int, str]] = []
+
         for sname, step in self.internal.step_nodes.items():
             step_uuids_map = gather_uuids(step)
             
@@ -183,21 +189,15 @@ class WorkflowInjector(MessageInjector):
                 continue
 
             # get step location in translated text
-            loc = _get_step_loc(sname, self.translated)
+            if calls is None:
+                calls = StepCallIndex(self.translated)
+            loc = calls.locate(sname)
             if loc is None:
                 print(self.translated)
                 raise NotImplementedError
             
-            # get indent for the step call - awful in general but works
-            # split file into top and bottom pivoting on the match location
-            top = self.translated[:loc]
-            bottom = self.translated[loc:]
-
-            # get the indent level of the step call
-            if not bottom.startswith(' ') and not bottom.startswith('\t'):
-                indent = ''
-            else:
-                indent = re.findall(r'[ \t]+', bottom)[0]
+            # get the indent level of the step call - awful in general but works
+            indent = INDENT.match(self.translated, loc).group(0) # type: ignore
 
             # apply indent to each line of the message block
             if normal_messages:
@@ -218,8 +218,10 @@ class WorkflowInjector(MessageInjector):
             if scripting_messages:
                 messages += f'\n\n{scripting_messages}'
             
-            # inject indented message block above step call
-            self.translated = top + messages + '\n' + bottom
+            # message block goes above step call
+            insertions.append((loc, messages + '\n'))
+        
+        self.translated = _insert_all(self.translated, insertions)
         
 
 
@@ -256,35 +258,70 @@ class WorkflowInjectorSplit(WorkflowInjector):
             self.translated = f'{commenter} {settings.messages.MESSAGES_BANNER}\n{messages}\n\n{self.translated}'
 
 
-def _get_step_loc(step_name: str, translated: str) -> Optional[int]:
+class StepCallIndex:
+    """
+    Locations of the step calls in translated text. 
+    The text is scanned for step calls once. Steps are then matched to their call by 
+    standardised symbol, falling back to the closest call symbol (levenshtein distance).
     """
-    returned loc should be the first character of the target line, not the start of the step symbol
-    eg nextflow process call:
-        "               MINIMAP2("
-         ^ loc is here, ^ not here 
-    """ 
 
+    def __init__(self, translated: str) -> None:
+        self.calls = _get_step_call_starts(translated)
+        self.exact: dict[str, int] = {}
+        for loc, call_symbol in self.calls:
+            if call_symbol is not None:
+                self.exact.setdefault(_standardise_symbol(call_symbol), loc)
+
+    def locate(self, step_name: str) -> Optional[int]:
+        """
+        returned loc should be the first character of the target line, not the start of the step symbol
+        eg nextflow process call:
+            "               MINIMAP2("
+             ^ loc is here, ^ not here 
+        """ 
+        step_symbol = _standardise_symbol(step_name)
+        if step_symbol in self.exact:
+            return self.exact[step_symbol]
+        
+        # need to standardise the step name and call name to properly compare. 
+        from Levenshtein import distance as levenshtein_distance
+        best_score, best_loc = 999, None
+        for loc, call_symbol in self.calls:
+            if call_symbol is None:
+                continue
+            call_symbol = _standardise_symbol(call_symbol)
+            score = levenshtein_distance(step_symbol, call_symbol)
+            if score < best_score:
+                best_score = score
+                best_loc = loc
+        return best_loc
+
+def _get_step_loc(step_name: str, translated: str) -> Optional[int]:
+    return StepCallIndex(translated).locate(step_name)
+
+def _get_step_call_starts(translated: str) -> list[Tuple[int, str]]:
     # get loc, step call name for all step calls in translated text
     if settings.translate.DEST == 'cwl':
-        matches = _get_step_call_starts_cwl(translated)
+        return _get_step_call_starts_cwl(translated)
     elif settings.translate.DEST == 'nextflow':
-        matches = _get_step_call_starts_nextflow(translated)
+        return _get_step_call_starts_nextflow(translated)
     elif settings.translate.DEST == 'wdl':
-        matches = _get_step_call_starts_wdl(translated)
+        return _get_step_call_starts_wdl(translated)
     else:
         raise NotImplementedError(f'No step location pattern for {settings.translate.DEST}')
-    
-    # select the correct step call from the list of step calls
-    # need to standardise the step name and call name to properly compare. 
-    step_symbol = _standardise_symbol(step_name)
-    best_score, best_loc = 999, None
-    for loc, call_symbol in matches:
-        call_symbol = _standardise_symbol(call_symbol)
-        score = levenshtein_distance(step_symbol, call_symbol)
-        if score < best_score:
-            best_score = score
-            best_loc = loc
-    return best_loc
+
+def _insert_all(text: str, insertions: list[Tuple[int, str]]) -> str:
+    """inserts each (loc, insert) into text. inserts at the same loc keep their order."""
+    if not insertions:
+        return text
+    pieces: list[str] = []
+    prev = 0
+    for loc, insert in sorted(insertions, key=lambda x: x[0]):
+        pieces.append(text[prev:loc])
+        pieces.append(insert)
+        prev = loc
+    pieces.append(text[prev:])
+    return ''.join(pieces)
 
 def _standardise_symbol(symbol: str) -> str:
     return symbol.replace('_', '').replace('-', '').upper()
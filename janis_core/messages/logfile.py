@@ -1,6 +1,8 @@
 
 from typing import Optional
 from pathlib import Path
+import heapq
+import os
 from dataclasses import dataclass
 from .enums import ErrorCategory
 
@@ -63,7 +65,8 @@ class LogFile:
                 logline = self.string_to_logline(line)
                 self.lines.append(logline)
 
-    def string_to_logline(self, line: str) -> LogLine:
+    @staticmethod
+    def string_to_logline(line: str) -> LogLine:
         str_level, str_cat, str_uuid, str_message = line.strip('\n').split('\t')
         if str_cat == 'None':
             category = None
@@ -72,4 +75,90 @@ class LogFile:
         entity_uuid = None if str_uuid == 'None' else str_uuid
         return LogLine(str_message, category, entity_uuid)
 
-    
\ No newline at end of file
+    
+
+class MessageStore:
+    """
+    In-memory store of logged messages, mirrored to the message log file.
+    Lines are indexed by entity uuid, category, (entity uuid, category) and dedup key, 
+    so logging and querying (eg each block in inject_messages) don't re-read the file. 
+    New lines are buffered and appended to the file in batches (every FLUSH_SIZE lines, 
+    or on flush()).
+    Assumes this process is the only writer to the log file.
+    """
+    FLUSH_SIZE = 200
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.lines: list[LogLine] = []
+        self.pending: list[LogLine] = []
+        self.by_uuid: dict[Optional[str], list[int]] = {}
+        self.by_category: dict[Optional[ErrorCategory], list[int]] = {}
+        self.by_uuid_category: dict[tuple[Optional[str], Optional[ErrorCategory]], list[int]] = {}
+        self.keys: set[tuple[Optional[ErrorCategory], str, Optional[str]]] = set()
+        self.load()
+
+    def contains(self, category: Optional[ErrorCategory], entity_uuid: Optional[str], msg: str) -> bool:
+        return (category, msg, entity_uuid) in self.keys
+
+    def add(
+        self, 
+        category: Optional[ErrorCategory], 
+        entity_uuid: Optional[str], 
+        msg: str, 
+        ) -> None:
+        # same formatting as LogFile.add()
+        message = msg.replace('\n', '')
+        logline = LogLine(message=message, category=category, entity_uuid=entity_uuid)
+        self.index(logline)
+        self.pending.append(logline)
+        if len(self.pending) >= self.FLUSH_SIZE:
+            self.flush()
+
+    def query(
+        self,
+        category: Optional[ErrorCategory]|bool=False,
+        entity_uuids: Optional[set[str]]=None,
+        ) -> list[LogLine]:
+        """loglines matching the filters, in logged order"""
+        if entity_uuids is not None:
+            # eg messages for a step (uuids of step, step inputs, edges...) for one category
+            if category != False:
+                groups = [self.by_uuid_category.get((uuid, category), []) for uuid in set(entity_uuids)]  # type: ignore
+            else:
+                groups = [self.by_uuid.get(uuid, []) for uuid in set(entity_uuids)]
+            groups = [g for g in groups if g]
+            if len(groups) == 1:
+                positions = groups[0]
+            else:
+                positions = list(heapq.merge(*groups))
+        elif category != False:
+            positions = self.by_category.get(category, [])  # type: ignore
+        else:
+            return list(self.lines)
+        return [self.lines[pos] for pos in positions]
+
+    def flush(self) -> None:
+        """appends buffered lines to the log file"""
+        if not self.pending:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.filepath)), exist_ok=True)
+        with open(self.filepath, 'a') as fp:
+            fp.write(''.join(f'{str(logline)}\n' for logline in self.pending))
+        self.pending = []
+
+    def index(self, logline: LogLine) -> None:
+        pos = len(self.lines)
+        self.lines.append(logline)
+        self.by_uuid.setdefault(logline.entity_uuid, []).append(pos)
+        self.by_category.setdefault(logline.category, []).append(pos)
+        self.by_uuid_category.setdefault((logline.entity_uuid, logline.category), []).append(pos)
+        self.keys.add((logline.category, logline.message, logline.entity_uuid))
+
+    def load(self) -> None:
+        """indexes lines already in the log file (eg logged before this store was created)"""
+        if not os.path.exists(self.filepath):
+            return
+        with open(self.filepath, 'r') as fp:
+            for line in fp.readlines():
+                self.index(LogFile.string_to_logline(line))
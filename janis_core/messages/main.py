@@ -1,12 +1,15 @@
 
 
 from logging import getLogger, config
-from .logfile import LogFile
 from .logfile import LogLine
+from .logfile import MessageStore
 from .enums import ErrorCategory
 
-from typing import Optional, Any
+from typing import Optional, Any, Iterator
+from contextlib import contextmanager
+import atexit
 import os
+import tempfile
 import warnings
 import yaml
 from pathlib import Path
@@ -61,7 +64,9 @@ def configure_logging() -> None:
     if not os.path.exists(os.path.dirname(MESSAGE_LOG_PATH)):
         os.mkdir(os.path.dirname(MESSAGE_LOG_PATH))
 
-    # delete previous log
+    # delete previous log (and any messages not yet written to it)
+    global _STORE
+    _STORE = None
     path = Path(MESSAGE_LOG_PATH)
     if path.exists():
         path.unlink()
@@ -73,6 +78,48 @@ def configure_logging() -> None:
     config.dictConfig(the_dict)
 
 
+# -------------
+# message store
+# -------------
+
+# SINGLETON
+_STORE: Optional[MessageStore] = None
+
+def get_message_store() -> MessageStore:
+    """the MessageStore for MESSAGE_LOG_PATH"""
+    global _STORE
+    if _STORE is None or _STORE.filepath != MESSAGE_LOG_PATH:
+        if _STORE is not None:
+            _STORE.flush()
+        _STORE = MessageStore(MESSAGE_LOG_PATH)
+    return _STORE
+
+def flush_messages() -> None:
+    """writes any buffered messages to MESSAGE_LOG_PATH"""
+    if _STORE is not None:
+        _STORE.flush()
+
+atexit.register(flush_messages)
+
+@contextmanager
+def temporary_message_log() -> Iterator[None]:
+    """
+    messages are logged to a temporary file inside this block (eg for one job of many
+    run in worker processes, so jobs don't share / clear the same log).
+    the log is discarded afterwards: read any messages needed inside the block.
+    the log (and store) in use before the block is restored afterwards.
+    """
+    global MESSAGE_LOG_PATH, _STORE
+    previous_path, previous_store = MESSAGE_LOG_PATH, _STORE
+    with tempfile.TemporaryDirectory() as tmpdir:
+        MESSAGE_LOG_PATH = f'{tmpdir}/messages.log'
+        _STORE = None
+        try:
+            yield
+        finally:
+            MESSAGE_LOG_PATH, _STORE = previous_path, previous_store
+
+
 # ----------
 # to console
 # ----------
@@ -89,20 +136,19 @@ def info_ingesting_tool(spec: str, name: str) -> None:
 # -------
 
 def log_message(entity_uuid: Optional[str], msg: str, category: ErrorCategory) -> None:
-    logfile = LogFile(MESSAGE_LOG_PATH)
+    store = get_message_store()
     # if no uuid provided, consider this a general message provided during ingestion / translation. 
     # these messages can be shown to the user at the top of the main parsed file (ie the main workflow / tool), 
     # or you could generate a file in the output folder for the user to show this info. 
 
     # check the same message isn't already present
-    for ll in logfile.lines:
-        if ll.category == category and ll.message == msg and ll.entity_uuid == entity_uuid:
-            return
+    if store.contains(category=category, entity_uuid=entity_uuid, msg=msg):
+        return
     
     # log the new message
     if entity_uuid is None:
         entity_uuid = 'general'
-    logfile.add(entity_uuid=entity_uuid, category=category, msg=msg)
+    store.add(entity_uuid=entity_uuid, category=category, msg=msg)
 
 def load_loglines(
     category: Optional[ErrorCategory]|bool=False,
@@ -111,14 +157,5 @@ def load_loglines(
     # Type hinting ugly as hell 
     # Trying to express that None can be provided alongside an actual value. 
     # If None, specifically filters for loglines where the attribute is None. 
-
-    logfile = LogFile(MESSAGE_LOG_PATH)
-    loglines = logfile.lines
-    
-    # filters
-    if category != False:
-        loglines = [x for x in loglines if x.category.value == category.value]
-    if entity_uuids is not None:
-        loglines = [x for x in loglines if x.entity_uuid in entity_uuids]
-    return loglines
-
+    store = get_message_store()
+    return store.query(category=category, entity_uuids=entity_uuids)
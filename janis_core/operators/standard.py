@@ -633,6 +633,10 @@ class FileSizeOperator(Operator):
             return instance * multiplier
         return instance
 
+    def __getnewargs__(self):
+        # __new__ requires the source (pickle / copy)
+        return (self.args[0],)
+
     @staticmethod
     def friendly_signature():
         return "File -> Float"
@@ -14,9 +14,21 @@ _TEST_DATA_DIR = os.path.join(_JANIS_INSTALL_DIR, 'tests', 'data')
 
 GEN_IMAGES = False
 DISABLE_CONTAINER_CACHE = False
+CONTAINER_CACHE_TTL = 60 * 60 * 24 * 30   # seconds
+CONTAINER_REGISTRY = None        # path to local {package: [tags]} json to resolve containers offline (default: quay.io)
+ENABLE_TOOL_CACHE = False        # opt-in persistent cache of parsed tool xmls (see TOOL_CACHE_DIR)
 GALAXY_CONFIG = f'{_GALAXY_DATA_DIR}/galaxy_config.yaml'
 DATATYPES_YAML = f'{_INGEST_DATA_DIR}/janis_types.yaml'
+DATATYPES_COMPILED = f'{_INGEST_DATA_DIR}/janis_types.pickle'
 CONTAINER_CACHE = f'{_JANIS_DATA_DIR}/galaxy_containers/cache.json'
 WRAPPER_CACHE = f'{_JANIS_DATA_DIR}/galaxy_wrappers/cache.json'   
+REVISION_CACHE = f'{_JANIS_DATA_DIR}/galaxy_revisions/cache.json'
+TOOL_CACHE_DIR = f'{_JANIS_DATA_DIR}/galaxy_tools'
+TOOL_INDEX = f'{_JANIS_DATA_DIR}/galaxy_tool_index.json'
+TOOLSHED_URL = 'https://toolshed.g2.bx.psu.edu'
+TOOLSHED_TIMEOUT = 60            # seconds
+PREFETCH_WORKERS = 8             # concurrent toolshed requests when prefetching workflow wrappers
+PREFETCH_RETRIES = 3
+MAX_WRAPPER_SIZE = 500 * 1024 * 1024   # bytes, extracted
 DEFAULT_WRAPPERS_DIR = f'{_JANIS_DATA_DIR}/galaxy_wrappers'
 TESTING_WRAPPERS_DIR = f'{_TEST_DATA_DIR}/galaxy/wrappers'
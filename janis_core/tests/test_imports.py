@@ -0,0 +1,97 @@
+
+
+import subprocess
+import sys
+import unittest
+import pytest
+
+import janis_core
+
+
+# slow optional / heavy dependencies: only loaded when an ingest or translate needs them
+HEAVY_MODULES = ['galaxy', 'cwl_utils', 'WDL', 'lark', 'Levenshtein', 'nose']
+
+# entry points which should import quickly (eager loading of janis_core took ~1s)
+ENTRY_MODULES = ['janis_core', 'janis_core.cli']
+
+
+def _run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout + result.stderr
+
+def _cumulative_import_time(module: str) -> int:
+    # lines look like 'import time:  self [us] | cumulative | imported package'
+    output = _run(f'import {module}')
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == module:
+            return int(cumulative)
+    raise RuntimeError(f'{module} not found in importtime output')
+
+
+class TestImportTime(unittest.TestCase):
+    """
+    regression benchmark for import time of the package and CLI.
+    asserts on which modules are imported (deterministic) rather than timings.
+    """
+
+    def test_heavy_modules_deferred(self) -> None:
+        for module in ENTRY_MODULES:
+            code = f'import sys, {module}; print(sorted(sys.modules))'
+            loaded = _run(code).splitlines()[-1]
+            for heavy in HEAVY_MODULES:
+                with self.subTest(module=module, heavy=heavy):
+                    self.assertNotIn(f"'{heavy}'", loaded)
+                    self.assertNotIn(f"'{heavy}.", loaded)
+
+    def test_import_order(self) -> None:
+        # the package no longer imports everything up front, so any module may be loaded first
+        for module in ['janis_core.graph.node', 'janis_core.tool.tool', 'janis_core.types', 'janis_core.workflow.workflow']:
+            with self.subTest(module=module):
+                _run(f'import {module}')
+
+    @pytest.mark.release
+    def test_report_import_time(self) -> None:
+        # timings vary by machine: reported (pytest -s), not asserted
+        for module in ENTRY_MODULES:
+            print(f'{module}: {_cumulative_import_time(module) / 1000:.1f}ms')
+
+
+class TestLazyExports(unittest.TestCase):
+
+    def test_exports(self) -> None:
+        for name, (module_name, attr) in janis_core._LAZY_EXPORTS.items():
+            with self.subTest(name=name):
+                value = getattr(janis_core, name)
+                module = sys.modules[module_name]
+                self.assertIs(value, module if attr is None else getattr(module, attr))
+
+    def test_star_modules(self) -> None:
+        from janis_core.operators import InputSelector, If
+        from janis_core.tool.documentation import InputDocumentation
+        self.assertIs(janis_core.InputSelector, InputSelector)
+        self.assertIs(janis_core.If, If)
+        self.assertIs(janis_core.InputDocumentation, InputDocumentation)
+
+    def test_subpackages(self) -> None:
+        from janis_core import settings
+        self.assertIs(settings, sys.modules['janis_core.settings'])
+
+    def test_unknown(self) -> None:
+        with self.assertRaises(AttributeError):
+            janis_core.NotAThing
+        with self.assertRaises(ImportError):
+            from janis_core import NotAThing  # type: ignore
+
+    def test_import_star(self) -> None:
+        namespace: dict = {}
+        exec('from janis_core import *', namespace)
+        for name in ['Workflow', 'CommandToolBuilder', 'String', 'InputSelector', 'If', 'InputDocumentation']:
+            self.assertIn(name, namespace)
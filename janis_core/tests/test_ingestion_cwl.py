@@ -1,6 +1,13 @@
 
 import unittest
+import glob
 import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import mock
 from typing import Any, Tuple
 import regex as re 
 
@@ -63,9 +70,12 @@ from janis_core.operators.logical import (
 from janis_core.ingestion.cwl.loading import load_cwl_document
 from janis_core.ingestion.cwl.loading import load_cwl_version
 from janis_core.ingestion.cwl.loading import load_cwl_utils_from_version
+from janis_core.ingestion.cwl.loading import clear_document_cache
+from janis_core.ingestion.cwl import loading as cwl_loading
 
 from janis_core.ingestion.common.identifiers import get_cwl_reference
 from janis_core.ingestion.cwl.expressions import parse_expression
+from janis_core.ingestion.cwl.expressions import main as expr_main
 
 from janis_core.ingestion.cwl.parsing.tool import CLTArgumentParser
 from janis_core.ingestion.cwl.parsing.tool import CLTInputParser
@@ -74,6 +84,9 @@ from janis_core.ingestion.cwl.parsing.tool import CLTParser
 from janis_core.ingestion.cwl.parsing.tool import CLTRequirementsParser
 from janis_core.ingestion.cwl.types import ingest_cwl_type
 from janis_core.ingestion.cwl import parse as parse_cwl
+from janis_core.ingestion.cwl import main as cwl_main
+from janis_core.ingestion import ingest
+from janis_core.ingestion import ingest_many
 
 from janis_core.types import File
 from janis_core.types import GenericFileWithSecondaries
@@ -734,9 +747,227 @@ class TestDocumentLoading(unittest.TestCase):
         doc = f'{CWL_TESTDATA_DIR}/workflows/structuralvariants/workflow.cwl'
         version = load_cwl_version(doc)
         self.assertIsNotNone(version)
+
+    def test_single_parse(self):
+        import cwl_utils.parser.cwl_v1_2 as cwl_v1_2
+        doc = f'{CWL_TESTDATA_DIR}/tools/BWA-Index.cwl'
+        clear_document_cache()
+        with mock.patch.object(cwl_v1_2, 'yaml_no_ts', wraps=cwl_v1_2.yaml_no_ts) as mocked:
+            version = load_cwl_version(doc)
+            clt = load_cwl_document(doc, version)
+        self.assertEqual(mocked.call_count, 1)
+        
+        # same as loading with cwl_utils directly
+        expected = cwl_v1_2.load_document(doc)
+        self.assertEqual(clt.id, expected.id)
+        self.assertEqual(clt.baseCommand, expected.baseCommand)
+        self.assertEqual([x.id for x in clt.inputs], [x.id for x in expected.inputs])
+        self.assertEqual([x.id for x in clt.outputs], [x.id for x in expected.outputs])
+
+    def test_shared_fetcher(self):
+        clear_document_cache()
+        load_cwl_document(f'{CWL_TESTDATA_DIR}/tools/BWA-Index.cwl')
+        load_cwl_document(f'{CWL_TESTDATA_DIR}/tools/BWA-Mem.cwl')
+        self.assertEqual(len(cwl_loading._FETCHERS), 1)
+        # trees are modified by cwl_utils: not reused
+        self.assertEqual(len(cwl_loading._YAML_CACHE), 0)
+
+    def test_cache_entry_already_removed(self):
+        # eg cache cleared by clear_document_cache() while loading
+        doc = f'{CWL_TESTDATA_DIR}/tools/BWA-Index.cwl'
+        tree = cwl_loading.load_yaml(doc)
+        clear_document_cache()
+        with mock.patch.object(cwl_loading, 'load_yaml', return_value=tree):
+            clt = load_cwl_document(doc, 'v1.0')
+        self.assertEqual(clt.baseCommand, ['bwa', 'index'])
         
 
 
+class TestParsedCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _do_setup()
+        settings.validation.STRICT_IDENTIFIERS = False
+
+    def test_workflow(self):
+        # collect_hs_metrics.cwl is the 'run' of 3 steps
+        doc = f'{CWL_TESTDATA_DIR}/workflows/analysis-workflows/subworkflows/hs_metrics.cwl'
+        with mock.patch.object(cwl_main, '_parse', wraps=cwl_main._parse) as mocked:
+            wf = parse_cwl(doc)
+        self.assertEqual(mocked.call_count, 2)  # workflow, tool
+        tools = [step.tool for step in wf.step_nodes.values()]
+        self.assertEqual(len(tools), 3)
+        self.assertEqual(len(set(id(t) for t in tools)), 3)
+        self.assertEqual(len(set(t.id() for t in tools)), 1)
+        self.assertEqual(len(set(len(t._inputs) for t in tools)), 1)
+
+    def test_cleared_each_parse(self):
+        doc = f'{CWL_TESTDATA_DIR}/workflows/analysis-workflows/subworkflows/hs_metrics.cwl'
+        parse_cwl(doc)
+        with mock.patch.object(cwl_main, '_parse', wraps=cwl_main._parse) as mocked:
+            parse_cwl(doc)
+        self.assertEqual(mocked.call_count, 2)
+
+    def test_mtime(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        doc = os.path.join(tmpdir, 'BWA-Index.cwl')
+        shutil.copy(f'{CWL_TESTDATA_DIR}/tools/BWA-Index.cwl', doc)
+        cwl_main.parsed_cache.clear()
+        with mock.patch.object(cwl_main, '_parse', wraps=cwl_main._parse) as mocked:
+            cwl_main.parse_cached('BWA-Index.cwl', tmpdir)
+            cwl_main.parse_cached(f'file://{doc}')
+            self.assertEqual(mocked.call_count, 1)
+            stat = os.stat(doc)
+            os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            tool = cwl_main.parse_cached(doc)
+            self.assertEqual(mocked.call_count, 2)
+        self.assertEqual(tool.id(), 'BWA_Index')
+
+
+class TestIngestMany(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _do_setup()
+        self.paths = [
+            f'{CWL_TESTDATA_DIR}/tools/BWA-Index.cwl',
+            f'{CWL_TESTDATA_DIR}/tools/expressions/inputs_arguments.cwl',
+            f'{CWL_TESTDATA_DIR}/workflows/subworkflow_test/main.cwl',
+        ]
+
+    def test_no_chdir(self) -> None:
+        cwd = os.getcwd()
+        with mock.patch('os.chdir') as mocked:
+            tool = cwl_main.parse('BWA-Index.cwl', f'{CWL_TESTDATA_DIR}/tools')
+            with self.assertRaises(Exception):
+                cwl_main.parse('missing.cwl', f'file://{CWL_TESTDATA_DIR}/tools')
+        mocked.assert_not_called()
+        self.assertEqual(tool.id(), 'BWA_Index')
+        self.assertEqual(os.getcwd(), cwd)
+
+    def test_ingest_many(self) -> None:
+        expected_ids = []
+        expected_messages = set()
+        for path in self.paths:
+            expected_ids.append(ingest(path, 'cwl').id())
+            expected_messages |= {(line.category, line.message) for line in load_loglines()}
+        results = ingest_many(self.paths, 'cwl', workers=2)
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual([r.path for r in results], self.paths)
+        tools = [r.tool for r in results]
+        self.assertEqual([t.id() for t in tools], expected_ids)
+        # messages logged in each worker are gathered into this process's log
+        messages = {(line.category, line.message) for line in load_loglines()}
+        self.assertGreater(len(messages), 0)
+        self.assertEqual(messages, expected_messages)
+        uuids = {line.entity_uuid for line in load_loglines()}
+        self.assertIn(tools[1].uuid, uuids)
+
+    def test_failures(self) -> None:
+        # minimap2_paf.cwl uses FileSizeOperator ('.size'): previously couldn't be unpickled
+        paths = [
+            f'{CWL_TESTDATA_DIR}/tools/missing.cwl',
+            f'{CWL_TESTDATA_DIR}/tools/requirements/minimap2_paf.cwl',
+            f'{CWL_TESTDATA_DIR}/tools/BWA-Index.cwl',
+        ]
+        results = ingest_many(paths, 'cwl', workers=2)
+        self.assertEqual([r.success for r in results], [False, True, True])
+        self.assertIsNone(results[0].tool)
+        self.assertIn('missing.cwl', results[0].error)
+        self.assertEqual(results[2].tool.id(), 'BWA_Index')
+
+    def test_unpicklable(self) -> None:
+        with mock.patch.object(cwl_main.CWlParser, 'ingest', return_value=lambda: None):
+            results = ingest_many(self.paths[:2], 'cwl', workers=1)
+        self.assertEqual([r.success for r in results], [False, False])
+
+    def test_pickle_corpus(self) -> None:
+        # tools are sent from worker processes pickled
+        settings.ingest.SAFE_MODE = True
+        paths = sorted(glob.glob(f'{CWL_TESTDATA_DIR}/tools/**/*.cwl', recursive=True))
+        self.assertGreater(len(paths), 40)
+        for path in paths:
+            with self.subTest(path=os.path.relpath(path, CWL_TESTDATA_DIR)):
+                tool = ingest(path, 'cwl')
+                loaded = pickle.loads(pickle.dumps(tool))
+                self.assertEqual(loaded.id(), tool.id())
+                self.assertEqual(loaded.uuid, tool.uuid)
+
+
+class TestExpressionEngine(unittest.TestCase):
+    """
+    regression benchmark for the expression parsing engine.
+    counts parser builds and parse tree cache hits.
+    """
+
+    def setUp(self) -> None:
+        _do_setup()
+        expr_main.parse_tree.cache_clear()
+
+    def test_no_parser_on_import(self) -> None:
+        code = (
+            'from janis_core.ingestion.cwl.expressions import main; '
+            'print(main.lalr_parser.cache_info().currsize, main.earley_parser.cache_info().currsize)'
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.split(), ['0', '0'])
+
+    def test_tree_cache(self) -> None:
+        expr = '$(inputs.bam.basename)'
+        results = [parse_expression(expr, 'blank')[0] for _ in range(3)]
+        info = expr_main.parse_tree.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 2)
+        # janis objects are still built per call
+        self.assertIsNot(results[0], results[1])
+        for result in results:
+            self.assertIsInstance(result, BasenameOperator)
+
+    def test_lalr(self) -> None:
+        expr_main.earley_parser.cache_clear()
+        result, success = parse_expression("$(inputs.reads.nameroot + '.bam')", 'blank')
+        self.assertTrue(success)
+        self.assertIsInstance(result, AddOperator)
+        self.assertEqual(expr_main.earley_parser.cache_info().currsize, 0)
+
+    def test_earley_fallback(self) -> None:
+        result, success = parse_expression('$(22G)', 'blank')
+        self.assertTrue(success)
+        self.assertEqual(result, '22G')
+
+    def test_precedence(self) -> None:
+        result, success = parse_expression('$(inputs.a * inputs.b / 2)', 'blank')
+        self.assertIsInstance(result, DivideOperator)
+        self.assertIsInstance(result.args[0], MultiplyOperator)
+        result, success = parse_expression('$(1 + inputs.a * 2 > 4)', 'blank')
+        self.assertIsInstance(result, GtOperator)
+        self.assertIsInstance(result.args[0], AddOperator)
+        self.assertIsInstance(result.args[0].args[1], MultiplyOperator)
+
+    def test_matches_earley(self) -> None:
+        exprs = [
+            '$(inputs.bam.basename)',
+            '$(inputs.bam.basename).bai',
+            ' $(inputs.a) \n',
+            '-o $(inputs.a) -p $(runtime.cores)\n',
+            '$(inputs.a) $(inputs.b)',
+            '${ return inputs.reads.nameroot + "_fastqc.zip"; }',
+            '${ if (inputs.x == null) { return "a"; } else { return inputs.x; } }',
+            '$(Math.ceil(inputs.bam.size / 1024 + 2))',
+            "$(inputs.files.map(function(f) { return f.path; }))",
+            "$(inputs.names.join(','))",
+            '$(inputs.reads[0].basename.split(".")[0])',
+            '$(parseInt(runtime.ram / runtime.cores))',
+        ]
+        for expr in exprs:
+            with self.subTest(expr=expr):
+                try:
+                    expected = expr_main.earley_parser().parse(expr)
+                except Exception:
+                    expected = None
+                self.assertEqual(expr_main.parse_tree(expr), expected)
+
+
 class TestParseExpression(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -1,8 +1,21 @@
 
-from typing import Any
+from typing import Any, Optional
 import unittest
+from unittest import mock
 import os 
 import json
+import shutil
+import multiprocessing
+import time
+import hashlib
+import threading
+import http.server
+import io
+import requests
+import tarfile
+import tempfile
+import dataclasses
+import regex
 import pytest  
 
 from janis_core.ingestion.main import ingest_galaxy
@@ -11,16 +24,55 @@ from janis_core.ingestion.galaxy.gxtool.text.simplification.main_statement impor
 from janis_core.ingestion.galaxy import runtime
 from janis_core.ingestion.galaxy.gxworkflow import load_tool_state
 from janis_core.ingestion.galaxy.gxtool.parsing import load_xmltool
+from janis_core.ingestion.galaxy.gxtool.parsing import get_session
+from janis_core.ingestion.galaxy.gxtool.parsing import teardown_session
+from janis_core.ingestion.galaxy.gxtool.parsing import load_xmltool_cached
+from janis_core.ingestion.galaxy.gxtool.parsing import clear_xmltool_cache
+from janis_core.ingestion.galaxy.gxtool.parsing.cache import DISK_CACHE
+from janis_core.ingestion.galaxy.utils.galaxy import get_imported_macros
 from janis_core.ingestion.galaxy.gxtool.text.simplification.simplify import simplify_cmd
+from janis_core.ingestion.galaxy.gxtool.text.cheetah.evaluation import sectional_evaluate
+from janis_core.ingestion.galaxy.gxtool.text.cheetah.blocks import BlockScanner
+from janis_core.ingestion.galaxy.gxtool.text.cheetah.blocks import get_blocks
+from janis_core.ingestion.galaxy.gxtool.text.cheetah.blocks import compile_template
+from janis_core.ingestion.galaxy.gxtool.text.cheetah.blocks import CheetahBlock
+from janis_core.ingestion.galaxy.gxtool.text.cheetah.blocks import BlockType
+from janis_core.ingestion.galaxy.gxtool.text.cheetah.blocks import EvaluationStrategy
+from Cheetah.Template import Template
+from janis_core.ingestion.galaxy.gxtool.command.cmdstr.constructs import ConstructTracker
+from janis_core.ingestion.galaxy.gxtool.command.tokenise import tokenise_text
 
 from janis_core.ingestion.galaxy.gxworkflow.parsing.tool_step.metadata import parse_step_metadata
+from janis_core.ingestion.galaxy.gxwrappers import Wrapper
+from janis_core.ingestion.galaxy.gxwrappers import WrapperCache
+from janis_core.ingestion.galaxy.gxwrappers.downloads.cache import DownloadCache
+from janis_core.ingestion.galaxy.gxwrappers.downloads.index import ToolIndex
+from janis_core.ingestion.galaxy.gxwrappers.downloads.index import TOOL_INDEX
+from janis_core.ingestion.galaxy.gxwrappers.downloads.wrappers import fetch_xml
+from janis_core.ingestion.galaxy.gxwrappers import request_single_wrapper
+from janis_core.ingestion.galaxy.gxwrappers.requests.revisions import REVISION_CACHE
+from janis_core.ingestion.galaxy.gxwrappers.downloads.wrappers import download_wrapper
+from janis_core.ingestion.galaxy.gxwrappers.downloads.wrappers import is_downloaded
+from janis_core.ingestion.galaxy.gxwrappers.downloads.tarballs import IncompleteDownloadError
+from janis_core.ingestion.galaxy.gxworkflow.parsing.tool_step.prefetch import prefetch_wrappers
 from janis_core.ingestion.galaxy.gxtool.model import XMLTool
 from janis_core.ingestion.galaxy.gxtool.model import XMLCondaRequirement
+from janis_core.ingestion.galaxy.gxtool.model import XMLBoolParam
 from janis_core.ingestion.galaxy.gxtool.command import gen_command
+from janis_core.ingestion.galaxy.gxtool.command import load_vanilla_command_str
+from janis_core.ingestion.galaxy.gxtool.command.loading import VANILLA_CACHE
+from janis_core.ingestion.galaxy import expressions
+from janis_core.ingestion.galaxy.expressions import compile_pattern
+from janis_core.ingestion.galaxy.expressions.compiled import REGISTRY
+from janis_core.ingestion.galaxy.gxtool.command.cmdstr import analysis
+from janis_core.ingestion.galaxy.gxtool.command.cmdstr.analysis import CmdstrReferenceType
+from janis_core.ingestion.galaxy.gxtool.command.loading import load_vanilla_main_statement
 
 from janis_core.ingestion.galaxy import regex_to_glob
 from janis_core.ingestion.galaxy import datatypes
 from janis_core.ingestion.galaxy.datatypes.core import file_t, string_t, bool_t
+from janis_core.ingestion.galaxy.datatypes.register import DatatypeRegister
+from janis_core.ingestion.galaxy.datatypes.register import load_datatypes
 
 from janis_core import WorkflowBuilder, Workflow
 from janis_core import WorkflowMetadata
@@ -50,6 +102,11 @@ from janis_core import (
 from janis_core import settings
 from janis_core.ingestion.galaxy import datatypes
 from janis_core.ingestion.galaxy.internal_model.tool.containers import resolve_dependencies_as_container
+from janis_core.ingestion.galaxy.internal_model.tool.containers import prefetch_containers
+from janis_core.ingestion.galaxy.internal_model.tool.registries import LocalRegistry
+from janis_core.ingestion.galaxy.internal_model.tool.registries import set_registry
+from janis_core.ingestion.galaxy.internal_model.tool.registries import get_registry
+from janis_core.ingestion.galaxy.internal_model.tool.registries import QuayRegistry
 
 from janis_core.ingestion.galaxy.janis_mapping.workflow import to_janis_workflow
 from janis_core.ingestion.galaxy.janis_mapping.workflow import to_janis_inputs_dict
@@ -90,6 +147,7 @@ GALAXY_TESTWF_PATH = os.path.join(os.getcwd(), 'janis_core/tests/data/galaxy/wor
 def _reset_global_settings() -> None:
     settings.ingest.galaxy.GEN_IMAGES = False
     settings.ingest.galaxy.DISABLE_CONTAINER_CACHE = False
+    settings.ingest.galaxy.ENABLE_TOOL_CACHE = False
     settings.ingest.SAFE_MODE = True
     settings.ingest.cwl.INGEST_JAVASCRIPT_EXPRESSIONS = False
     settings.ingest.cwl.REQUIRE_CWL_VERSION = False
@@ -150,6 +208,103 @@ class TestLoadXMLTool(unittest.TestCase):
         print()
 
 
+class TestToolLoadingSession(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        self.session = get_session()
+
+    def test_app_reused(self) -> None:
+        filepath = f'{GALAXY_TESTTOOL_PATH}/fastqc-5ec9f6bceaee/rgFastQC.xml'
+        runtime.tool.tool_path = filepath
+        tool1 = load_xmltool(filepath)
+        app = self.session.get_app()
+        filepath = f'{GALAXY_TESTTOOL_PATH}/abricate-c2ef298da409/abricate.xml'
+        runtime.tool.tool_path = filepath
+        tool2 = load_xmltool(filepath)
+        self.assertIs(self.session.get_app(), app)
+        self.assertEqual(tool1.metadata.id, 'fastqc')
+        self.assertEqual(tool2.metadata.id, 'abricate')
+
+    def test_teardown(self) -> None:
+        filepath = f'{GALAXY_TESTTOOL_PATH}/fastqc-5ec9f6bceaee/rgFastQC.xml'
+        runtime.tool.tool_path = filepath
+        load_xmltool(filepath)
+        self.assertTrue(self.session.active)
+        teardown_session()
+        self.assertFalse(self.session.active)
+        tool = load_xmltool(filepath)
+        self.assertTrue(self.session.active)
+        self.assertEqual(tool.metadata.id, 'fastqc')
+
+
+class TestXMLToolCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        clear_xmltool_cache()
+
+    def test_same_wrapper_loaded_once(self) -> None:
+        filepath = f'{GALAXY_TESTTOOL_PATH}/abricate-c2ef298da409/abricate.xml'
+        runtime.tool.tool_path = filepath
+        tool1 = load_xmltool_cached(filepath)
+        tool2 = load_xmltool_cached(os.path.relpath(filepath))
+        self.assertIs(tool1, tool2)
+    
+    def test_key_includes_macros(self) -> None:
+        filepath = f'{GALAXY_TESTTOOL_PATH}/abricate-c2ef298da409/abricate.xml'
+        macros = get_imported_macros(filepath)
+        self.assertEqual(len(macros), 1)
+        self.assertTrue(macros[0].endswith('macros.xml'))
+    
+    def test_wrapper_edit_invalidates(self) -> None:
+        src_dir = f'{GALAXY_TESTTOOL_PATH}/abricate-c2ef298da409'
+        with tempfile.TemporaryDirectory() as tmpdir:
+            wrapper_dir = os.path.join(tmpdir, 'abricate')
+            shutil.copytree(src_dir, wrapper_dir)
+            filepath = os.path.join(wrapper_dir, 'abricate.xml')
+            runtime.tool.tool_path = filepath
+            tool1 = load_xmltool_cached(filepath)
+            with open(os.path.join(wrapper_dir, 'macros.xml'), 'a') as fp:
+                fp.write('\n')
+            tool2 = load_xmltool_cached(filepath)
+            self.assertIsNot(tool1, tool2)
+
+
+class TestXMLToolDiskCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        clear_xmltool_cache()
+        self.tmpdir = tempfile.mkdtemp()
+        self.default_dir = settings.ingest.galaxy.TOOL_CACHE_DIR
+        self.filepath = f'{GALAXY_TESTTOOL_PATH}/abricate-c2ef298da409/abricate.xml'
+        settings.ingest.galaxy.ENABLE_TOOL_CACHE = True
+        settings.ingest.galaxy.TOOL_CACHE_DIR = self.tmpdir
+        runtime.tool.tool_path = self.filepath
+
+    def tearDown(self) -> None:
+        settings.ingest.galaxy.ENABLE_TOOL_CACHE = False
+        settings.ingest.galaxy.TOOL_CACHE_DIR = self.default_dir
+        shutil.rmtree(self.tmpdir)
+
+    def test_persisted(self) -> None:
+        tool1 = load_xmltool_cached(self.filepath)
+        self.assertEqual(len(os.listdir(self.tmpdir)), 1)
+        clear_xmltool_cache()
+        tool2 = load_xmltool_cached(self.filepath)
+        self.assertIsNot(tool1, tool2)
+        self.assertEqual(tool1.metadata.id, tool2.metadata.id)
+        self.assertEqual(tool1.raw_command, tool2.raw_command)
+        self.assertEqual(len(tool1.inputs.list()), len(tool2.inputs.list()))
+    
+    def test_version_invalidates(self) -> None:
+        path1 = DISK_CACHE.entry_path(self.filepath)
+        with mock.patch('janis_core.ingestion.galaxy.gxtool.parsing.cache.__version__', 'v999'):
+            path2 = DISK_CACHE.entry_path(self.filepath)
+        self.assertNotEqual(path1, path2)
+
+
 class TestGetWrapperToolshed(unittest.TestCase):
     """
     Needed because all other test data has been moved to tests/data/galaxy.
@@ -171,6 +326,540 @@ class TestGetWrapperToolshed(unittest.TestCase):
         internal = ingest(uri, self.src)
     
 
+def _add_wrapper_to_cache(args: tuple[str, int]) -> None:
+    # module-level so can be used in multiprocessing pool
+    cache_path, i = args
+    settings.ingest.galaxy.WRAPPER_CACHE = cache_path
+    cache = WrapperCache()
+    cache.add(_mock_wrapper(i))
+
+def _index_wrapper(args: tuple[str, str]) -> None:
+    # module-level so can be used in multiprocessing pool
+    index_path, wrapper_dir = args
+    settings.ingest.galaxy.TOOL_INDEX = index_path
+    ToolIndex().index_wrapper(wrapper_dir)
+
+def _mock_wrapper(i: int) -> Wrapper:
+    return Wrapper({
+        'owner': 'iuc', 
+        'repo': f'repo{i}', 
+        'revision': f'revision{i}', 
+        'tool_id': f'tool{i % 2}', 
+        'tool_build': '1.0', 
+        'date_created': '2014-01-27 14:29:14', 
+        'requirements': [], 
+    })
+
+
+class TestWrapperCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        self.tmpdir = tempfile.mkdtemp()
+        self.default_path = settings.ingest.galaxy.WRAPPER_CACHE
+        self.cache_path = os.path.join(self.tmpdir, 'galaxy_wrappers', 'cache.json')
+        settings.ingest.galaxy.WRAPPER_CACHE = self.cache_path
+    
+    def tearDown(self) -> None:
+        settings.ingest.galaxy.WRAPPER_CACHE = self.default_path
+        shutil.rmtree(self.tmpdir)
+
+    def test_add_get(self) -> None:
+        cache = WrapperCache()
+        for i in range(4):
+            cache.add(_mock_wrapper(i))
+        cache.add(_mock_wrapper(0))  # duplicate ignored
+        self.assertEqual(len(cache.get(tool_id='tool0')), 2)
+        self.assertEqual(len(cache.get(tool_id='tool1', revision='revision3')), 1)
+        self.assertEqual(len(cache.get(repo='repo2', revision='revision2')), 1)
+        self.assertEqual(len(cache.get(owner='iuc')), 4)
+        self.assertEqual(len(cache.get(tool_id='tool2')), 0)
+        self.assertTrue(cache.exists(_mock_wrapper(1)))
+
+        # persisted in same format as before
+        with open(self.cache_path, 'r') as fp:
+            data = json.load(fp)
+        self.assertEqual(sorted(data.keys()), ['tool0', 'tool1'])
+    
+    def test_external_update(self) -> None:
+        cache = WrapperCache()
+        cache.add(_mock_wrapper(0))
+        self.assertEqual(len(cache.get(tool_id='tool1')), 0)
+        # another process writes to the cache file
+        with open(self.cache_path, 'w') as fp:
+            json.dump({'tool1': [_mock_wrapper(1).to_dict()]}, fp)
+        self.assertEqual(len(cache.get(tool_id='tool1')), 1)
+        self.assertEqual(len(cache.get(tool_id='tool0')), 0)
+
+    def test_concurrent_add(self) -> None:
+        with multiprocessing.get_context('fork').Pool(4) as pool:
+            pool.map(_add_wrapper_to_cache, [(self.cache_path, i) for i in range(8)])
+        cache = WrapperCache()
+        self.assertEqual(len(cache.get()), 8)
+
+
+class TestToolIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        self.tmpdir = tempfile.mkdtemp()
+        self.default_index = settings.ingest.galaxy.TOOL_INDEX
+        self.default_wrappers_dir = settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR
+        settings.ingest.galaxy.TOOL_INDEX = os.path.join(self.tmpdir, 'index.json')
+        settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR = os.path.join(self.tmpdir, 'galaxy_wrappers')
+        settings.testing.TESTMODE = False
+        self.index = ToolIndex()
+    
+    def tearDown(self) -> None:
+        settings.ingest.galaxy.TOOL_INDEX = self.default_index
+        settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR = self.default_wrappers_dir
+        shutil.rmtree(self.tmpdir)
+
+    def test_builtin(self) -> None:
+        path = self.index.get_builtin('__SORTLIST__')
+        self.assertTrue(path.endswith('sort_collection_list.xml'))
+        self.assertIsNone(self.index.get_builtin('not_a_tool'))
+        # persisted
+        with open(settings.ingest.galaxy.TOOL_INDEX, 'r') as fp:
+            data = json.load(fp)
+        self.assertIn('__SORTLIST__', data['builtin']['tools'])
+    
+    def test_builtin_galaxy_version(self) -> None:
+        self.index.get_builtin('__SORTLIST__')
+        with mock.patch('janis_core.ingestion.galaxy.gxwrappers.downloads.index._galaxy_version', return_value='0.0.0'):
+            index = ToolIndex()
+            with mock.patch.object(ToolIndex, '_index_builtins', wraps=index._index_builtins) as rebuild:
+                index.get_builtin('__SORTLIST__')
+                rebuild.assert_called_once()
+
+    def test_wrapper(self) -> None:
+        wrapper_dir = f'{GALAXY_TESTTOOL_PATH}/text_processing-d698c222f354'
+        self.assertEqual(self.index.get_wrapper(wrapper_dir, 'tp_cut_tool'), 'cut.xml')
+        self.assertIsNone(self.index.get_wrapper(wrapper_dir, 'not_a_tool'))
+
+    def test_merge(self) -> None:
+        # entries saved by another process (another ToolIndex) are kept
+        other = ToolIndex()
+        self.index.get_wrapper(f'{GALAXY_TESTTOOL_PATH}/abricate-c2ef298da409', 'abricate')
+        other.get_wrapper(f'{GALAXY_TESTTOOL_PATH}/fastqc-3d0c7bdf12f5', 'fastqc')
+        self.index.get_wrapper(f'{GALAXY_TESTTOOL_PATH}/cutadapt-135b80fb1ac2', 'cutadapt')
+        with open(settings.ingest.galaxy.TOOL_INDEX, 'r') as fp:
+            data = json.load(fp)
+        self.assertEqual(len(data['wrappers']), 3)
+
+    def test_concurrent_index(self) -> None:
+        wrapper_dirs = [
+            os.path.join(GALAXY_TESTTOOL_PATH, name) 
+            for name in sorted(os.listdir(GALAXY_TESTTOOL_PATH))
+            if os.path.isdir(os.path.join(GALAXY_TESTTOOL_PATH, name))
+        ][:8]
+        with multiprocessing.get_context('fork').Pool(4) as pool:
+            pool.map(_index_wrapper, [(settings.ingest.galaxy.TOOL_INDEX, d) for d in wrapper_dirs])
+        with open(settings.ingest.galaxy.TOOL_INDEX, 'r') as fp:
+            data = json.load(fp)
+        self.assertEqual(len(data['wrappers']), 8)
+
+    def test_download_cache_add(self) -> None:
+        # simulates extracting a downloaded wrapper tarball
+        cache = DownloadCache()
+        self.assertIsNone(cache.get('abricate', 'c2ef298da409'))
+        src_dir = f'{GALAXY_TESTTOOL_PATH}/abricate-c2ef298da409'
+        tar_path = os.path.join(self.tmpdir, 'abricate.tar.gz')
+        with tarfile.open(tar_path, 'w:gz') as tar:
+            tar.add(src_dir, arcname='abricate-c2ef298da409')
+        with tarfile.open(tar_path, 'r:gz') as tar:
+            cache.add(tar)
+        wrapper_dir = cache.get('abricate', 'c2ef298da409')
+        self.assertIsNotNone(wrapper_dir)
+        self.assertEqual(TOOL_INDEX.get_wrapper(wrapper_dir, 'abricate'), 'abricate.xml')
+
+
+class _ToolshedStandIn:
+    """
+    local http server serving wrapper tarballs at the toolshed archive urls.
+    supports ETag / If-None-Match and Range / If-Range requests. 
+    'failures' maps url path -> number of 503 responses to give before succeeding.
+    'truncations' maps url path -> number of responses to cut short before succeeding.
+    """
+
+    def __init__(self, wrappers: list[str]):
+        self.tarballs: dict[str, bytes] = {}
+        self.requests: list[str] = []
+        self.headers: list[dict[str, str]] = []
+        self.statuses: list[int] = []
+        self.failures: dict[str, int] = {}
+        self.truncations: dict[str, int] = {}
+        for folder in wrappers:
+            repo, revision = folder.split('-', 1)
+            self.tarballs[f'/repos/iuc/{repo}/archive/{revision}.tar.gz'] = self._tarball(folder)
+        standin = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                standin.requests.append(self.path)
+                standin.headers.append(dict(self.headers))
+                if standin.failures.get(self.path, 0) > 0:
+                    standin.failures[self.path] -= 1
+                    return self._respond(503)
+                if self.path not in standin.tarballs:
+                    return self._respond(404)
+                
+                body = standin.tarballs[self.path]
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    return self._respond(304)
+                
+                start = 0
+                if self.headers.get('Range') and self.headers.get('If-Range') == etag:
+                    start = int(self.headers['Range'].split('=')[1].rstrip('-'))
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+                else:
+                    self.send_response(200)
+                standin.statuses.append(206 if start else 200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body) - start))
+                self.end_headers()
+                
+                if standin.truncations.get(self.path, 0) > 0:
+                    standin.truncations[self.path] -= 1
+                    self.wfile.write(body[start:start + (len(body) - start) // 2])
+                    self.close_connection = True
+                else:
+                    self.wfile.write(body[start:])
+            
+            def _respond(self, status: int) -> None:
+                standin.statuses.append(status)
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _tarball(self, folder: str) -> bytes:
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+            tar.add(f'{GALAXY_TESTTOOL_PATH}/{folder}', arcname=folder)
+        return buffer.getvalue()
+
+
+def _mock_toolshed_step(step_id: int, repo: str, tool_id: str, version: str) -> dict[str, Any]:
+    return {
+        'id': step_id,
+        'type': 'tool',
+        'tool_id': f'toolshed.g2.bx.psu.edu/repos/iuc/{repo}/{tool_id}/{version}',
+        'tool_version': version,
+        'tool_shed_repository': {
+            'changeset_revision': 'xxx',
+            'name': repo,
+            'owner': 'iuc',
+            'tool_shed': 'toolshed.g2.bx.psu.edu'
+        },
+    }
+
+def _mock_request_single_wrapper(tool_shed: str, owner: str, repo: str, tool_id: str, tool_build: str) -> Wrapper:
+    revision = {'abricate': 'c2ef298da409', 'fastqc': '5ec9f6bceaee'}[repo]
+    return Wrapper({
+        'owner': owner, 
+        'repo': repo, 
+        'revision': revision, 
+        'tool_id': tool_id, 
+        'tool_build': tool_build, 
+        'date_created': '2014-01-27 14:29:14', 
+        'requirements': [], 
+    })
+
+
+class TestWrapperPrefetch(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        _reset_global_settings()
+        settings.testing.TESTMODE = False
+        self.tmpdir = tempfile.mkdtemp()
+        self.defaults = {
+            'WRAPPER_CACHE': settings.ingest.galaxy.WRAPPER_CACHE,
+            'TOOL_INDEX': settings.ingest.galaxy.TOOL_INDEX,
+            'DEFAULT_WRAPPERS_DIR': settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR,
+            'TOOLSHED_URL': settings.ingest.galaxy.TOOLSHED_URL,
+        }
+        self.standin = _ToolshedStandIn(['abricate-c2ef298da409', 'fastqc-5ec9f6bceaee'])
+        settings.ingest.galaxy.WRAPPER_CACHE = os.path.join(self.tmpdir, 'cache.json')
+        settings.ingest.galaxy.TOOL_INDEX = os.path.join(self.tmpdir, 'index.json')
+        settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR = os.path.join(self.tmpdir, 'galaxy_wrappers')
+        settings.ingest.galaxy.TOOLSHED_URL = self.standin.url
+        self.galaxy = {'steps': {
+            '0': {'id': 0, 'type': 'data_input'},
+            '1': _mock_toolshed_step(1, 'abricate', 'abricate', '1.0.1'),
+            '2': _mock_toolshed_step(2, 'abricate', 'abricate', '1.0.1'),
+            '3': _mock_toolshed_step(3, 'fastqc', 'fastqc', '0.72'),
+        }}
+        patcher = mock.patch(
+            'janis_core.ingestion.galaxy.gxworkflow.parsing.tool_step.prefetch.request_single_wrapper',
+            side_effect=_mock_request_single_wrapper
+        )
+        self.request_details = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self) -> None:
+        self.standin.stop()
+        for name, value in self.defaults.items():
+            setattr(settings.ingest.galaxy, name, value)
+        shutil.rmtree(self.tmpdir)
+
+    def test_prefetch(self) -> None:
+        prefetch_wrappers(self.galaxy)
+        # deduplicated requests
+        self.assertEqual(self.request_details.call_count, 2)
+        self.assertEqual(len(self.standin.requests), 2)
+        # caches are warm
+        self.assertEqual(len(WrapperCache().get(tool_id='abricate')), 1)
+        xml = fetch_xml('iuc', 'abricate', 'c2ef298da409', 'abricate')
+        self.assertTrue(xml.startswith(settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR))
+        self.assertTrue(xml.endswith('abricate.xml'))
+        xml = fetch_xml('iuc', 'fastqc', '5ec9f6bceaee', 'fastqc')
+        self.assertTrue(xml.endswith('rgFastQC.xml'))
+        self.assertEqual(len(self.standin.requests), 2)
+    
+    def test_prefetch_warm(self) -> None:
+        prefetch_wrappers(self.galaxy)
+        prefetch_wrappers(self.galaxy)
+        self.assertEqual(self.request_details.call_count, 2)
+        self.assertEqual(len(self.standin.requests), 2)
+
+    def test_prefetch_retries(self) -> None:
+        path = '/repos/iuc/abricate/archive/c2ef298da409.tar.gz'
+        self.standin.failures[path] = 1
+        with mock.patch('janis_core.ingestion.galaxy.gxworkflow.parsing.tool_step.prefetch._BACKOFF', 0):
+            prefetch_wrappers(self.galaxy)
+        self.assertEqual(self.standin.requests.count(path), 2)
+        xml = fetch_xml('iuc', 'abricate', 'c2ef298da409', 'abricate')
+        self.assertTrue(xml.endswith('abricate.xml'))
+
+    def test_prefetch_failure(self) -> None:
+        path = '/repos/iuc/abricate/archive/c2ef298da409.tar.gz'
+        self.standin.failures[path] = settings.ingest.galaxy.PREFETCH_RETRIES
+        with mock.patch('janis_core.ingestion.galaxy.gxworkflow.parsing.tool_step.prefetch._BACKOFF', 0):
+            self.assertRaises(requests.HTTPError, prefetch_wrappers, self.galaxy)
+        self.assertEqual(self.standin.requests.count(path), settings.ingest.galaxy.PREFETCH_RETRIES)
+
+
+class TestWrapperDownload(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        _reset_global_settings()
+        settings.testing.TESTMODE = False
+        self.tmpdir = tempfile.mkdtemp()
+        self.defaults = {
+            'TOOL_INDEX': settings.ingest.galaxy.TOOL_INDEX,
+            'DEFAULT_WRAPPERS_DIR': settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR,
+            'TOOLSHED_URL': settings.ingest.galaxy.TOOLSHED_URL,
+        }
+        self.standin = _ToolshedStandIn(['abricate-c2ef298da409'])
+        self.url_path = '/repos/iuc/abricate/archive/c2ef298da409.tar.gz'
+        settings.ingest.galaxy.TOOL_INDEX = os.path.join(self.tmpdir, 'index.json')
+        settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR = os.path.join(self.tmpdir, 'galaxy_wrappers')
+        settings.ingest.galaxy.TOOLSHED_URL = self.standin.url
+        self.wrapper_dir = os.path.join(settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR, 'abricate-c2ef298da409')
+    
+    def tearDown(self) -> None:
+        self.standin.stop()
+        for name, value in self.defaults.items():
+            setattr(settings.ingest.galaxy, name, value)
+        shutil.rmtree(self.tmpdir)
+
+    def test_download(self) -> None:
+        download_wrapper('iuc', 'abricate', 'c2ef298da409')
+        self.assertTrue(os.path.isfile(os.path.join(self.wrapper_dir, 'abricate.xml')))
+        # no staging dirs or partial downloads left behind
+        downloads = os.listdir(os.path.join(settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR, '.downloads'))
+        self.assertEqual(sorted(d for d in downloads if not d.endswith('.lock')), ['abricate-c2ef298da409.tar.gz', 'abricate-c2ef298da409.tar.gz.json'])
+
+    def test_revalidate(self) -> None:
+        download_wrapper('iuc', 'abricate', 'c2ef298da409')
+        shutil.rmtree(self.wrapper_dir)
+        download_wrapper('iuc', 'abricate', 'c2ef298da409')
+        self.assertIn('If-None-Match', self.standin.headers[-1])
+        self.assertEqual(self.standin.statuses, [200, 304])
+        self.assertTrue(os.path.isfile(os.path.join(self.wrapper_dir, 'abricate.xml')))
+
+    def test_resume(self) -> None:
+        self.standin.truncations[self.url_path] = 1
+        self.assertRaises(IncompleteDownloadError, download_wrapper, 'iuc', 'abricate', 'c2ef298da409')
+        # interrupted download is not visible as a wrapper
+        self.assertFalse(os.path.exists(self.wrapper_dir))
+        self.assertFalse(is_downloaded('abricate', 'c2ef298da409'))
+        download_wrapper('iuc', 'abricate', 'c2ef298da409')
+        self.assertIn('Range', self.standin.headers[-1])
+        self.assertEqual(self.standin.statuses, [200, 206])
+        self.assertTrue(os.path.isfile(os.path.join(self.wrapper_dir, 'abricate.xml')))
+
+    def test_corrupt_tarball(self) -> None:
+        download_wrapper('iuc', 'abricate', 'c2ef298da409')
+        shutil.rmtree(self.wrapper_dir)
+        tarball = os.path.join(settings.ingest.galaxy.DEFAULT_WRAPPERS_DIR, '.downloads', 'abricate-c2ef298da409.tar.gz')
+        with open(tarball, 'r+b') as fp:
+            fp.seek(100)
+            fp.write(b'corrupt')
+        # checksum mismatch: downloaded again without revalidation
+        download_wrapper('iuc', 'abricate', 'c2ef298da409')
+        self.assertNotIn('If-None-Match', self.standin.headers[-1])
+        self.assertEqual(self.standin.statuses, [200, 200])
+        self.assertTrue(os.path.isfile(os.path.join(self.wrapper_dir, 'abricate.xml')))
+
+    def test_unsafe_tarball(self) -> None:
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+            info = tarfile.TarInfo('../escaped.txt')
+            info.size = 0
+            tar.addfile(info, io.BytesIO(b''))
+        buffer.seek(0)
+        with tarfile.open(fileobj=buffer, mode='r:gz') as tar:
+            self.assertRaises(tarfile.TarError, DownloadCache().add, tar)
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, 'escaped.txt')))
+
+
+class _BioblendStandIn:
+    """
+    stands in for bioblend's ToolShedInstance (and its .repositories client). 
+    'revisions' is an ordered list (oldest first) of (changeset_revision, {tool_id: version}). 
+    a revision with None for tools has no installable tools. 
+    """
+
+    def __init__(self, owner: str, repo: str, revisions: list[tuple[str, Optional[dict[str, str]]]]):
+        self.owner = owner
+        self.repo = repo
+        self.revisions = revisions
+        self.calls: list[str] = []
+        self.repositories = self
+    
+    def __call__(self, url: str) -> '_BioblendStandIn':
+        return self
+    
+    def get_ordered_installable_revisions(self, name: str, owner: str) -> list[str]:
+        self.calls.append('revisions')
+        return [revision for revision, _ in self.revisions]
+
+    def get_repository_revision_install_info(self, name: str, owner: str, changeset_revision: str) -> list[dict[str, Any]]:
+        self.calls.append(changeset_revision)
+        tools = dict(self.revisions)[changeset_revision]
+        if tools is None:
+            return [{}, {}, {}]
+        repository = {'owner': owner, 'name': name, 'create_time': '2014-01-27T14:29:14.000000'}
+        metadata = {'valid_tools': [{
+            'id': tool_id, 
+            'version': version, 
+            'requirements': [{'name': tool_id, 'version': version.split('+')[0], 'type': 'package'}]
+        } for tool_id, version in tools.items()]}
+        install_info = {name: ['description', 'clone_url', changeset_revision, '0', owner, None, {}]}
+        return [repository, metadata, install_info]
+
+    @property
+    def requests(self) -> int:
+        return len(self.calls)
+
+
+class TestToolshedRevisions(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        _reset_global_settings()
+        self.tmpdir = tempfile.mkdtemp()
+        self.default_path = settings.ingest.galaxy.REVISION_CACHE
+        settings.ingest.galaxy.REVISION_CACHE = os.path.join(self.tmpdir, 'cache.json')
+        # 16 revisions, abricate version bumped each revision. 
+        revisions: list[tuple[str, Optional[dict[str, str]]]] = [('rev0', None)]
+        for i in range(1, 16):
+            revisions.append((f'rev{i}', {'abricate': f'1.0.{i}', 'abricate_list': f'1.0.{i // 4}'}))
+        self.toolshed = _BioblendStandIn('iuc', 'abricate', revisions)
+        patcher = mock.patch('janis_core.ingestion.galaxy.gxwrappers.requests.versions.ToolShedInstance', self.toolshed)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self) -> None:
+        settings.ingest.galaxy.REVISION_CACHE = self.default_path
+        shutil.rmtree(self.tmpdir)
+
+    def _request(self, tool_id: str, tool_build: str) -> Wrapper:
+        return request_single_wrapper('toolshed.g2.bx.psu.edu', 'iuc', 'abricate', tool_id, tool_build)
+
+    def test_bisect(self) -> None:
+        wrapper = self._request('abricate', '1.0.3')
+        self.assertEqual(wrapper.revision, 'rev3')
+        self.assertEqual(wrapper.tool_build, '1.0.3')
+        self.assertEqual(wrapper.requirements[0].name, 'abricate')
+        # revisions list + log2(16) bisection steps
+        self.assertLessEqual(self.toolshed.requests, 1 + 5)
+
+    def test_newest_matching_revision(self) -> None:
+        # abricate_list 1.0.1 is present in rev4 - rev7
+        wrapper = self._request('abricate_list', '1.0.1')
+        self.assertEqual(wrapper.revision, 'rev7')
+        # bisects to the newest: doesn't step through each matching revision
+        self.assertLessEqual(self.toolshed.requests, 1 + 5)
+    
+    def test_many_matching_revisions(self) -> None:
+        revisions: list[tuple[str, Optional[dict[str, str]]]] = []
+        for i in range(64):
+            revisions.append((f'rev{i}', {'abricate': '1.0.0' if i < 60 else f'1.0.{i}'}))
+        self.toolshed.revisions = revisions
+        self.assertEqual(self._request('abricate', '1.0.0').revision, 'rev59')
+        self.assertLessEqual(self.toolshed.requests, 1 + 7)
+
+    def test_cached(self) -> None:
+        self._request('abricate', '1.0.3')
+        requests = self.toolshed.requests
+        self.assertEqual(self._request('abricate', '1.0.3').revision, 'rev3')
+        self.assertEqual(self.toolshed.requests, requests)
+        # other tools in revisions already seen need no requests 
+        self.assertEqual(self._request('abricate_list', '1.0.0').revision, 'rev3')
+        self.assertEqual(self.toolshed.requests, requests)
+
+    def test_persisted(self) -> None:
+        self._request('abricate', '1.0.3')
+        requests = self.toolshed.requests
+        # new process
+        REVISION_CACHE.loaded_path = None
+        self.assertEqual(self._request('abricate', '1.0.3').revision, 'rev3')
+        self.assertEqual(self.toolshed.requests, requests)
+
+    def test_new_revision(self) -> None:
+        self._request('abricate', '1.0.15')
+        self.toolshed.revisions.append(('rev16', {'abricate': '1.1.0'}))
+        self.toolshed.calls = []
+        self.assertEqual(self._request('abricate', '1.1.0').revision, 'rev16')
+        self.assertIn('revisions', self.toolshed.calls)
+        self.assertIn('rev16', self.toolshed.calls)
+    
+    def test_stale_revisions(self) -> None:
+        self._request('abricate', '1.0.15')
+        for i in range(16, 32):
+            self.toolshed.revisions.append((f'rev{i}', {'abricate': f'1.1.{i}'}))
+        self.toolshed.calls = []
+        self.assertEqual(self._request('abricate', '1.1.20').revision, 'rev20')
+        # cached list refreshed before any other requests, then bisected
+        self.assertEqual(self.toolshed.calls[0], 'revisions')
+        self.assertLessEqual(self.toolshed.requests, 1 + 6)
+    
+    def test_unbisectable(self) -> None:
+        # tool missing from most revisions: falls back to scanning newest first
+        self.toolshed.revisions[15] = ('rev15', {'abricate': '1.0.15', 'new_tool': '0.1'})
+        wrapper = self._request('new_tool', '0.1')
+        self.assertEqual(wrapper.revision, 'rev15')
+        self.assertRaises(RuntimeError, self._request, 'abricate', '9.9.9')
+
+
 class TestRegexToGlob(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -343,6 +1032,381 @@ class TestResolveDependencies(unittest.TestCase):
         self.assertEqual(actual, expected)
 
 
+class _CountingRegistry(LocalRegistry):
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.lookups: list[str] = []
+
+    def get_tags(self, name: str) -> list[str]:
+        self.lookups.append(name)
+        return super().get_tags(name)
+
+
+class TestContainerCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        settings.testing.TESTING_USE_DEFAULT_CONTAINER = False
+        self.tmpdir = tempfile.mkdtemp()
+        self.defaults = {
+            'CONTAINER_CACHE': settings.ingest.galaxy.CONTAINER_CACHE,
+            'CONTAINER_REGISTRY': settings.ingest.galaxy.CONTAINER_REGISTRY,
+        }
+        settings.ingest.galaxy.CONTAINER_CACHE = os.path.join(self.tmpdir, 'cache.json')
+        self.registry_path = os.path.join(self.tmpdir, 'registry.json')
+        with open(self.registry_path, 'w') as fp:
+            json.dump({
+                'abricate': ['0.9.8--h1341992_0', '1.0.1--ha8f3691_2'],
+                'fastqc': ['0.11.8--2', '0.11.9--hdfd78af_1'],
+            }, fp)
+        self.registry = _CountingRegistry(self.registry_path)
+        set_registry(self.registry)
+        self.abricate = self._load('abricate-c2ef298da409/abricate.xml')
+        self.fastqc = self._load('fastqc-3d0c7bdf12f5/rgFastQC.xml')
+    
+    def tearDown(self) -> None:
+        set_registry(None)
+        for name, value in self.defaults.items():
+            setattr(settings.ingest.galaxy, name, value)
+        shutil.rmtree(self.tmpdir)
+
+    def _load(self, relpath: str) -> XMLTool:
+        filepath = os.path.abspath(f'{GALAXY_TESTTOOL_PATH}/{relpath}')
+        runtime.tool.tool_path = filepath
+        return load_xmltool_cached(filepath)
+
+    def test_local_registry(self) -> None:
+        set_registry(None)
+        settings.ingest.galaxy.CONTAINER_REGISTRY = self.registry_path
+        actual = resolve_dependencies_as_container(self.abricate)
+        self.assertEqual(actual, 'quay.io/biocontainers/abricate:1.0.1--ha8f3691_2')
+
+    def test_local_registry_reused(self) -> None:
+        set_registry(None)
+        settings.ingest.galaxy.CONTAINER_REGISTRY = self.registry_path
+        registry = get_registry()
+        self.assertIsInstance(registry, LocalRegistry)
+        self.assertIs(get_registry(), registry)
+        # rebuilt when the configured path changes
+        other_path = os.path.join(self.tmpdir, 'other.json')
+        shutil.copy(self.registry_path, other_path)
+        settings.ingest.galaxy.CONTAINER_REGISTRY = other_path
+        self.assertIsNot(get_registry(), registry)
+        self.assertEqual(get_registry().path, other_path)
+        settings.ingest.galaxy.CONTAINER_REGISTRY = ''
+        self.assertIsInstance(get_registry(), QuayRegistry)
+
+    def test_cached(self) -> None:
+        expected = 'quay.io/biocontainers/abricate:1.0.1--ha8f3691_2'
+        self.assertEqual(resolve_dependencies_as_container(self.abricate), expected)
+        self.assertEqual(resolve_dependencies_as_container(self.abricate), expected)
+        self.assertEqual(self.registry.lookups, ['abricate'])
+        # persisted
+        with open(settings.ingest.galaxy.CONTAINER_CACHE, 'r') as fp:
+            data = json.load(fp)
+        self.assertEqual(data['abricate=1.0.1']['container'], expected)
+    
+    def test_ttl(self) -> None:
+        resolve_dependencies_as_container(self.abricate)
+        with mock.patch('time.time', return_value=time.time() + settings.ingest.galaxy.CONTAINER_CACHE_TTL + 1):
+            resolve_dependencies_as_container(self.abricate)
+        self.assertEqual(self.registry.lookups, ['abricate', 'abricate'])
+
+    def test_disabled(self) -> None:
+        settings.ingest.galaxy.DISABLE_CONTAINER_CACHE = True
+        resolve_dependencies_as_container(self.abricate)
+        resolve_dependencies_as_container(self.abricate)
+        self.assertEqual(self.registry.lookups, ['abricate', 'abricate'])
+        self.assertFalse(os.path.exists(settings.ingest.galaxy.CONTAINER_CACHE))
+
+    def test_prefetch(self) -> None:
+        prefetch_containers([self.abricate, self.fastqc, self.abricate])
+        self.assertEqual(sorted(self.registry.lookups), ['abricate', 'fastqc'])
+        self.assertEqual(resolve_dependencies_as_container(self.fastqc), 'quay.io/biocontainers/fastqc:0.11.9--hdfd78af_1')
+        self.assertEqual(len(self.registry.lookups), 2)
+
+
+class TestCheetahBlockScanner(unittest.TestCase):
+    """
+    regression benchmark for sectional cheetah evaluation on the largest test wrappers. 
+    scan work is measured in ConstructTracker.update() calls (deterministic, unlike timings).
+    """
+
+    WRAPPERS = [
+        'hisat2-f4af63aaf57a/hisat2.xml',
+        'cutadapt-135b80fb1ac2/cutadapt.xml',
+        'multiqc-1c2db0054039/multiqc.xml',
+        'quast-675488238c96/quast.xml',
+    ]
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+
+    def _load_template(self, relpath: str) -> tuple[str, dict[str, Any]]:
+        filepath = os.path.abspath(f'{GALAXY_TESTTOOL_PATH}/{relpath}')
+        runtime.tool.tool_path = filepath
+        xmltool = load_xmltool_cached(filepath)
+        text = simplify_cmd(xmltool.raw_command, 'main_statement')
+        text = mark_main_statement(text, xmltool)
+        text = simplify_cmd(text, 'templating')
+        inputs = {param.name: 'value' for param in xmltool.inputs.list()}
+        return text, inputs
+
+    def test_same_blocks(self) -> None:
+        # identical to splitting all remaining lines into blocks & taking the first
+        for relpath in self.WRAPPERS:
+            text, _ = self._load_template(relpath)
+            lines = text.split('\n')
+            scanner = BlockScanner(lines)
+            for ptr in range(len(lines)):
+                try:
+                    expected = get_blocks(ptr=ptr, lines=lines[ptr:], indent_level=0)[0]
+                except IndexError:
+                    self.assertRaises(IndexError, scanner.next_block, ptr)
+                    continue
+                actual = scanner.next_block(ptr)
+                self.assertEqual((actual.btype, actual.start, actual.stop, actual.lines), (expected.btype, expected.start, expected.stop, expected.lines))
+
+    def test_linear_scan(self) -> None:
+        for relpath in self.WRAPPERS:
+            text, inputs = self._load_template(relpath)
+            num_lines = len(text.split('\n'))
+            with mock.patch.object(ConstructTracker, 'update', autospec=True, side_effect=ConstructTracker.update) as update:
+                sectional_evaluate(text, inputs)
+            # previously 6-27x num_lines (whole remainder re-scanned for each block)
+            self.assertLessEqual(update.call_count, num_lines * 3)
+
+
+class TestCheetahTemplateCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        compile_template.cache_clear()
+        self.conditional = [
+            '#if $mode == "fast"',
+            '--fast',
+            '#if $threads',
+            '--threads $threads',
+            '#end if',
+            '#else',
+            '--slow',
+            '#end if',
+        ]
+
+    def _evaluate(self, lines: list[str], inputs: dict[str, Any]) -> Optional[list[str]]:
+        block = CheetahBlock(BlockType.CONDITIONAL, 0, len(lines) - 1, list(lines))
+        block.evaluate(inputs)
+        return block.lines if block.evaluated else None
+
+    def test_compiled_once(self) -> None:
+        with mock.patch.object(Template, 'compile', wraps=Template.compile) as compile:
+            fast = self._evaluate(self.conditional, {'mode': 'fast', 'threads': 4})
+            slow = self._evaluate(self.conditional, {'mode': 'slow', 'threads': 4})
+        # masked child blocks have different uuids each time, but the same normalised source
+        self.assertEqual(compile.call_count, 1)
+        self.assertEqual(fast, ['', '--fast', '#if $threads', '--threads $threads', '#end if', '', '', ''])
+        self.assertEqual(slow, ['', '', '', '', '', '', '--slow', ''])
+
+    def test_failed_compile_cached(self) -> None:
+        lines = ['#if $mode == ', '--fast', '#end if']
+        with mock.patch.object(Template, 'compile', wraps=Template.compile) as compile:
+            self.assertIsNone(self._evaluate(lines, {'mode': 'fast'}))
+            self.assertIsNone(self._evaluate(lines, {'mode': 'slow'}))
+        self.assertEqual(compile.call_count, 1)
+
+    def test_failed_evaluation_not_cached(self) -> None:
+        # missing variable: depends on the inputs, not the source
+        lines = ['--threads $threads']
+        block = CheetahBlock(BlockType.INLINE, 0, 0, list(lines))
+        block.evaluate({})
+        self.assertFalse(block.evaluated)
+        block = CheetahBlock(BlockType.INLINE, 0, 0, list(lines))
+        block.evaluate({'threads': 4})
+        self.assertEqual(block.lines, ['--threads 4'])
+
+    def test_strategy_interface(self) -> None:
+        self.assertEqual(EvaluationStrategy.__abstractmethods__, {'prepare_template', 'handle_outcome'})
+
+
+class TestVanillaCommandCache(unittest.TestCase):
+
+    CUTADAPT_WF_FILEPATH = os.path.abspath(f'{GALAXY_TESTWF_PATH}/cutadapt_wf.ga')
+    LOADING = 'janis_core.ingestion.galaxy.gxtool.command.loading'
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        VANILLA_CACHE.clear()
+        self.xmltool = _load_xmltool_for_step(self.CUTADAPT_WF_FILEPATH, 2)
+
+    def _signature(self, command: Any) -> tuple[set[str], set[str], set[str]]:
+        return (
+            set(command.flags.keys()),
+            set(command.options.keys()),
+            set(x.name for x in command.positionals.values()),
+        )
+
+    def test_computed_once_per_xmltool(self) -> None:
+        with mock.patch(f'{self.LOADING}.mark_main_statement', wraps=mark_main_statement) as mark, \
+             mock.patch(f'{self.LOADING}.tokenise_text', wraps=tokenise_text) as tokenise:
+            first = gen_command(self.xmltool)
+            second = gen_command(self.xmltool)
+        self.assertEqual(mark.call_count, 1)
+        self.assertEqual(tokenise.call_count, 1)
+        self.assertEqual(self._signature(first), self._signature(second))
+
+    def test_matches_uncached(self) -> None:
+        cached = self._signature(gen_command(self.xmltool))
+        VANILLA_CACHE.clear()
+        uncached = self._signature(gen_command(self.xmltool))
+        self.assertEqual(cached, uncached)
+
+    def test_invalidated_on_change(self) -> None:
+        text = load_vanilla_command_str(self.xmltool)
+        self.xmltool.raw_command = self.xmltool.raw_command + '\n## trailing comment'
+        with mock.patch(f'{self.LOADING}.mark_main_statement', wraps=mark_main_statement) as mark:
+            load_vanilla_command_str(self.xmltool)
+        self.assertEqual(mark.call_count, 1)
+        self.assertIn('__JANIS_MAIN__', text)
+
+    def test_per_xmltool(self) -> None:
+        other = dataclasses.replace(self.xmltool)
+        load_vanilla_command_str(self.xmltool)
+        with mock.patch(f'{self.LOADING}.mark_main_statement', wraps=mark_main_statement) as mark:
+            load_vanilla_command_str(other)
+            load_vanilla_command_str(self.xmltool)
+        self.assertEqual(mark.call_count, 1)
+
+
+class TestCompiledPatterns(unittest.TestCase):
+    """
+    regression benchmark for regex use while annotating commands on the larger test wrappers.
+    work is measured in regex.compile() calls (deterministic, unlike timings).
+    """
+
+    WRAPPERS = [
+        'hisat2-f4af63aaf57a/hisat2.xml',
+        'cutadapt-135b80fb1ac2/cutadapt.xml',
+        'multiqc-1c2db0054039/multiqc.xml',
+        'quast-675488238c96/quast.xml',
+    ]
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+
+    def test_registry(self) -> None:
+        for name, value in vars(expressions.patterns).items():
+            if name.isupper():
+                self.assertIs(compile_pattern(value), REGISTRY[value])
+
+    def test_dynamic_patterns(self) -> None:
+        text = '--threads 4 -o out.txt'
+        self.assertEqual(expressions.get_next_word('--threads', ' ', text), '4')
+        self.assertEqual(expressions.get_preceeding_dashes('threads', text), ['--'])
+        self.assertIs(compile_pattern(r'\d+', regex.MULTILINE), compile_pattern(r'\d+', regex.MULTILINE))
+        self.assertIsNot(compile_pattern(r'\d+'), compile_pattern(r'\d+', regex.MULTILINE))
+    
+    def test_no_recompilation(self) -> None:
+        xmltools: list[XMLTool] = []
+        for relpath in self.WRAPPERS:
+            filepath = os.path.abspath(f'{GALAXY_TESTTOOL_PATH}/{relpath}')
+            runtime.tool.tool_path = filepath
+            xmltools.append(load_xmltool_cached(filepath))
+        
+        # warm up: dynamic (per param) patterns are compiled once
+        for xmltool in xmltools:
+            gen_command(xmltool)
+        
+        VANILLA_CACHE.clear()
+        analysis.index_appearences.cache_clear()
+        with mock.patch.object(regex, 'compile', wraps=regex.compile) as compile:
+            for xmltool in xmltools:
+                gen_command(xmltool)
+        self.assertEqual(compile.call_count, 0)
+
+
+class TestAppearenceIndex(unittest.TestCase):
+
+    WRAPPERS = [
+        'hisat2-f4af63aaf57a/hisat2.xml',
+        'cutadapt-135b80fb1ac2/cutadapt.xml',
+        'multiqc-1c2db0054039/multiqc.xml',
+        'limma_voom-d6f5fa4ee473/limma_voom.xml',
+    ]
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        VANILLA_CACHE.clear()
+        analysis.index_appearences.cache_clear()
+
+    def _load_xmltool(self, relpath: str) -> XMLTool:
+        filepath = os.path.abspath(f'{GALAXY_TESTTOOL_PATH}/{relpath}')
+        runtime.tool.tool_path = filepath
+        return load_xmltool_cached(filepath)
+
+    def _full_scan(self, cmdstr: str, name: str) -> list[tuple[int, str, str]]:
+        refs = analysis._get_multiline_appearences(cmdstr, name)
+        refs += analysis._get_inline_appearences(cmdstr, name, 0, len(cmdstr))
+        return [(r.start, r.text, r.rtype.name) for r in refs]
+
+    def test_same_as_full_scan(self) -> None:
+        for relpath in self.WRAPPERS:
+            xmltool = self._load_xmltool(relpath)
+            for text in [xmltool.raw_command, load_vanilla_main_statement(xmltool)]:
+                index = analysis.AppearenceIndex(text)
+                for param in xmltool.inputs.list():
+                    actual = [(r.start, r.text, r.rtype.name) for r in index.get(param)]
+                    self.assertEqual(actual, self._full_scan(index.cmdstr, param.name))
+
+    def test_filter(self) -> None:
+        index = analysis.AppearenceIndex('#if $flag:\n    -F\n#end if\nfoo --threads $threads $flag\n')
+        param = XMLBoolParam('flag')
+        multiline = index.get(param, filter_to=CmdstrReferenceType.MULTILINE_BOOL)
+        inline = index.get(param, filter_to=CmdstrReferenceType.INLINE_PLAIN_TEXT)
+        self.assertEqual([r.text for r in multiline], ['#if $flag:\n-F\n#end if'])
+        self.assertEqual([r.text for r in inline], ['foo --threads $threads $flag'])
+        self.assertEqual(len(index.get(param)), 3)
+        self.assertEqual(index.get(XMLBoolParam('missing')), [])
+
+    def test_single_pass(self) -> None:
+        # command is simplified & indexed once, then shared by each annotator
+        xmltool = self._load_xmltool(self.WRAPPERS[0])
+        with mock.patch.object(analysis, 'simplify_cmd', wraps=analysis.simplify_cmd) as simplify:
+            gen_command(xmltool)
+            gen_command(xmltool)
+        self.assertEqual(simplify.call_count, 1)
+
+
+class TestQuotedSections(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+
+    def test_is_quoted(self) -> None:
+        text = 'echo "a b" && cat \'c\' > out'
+        sections = expressions.get_quoted_sections(text)
+        quoted = [i for i in range(len(text)) if sections.is_quoted(i)]
+        self.assertEqual(quoted, list(range(5, 10)) + list(range(18, 21)))
+        self.assertFalse(sections.is_quoted(len(text)))
+
+    def test_overlaps(self) -> None:
+        sections = expressions.get_quoted_sections('ab "cd" ef')
+        self.assertFalse(sections.overlaps(0, 3))
+        self.assertTrue(sections.overlaps(0, 4))
+        self.assertTrue(sections.overlaps(4, 5))
+        self.assertTrue(sections.overlaps(6, 8))
+        self.assertFalse(sections.overlaps(7, 10))
+        self.assertFalse(sections.overlaps(4, 4))
+
+    def test_find_unquoted(self) -> None:
+        self.assertEqual(expressions.find_unquoted('echo "## x" ## comment', '##'), (12, 14))
+        self.assertEqual(expressions.find_unquoted("echo '## x'", '##'), (-1, -1))
+        self.assertEqual(expressions.find_unquoted('## comment', '##'), (0, 2))
+
+    def test_reused(self) -> None:
+        text = 'echo "a b"'
+        self.assertIs(expressions.get_quoted_sections(text), expressions.get_quoted_sections(text))
+
+
 class TestMarkMainStatement(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -1142,7 +2206,62 @@ class TestDatatypeInference(unittest.TestCase):
         self.assertEqual(dtype.classname, 'TextFile')
     
     def test_workflow_input(self) -> None:
-        self.assertEqual(datatypes.get(MOCK_WORKFLOW_INPUT1), file_t)
+        dtype = datatypes.get(MOCK_WORKFLOW_INPUT1)
+        self.assertEqual(dtype.classname, 'Fasta')
+
+
+class TestDatatypeRegister(unittest.TestCase):
+    """
+    tests loading of the datatype register (janis_types.yaml / janis_types.pickle)
+    """
+    def setUp(self) -> None:
+        _reset_global_settings()
+        self.tmpdir = tempfile.mkdtemp()
+        self.yaml_path = os.path.join(self.tmpdir, 'janis_types.yaml')
+        self.compiled_path = os.path.join(self.tmpdir, 'janis_types.pickle')
+        shutil.copy(settings.ingest.galaxy.DATATYPES_YAML, self.yaml_path)
+        self.patches = [
+            mock.patch('janis_core.ingestion.galaxy.datatypes.register.DATATYPES_YAML', self.yaml_path),
+            mock.patch('janis_core.ingestion.galaxy.datatypes.register.DATATYPES_COMPILED', self.compiled_path),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self) -> None:
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def test_populate_once(self) -> None:
+        register = DatatypeRegister()
+        register.populate()
+        fastq = register.get_from_format('fastqsanger')
+        register.populate()
+        self.assertIs(register.get_from_format('fastqsanger'), fastq)
+    
+    def test_lazy(self) -> None:
+        register = DatatypeRegister()
+        dtype = register.get_from_format('fastqsanger')
+        self.assertIsNotNone(dtype)
+        self.assertTrue(register.populated)
+
+    def test_compiled_matches_yaml(self) -> None:
+        self.assertFalse(os.path.exists(self.compiled_path))
+        from_yaml = load_datatypes()
+        self.assertTrue(os.path.exists(self.compiled_path))
+        from_compiled = load_datatypes()
+        self.assertEqual(from_yaml, from_compiled)
+    
+    def test_compiled_stale(self) -> None:
+        load_datatypes()
+        with open(self.yaml_path, 'a') as fp:
+            fp.write('\n  - format: janis_test_format\n')
+            fp.write('    source: janis\n')
+            fp.write('    classname: File\n')
+            fp.write('    extensions: \n')
+            fp.write('    import_path: janis_core.types.common_data_types\n')
+        types = load_datatypes()
+        self.assertEqual(types[-1]['format'], 'janis_test_format')
 
 
 class TestFromGalaxy(unittest.TestCase):
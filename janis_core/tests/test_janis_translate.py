@@ -8,10 +8,21 @@ from janis_core import settings
 from janis_core.messages import gather_uuids
 from janis_core.messages import configure_logging
 from janis_core.messages import log_message
+from janis_core.messages import load_loglines
+from janis_core.messages import flush_messages
+from janis_core.messages import temporary_message_log
+from janis_core.messages.main import MESSAGE_LOG_PATH
 from janis_core.messages import FormatCategory
 from janis_core.messages import ErrorCategory
+from janis_core.messages.inject import StepCallIndex
+from janis_core.messages.inject import _insert_all
 from janis_core.ingestion import ingest
 from janis_core.translations import translate
+from janis_core.translations import translate_many
+from janis_core.translations.batch import read_manifest
+from janis_core.translations.batch import build_jobs
+from janis_core.cli import parse_args
+from janis_core.cli import interpret_args
 from janis_core.tests.testtools import EchoTestTool
 from janis_core.tests.testtools import FileOutputPythonTestTool
 from janis_core.tests.testtools import GridssTestTool
@@ -41,6 +52,8 @@ from janis_core.translations.common import wrap_tool_in_workflow
 from janis_core import settings
 
 import os 
+import shutil
+import tempfile
 import regex as re
 import yaml
 
@@ -259,6 +272,57 @@ class TestTranslationEndpoints(unittest.TestCase):
 
 
 
+class TestBatchTranslation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.infiles = [
+            f'{CWL_TESTDATA_PATH}/tools/BWA-Index.cwl',
+            f'{CWL_TESTDATA_PATH}/tools/BWA-Mem.cwl',
+            f'{CWL_TESTDATA_PATH}/tools/missing.cwl',
+            f'{CWL_TESTDATA_PATH}/tools/BWA-Index.cwl',
+        ]
+
+    def test_read_manifest(self) -> None:
+        manifest = os.path.join(self.tmpdir, 'manifest.txt')
+        with open(manifest, 'w') as fp:
+            fp.write('# tools\nBWA-Index.cwl\n\n/data/BWA-Mem.cwl  # comment\n')
+        infiles = read_manifest(manifest)
+        self.assertEqual(infiles, [f'{self.tmpdir}/BWA-Index.cwl', '/data/BWA-Mem.cwl'])
+
+    def test_build_jobs(self) -> None:
+        jobs = build_jobs(self.infiles, 'cwl', 'nextflow', self.tmpdir)
+        names = [os.path.basename(job.export_path) for job in jobs]
+        self.assertEqual(names, ['BWA-Index', 'BWA-Mem', 'missing', 'BWA-Index_2'])
+
+    def test_translate_many(self) -> None:
+        jobs = build_jobs(self.infiles, 'cwl', 'nextflow', self.tmpdir)
+        settings.translate.MODE = 'skeleton'
+        dest, export_path = settings.translate.DEST, settings.translate.EXPORT_PATH
+        results = translate_many(jobs, workers=2)
+        self.assertEqual([r.job for r in results], jobs)
+        self.assertEqual([r.success for r in results], [True, True, False, True])
+        self.assertIn('FileNotFoundError', results[2].error)
+        self.assertTrue(os.path.exists(f'{self.tmpdir}/BWA-Index/bwa_index.nf'))
+        self.assertTrue(os.path.exists(f'{self.tmpdir}/BWA-Mem/bwa_mem.nf'))
+        self.assertTrue(os.path.exists(f'{self.tmpdir}/BWA-Index_2/bwa_index.nf'))
+        # jobs run in their own process: settings here are unchanged
+        self.assertEqual(settings.translate.MODE, 'skeleton')
+        self.assertEqual(settings.translate.DEST, dest)
+        self.assertEqual(settings.translate.EXPORT_PATH, export_path)
+
+    def test_cli_args(self) -> None:
+        args = interpret_args(parse_args(['--batch', 'manifest.txt', '-j', '4', '--from', 'cwl', '--to', 'nextflow']))
+        self.assertEqual(args['batch'], 'manifest.txt')
+        self.assertEqual(args['jobs'], 4)
+        self.assertIsNone(args['infile'])
+        with self.assertRaises(SystemExit):
+            parse_args(['--from', 'cwl', '--to', 'nextflow'])
+
+
+
 ### ----- MESSAGES ----- ###
 
 class TestMessageModule(unittest.TestCase):
@@ -299,6 +363,24 @@ class TestMessageModule(unittest.TestCase):
         self.assertEqual(uuid_map[wstep.sources['contaminants'].uuid], FormatCategory.STEP)
         self.assertEqual(uuid_map[wstep.sources['contaminants'].source_map[0].uuid], FormatCategory.STEP)
         self.assertEqual(uuid_map[wout.uuid], FormatCategory.OUTPUT)
+
+    def test_temporary_message_log(self) -> None:
+        log_message(None, 'hello', ErrorCategory.METADATA)
+        with temporary_message_log():
+            pass
+        self.assertEqual([line.message for line in load_loglines()], ['hello'])
+
+    def test_temporary_message_log_used(self) -> None:
+        log_message(None, 'before', ErrorCategory.METADATA)
+        with temporary_message_log():
+            self.assertEqual(load_loglines(), [])
+            log_message(None, 'inside', ErrorCategory.METADATA)
+            self.assertEqual([line.message for line in load_loglines()], ['inside'])
+        # buffered messages from before the block are kept
+        self.assertEqual([line.message for line in load_loglines()], ['before'])
+        flush_messages()
+        with open(MESSAGE_LOG_PATH, 'r') as fp:
+            self.assertIn('before', fp.read())
         
 
 class TestMessageInjection(unittest.TestCase):
@@ -546,6 +628,48 @@ class TestMessageInjection(unittest.TestCase):
 
 
     
+class TestStepCallIndex(unittest.TestCase):
+
+    NXF_WORKFLOW = '\n'.join([
+        'workflow {',
+        '',
+        '    FASTQC_1(',
+        '        ch_reads',
+        '    )',
+        '',
+        '    FASTQC_2(',
+        '        ch_reads',
+        '    )',
+        '',
+        '    TRIM(',
+        '        FASTQC_1.out.html',
+        '    )',
+        '',
+        '}',
+    ])
+
+    def setUp(self) -> None:
+        _reset_global_settings()
+        settings.translate.DEST = 'nextflow'
+
+    def test_exact(self) -> None:
+        calls = StepCallIndex(self.NXF_WORKFLOW)
+        self.assertEqual(calls.locate('fastqc_2'), self.NXF_WORKFLOW.index('    FASTQC_2('))
+        self.assertEqual(calls.locate('fastqc1'), self.NXF_WORKFLOW.index('    FASTQC_1('))
+        self.assertEqual(calls.locate('trim'), self.NXF_WORKFLOW.index('    TRIM('))
+
+    def test_fuzzy(self) -> None:
+        # no exact symbol: closest call
+        calls = StepCallIndex(self.NXF_WORKFLOW)
+        self.assertEqual(calls.locate('trimmer'), self.NXF_WORKFLOW.index('    TRIM('))
+    
+    def test_insert_all(self) -> None:
+        text = 'aaa\nbbb\nccc\n'
+        insertions = [(8, '# 3\n'), (4, '# 1\n'), (4, '# 2\n')]
+        self.assertEqual(_insert_all(text, insertions), 'aaa\n# 1\n# 2\nbbb\n# 3\nccc\n')
+        self.assertEqual(_insert_all(text, []), text)
+
+
 class TestMessageLoggingCWL(unittest.TestCase):
     
     def setUp(self) -> None:
@@ -1,5 +1,17 @@
+import os
+import random
+import shutil
+import tempfile
 from unittest import TestCase
+from unittest import mock
 from janis_core.utils.logger import Logger, LogLevel, _bcolors
+from janis_core.messages import main as messages_main
+from janis_core.messages import ErrorCategory
+from janis_core.messages import LogFile
+from janis_core.messages import MessageStore
+from janis_core.messages import log_message
+from janis_core.messages import load_loglines
+from janis_core.messages import flush_messages
 
 
 class TestLogLevel(TestCase):
@@ -45,3 +57,81 @@ class TestLogger(TestCase):
 
     def test_set_console_level(self):
         Logger.set_console_level(LogLevel.DEBUG)
+
+
+class TestMessageStore(TestCase):
+
+    def setUp(self):
+        flush_messages()
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'messages.log')
+        patcher = mock.patch.object(messages_main, 'MESSAGE_LOG_PATH', self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        messages_main._STORE = None
+        self.addCleanup(setattr, messages_main, '_STORE', None)
+
+    def _file_lines(self):
+        if not os.path.exists(self.path):
+            return []
+        return LogFile(self.path).lines
+
+    def test_deduplicated(self):
+        log_message('step1', 'bad datatype', ErrorCategory.DATATYPES)
+        log_message('step1', 'bad datatype', ErrorCategory.DATATYPES)
+        log_message('step2', 'bad datatype', ErrorCategory.DATATYPES)
+        log_message('step1', 'bad datatype', ErrorCategory.PLUMBING)
+        self.assertEqual(len(load_loglines()), 3)
+
+    def test_query(self):
+        log_message('step1', 'msg1', ErrorCategory.DATATYPES)
+        log_message('step2', 'msg2', ErrorCategory.SCRIPTING)
+        log_message('step1', 'msg3', ErrorCategory.SCRIPTING)
+        log_message(None, 'msg4', ErrorCategory.SCRIPTING)
+        msgs = lambda lines: [x.message for x in lines]
+        self.assertEqual(msgs(load_loglines(entity_uuids={'step1'})), ['msg1', 'msg3'])
+        self.assertEqual(msgs(load_loglines(entity_uuids={'step2', 'step1'})), ['msg1', 'msg2', 'msg3'])
+        self.assertEqual(msgs(load_loglines(category=ErrorCategory.SCRIPTING)), ['msg2', 'msg3', 'msg4'])
+        self.assertEqual(msgs(load_loglines(category=ErrorCategory.SCRIPTING, entity_uuids={'step1'})), ['msg3'])
+        self.assertEqual(msgs(load_loglines(entity_uuids={'general'})), ['msg4'])
+        self.assertEqual(msgs(load_loglines(entity_uuids={'step3'})), [])
+
+    def test_buffered(self):
+        log_message('step1', 'multi\nline', ErrorCategory.DATATYPES)
+        self.assertEqual(self._file_lines(), [])
+        flush_messages()
+        self.assertEqual(self._file_lines(), load_loglines())
+        self.assertEqual(load_loglines()[0].message, 'multiline')
+
+    def test_batch_flush(self):
+        size = MessageStore.FLUSH_SIZE
+        for i in range(size + 1):
+            log_message('step1', f'msg{i}', ErrorCategory.DATATYPES)
+        self.assertEqual(len(self._file_lines()), size)
+        flush_messages()
+        self.assertEqual(len(self._file_lines()), size + 1)
+
+    def test_loads_existing(self):
+        log_message('step1', 'msg1', ErrorCategory.DATATYPES)
+        flush_messages()
+        messages_main._STORE = None
+        log_message('step1', 'msg1', ErrorCategory.DATATYPES)
+        log_message('step1', 'msg2', ErrorCategory.DATATYPES)
+        flush_messages()
+        self.assertEqual([x.message for x in self._file_lines()], ['msg1', 'msg2'])
+
+    def test_query_matches_filter(self):
+        # indexed lookups give the same lines (and order) as filtering all loglines
+        rng = random.Random(0)
+        uuids = [f'uuid{i}' for i in range(10)] + [None]
+        for i in range(500):
+            log_message(rng.choice(uuids), f'msg{rng.randrange(100)}', rng.choice(list(ErrorCategory)))
+        loglines = load_loglines()
+        for i in range(100):
+            query = set(rng.sample(uuids[:-1] + ['general'], rng.randrange(1, 5)))
+            category = rng.choice(list(ErrorCategory))
+            expected = [x for x in loglines if x.category == category and x.entity_uuid in query]
+            self.assertEqual(load_loglines(category=category, entity_uuids=query), expected)
+            expected = [x for x in loglines if x.entity_uuid in query]
+            self.assertEqual(load_loglines(entity_uuids=query), expected)
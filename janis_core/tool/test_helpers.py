@@ -7,7 +7,7 @@ collections.Mapping = collections.abc.Mapping
 
 from tabulate import tabulate
 from pkg_resources import parse_version
-from nose.tools import nottest
+from janis_core.utils import nottest
 
 
 
@@ -21,7 +21,7 @@ from janis_core.tool.test_classes import (
     TTestExpectedOutput,
     TTestPreprocessor,
 )
-from nose.tools import nottest
+from janis_core.utils import nottest
 
 class ToolType(Enum):
     Workflow = "workflow"
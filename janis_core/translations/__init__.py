@@ -1,12 +1,26 @@
 
 
 from . import common
-from .wdl import WdlTranslator
-from .cwl import CwlTranslator
-from .nextflow import NextflowTranslator
 from .translationbase import TranslatorBase
 
 from .main import translate
 from .main import get_translator
 from .main import build_resources_input
-from .main import build_resources_file
\ No newline at end of file
+from .main import build_resources_file
+from .batch import translate_many
+from .batch import BatchJob
+from .batch import BatchResult
+
+# translators are loaded on first access (each pulls in its own serialiser, eg cwl_utils)
+_TRANSLATORS = {
+    'WdlTranslator': '.wdl',
+    'CwlTranslator': '.cwl',
+    'NextflowTranslator': '.nextflow',
+}
+
+def __getattr__(name: str):
+    if name in _TRANSLATORS:
+        import importlib
+        module = importlib.import_module(_TRANSLATORS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
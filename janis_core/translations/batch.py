@@ -0,0 +1,108 @@
+
+
+import os
+import traceback
+from dataclasses import dataclass
+from typing import Optional
+
+from janis_core.utils import get_mp_context
+
+"""
+Batch translation: ingest & translate many files in a pool of worker processes.
+
+Ingest & translate change settings (settings.ingest.*, settings.translate.*) and other
+module state, and share the message log, so one process can't run them concurrently
+(or reliably one after another).
+Each job therefore runs in its own worker process, forked from this one: it starts
+with the settings of this process, logs messages to its own temporary file, and anything
+it changes is discarded with the process.
+"""
+
+
+@dataclass
+class BatchJob:
+    infile: str
+    src: str                        # ingest format (SupportedIngestion)
+    dest: str                       # translate format (SupportedTranslation)
+    export_path: str                # folder this job's translation is written to
+    mode: Optional[str] = None
+    as_workflow: bool = False
+
+
+@dataclass
+class BatchResult:
+    job: BatchJob
+    error: Optional[str] = None     # traceback if the job failed
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def read_manifest(path: str) -> list[str]:
+    """
+    input files listed in a manifest file, one per line.
+    blank lines and '#' comments are ignored. relative paths are relative to the manifest.
+    """
+    manifest_dir = os.path.dirname(os.path.abspath(path))
+    infiles: list[str] = []
+    with open(path, 'r') as fp:
+        for line in fp:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                infiles.append(os.path.join(manifest_dir, line))
+    return infiles
+
+def build_jobs(
+    infiles: list[str],
+    src: str,
+    dest: str,
+    outdir: str,
+    mode: Optional[str]=None,
+    as_workflow: bool=False
+    ) -> list[BatchJob]:
+    """one job per infile, each exported to its own folder in outdir (named after the infile)"""
+    jobs: list[BatchJob] = []
+    seen: dict[str, int] = {}
+    for infile in infiles:
+        name = os.path.splitext(os.path.basename(infile.rstrip('/')))[0]
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f'{name}_{seen[name]}'
+        export_path = os.path.join(outdir, name)
+        jobs.append(BatchJob(infile, src, dest, export_path, mode=mode, as_workflow=as_workflow))
+    return jobs
+
+def translate_many(jobs: list[BatchJob], workers: Optional[int]=None) -> list[BatchResult]:
+    """
+    runs each job (ingest, then translate to job.export_path) in a pool of worker processes.
+    a failed job doesn't stop the others: see BatchResult.error.
+    returns results in the same order as jobs.
+    """
+    if not jobs:
+        return []
+    _preload(jobs)
+    # maxtasksperchild=1: each job gets a fresh process
+    with get_mp_context().Pool(processes=workers, maxtasksperchild=1) as pool:
+        return pool.map(_run_job, jobs, chunksize=1)
+
+def _run_job(job: BatchJob) -> BatchResult:
+    from janis_core.ingestion import ingest
+    from janis_core.messages import temporary_message_log
+    from .main import translate
+    try:
+        with temporary_message_log():
+            internal = ingest(job.infile, job.src)
+            translate(internal, dest_fmt=job.dest, mode=job.mode, export_path=job.export_path, as_workflow=job.as_workflow)
+    except Exception:
+        return BatchResult(job, error=traceback.format_exc())
+    return BatchResult(job)
+
+def _preload(jobs: list[BatchJob]) -> None:
+    # import ingestors & translators once here, rather than in every (forked) worker
+    from janis_core.ingestion.main import preload_ingestor
+    from .main import get_translator
+    for src in set(job.src for job in jobs):
+        preload_ingestor(src)
+    for dest in set(job.dest for job in jobs):
+        get_translator(dest)
@@ -7,6 +7,7 @@ from janis_core import settings
 from janis_core import CodeTool, CommandToolBuilder, WorkflowBase, WorkflowBuilder
 from janis_core import Tool
 from janis_core.utils import lowercase_dictkeys
+from janis_core.messages import flush_messages
 from janis_core.translation_deps.supportedtranslations import SupportedTranslation
 from janis_core.translations.common import to_builders
 from janis_core.translations.common import prune_workflow
@@ -113,15 +114,19 @@ def translate(
     translator = get_translator(dest_fmt)
 
     # do translation 
-    if isinstance(entity, WorkflowBuilder):
-        return translator.translate_workflow(entity)
-    elif isinstance(entity, CommandToolBuilder):
-        return translator.translate_tool(entity)
-    elif isinstance(entity, CodeTool):
-        return translator.translate_code_tool(entity)
-    else:
-        name = entity.__name__ if isclass(entity) else entity.__class__.__name__
-        raise Exception("Unsupported tool type: " + name)
+    try:
+        if isinstance(entity, WorkflowBuilder):
+            return translator.translate_workflow(entity)
+        elif isinstance(entity, CommandToolBuilder):
+            return translator.translate_tool(entity)
+        elif isinstance(entity, CodeTool):
+            return translator.translate_code_tool(entity)
+        else:
+            name = entity.__name__ if isclass(entity) else entity.__class__.__name__
+            raise Exception("Unsupported tool type: " + name)
+    finally:
+        # messages are buffered during ingest / translate
+        flush_messages()
 
 def get_translator(translation: str | SupportedTranslation) -> TranslatorBase:
     if not isinstance(translation, SupportedTranslation):
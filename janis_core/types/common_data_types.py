@@ -4,9 +4,8 @@
 import operator
 import os.path
 from inspect import isclass
-from typing import Dict, Any, Set, List, Optional
+from typing import Dict, Any, Set, List, Optional, TYPE_CHECKING
 
-import cwl_utils.parser.cwl_v1_2 as cwlgen
 import wdlgen
 from janis_core.tool.test_classes import TTestExpectedOutput, TTestPreprocessor
 
@@ -15,6 +14,9 @@ from janis_core.__meta__ import GITHUB_URL
 from janis_core.types.data_types import DataType, NativeTypes, NativeType, ParseableType
 from janis_core.utils.generics_util import is_generic, is_qualified_generic
 
+if TYPE_CHECKING:
+    import cwl_utils.parser.cwl_v1_2 as cwlgen
+
 
 class UnionType(DataType):
     def __init__(self, *subtypes: ParseableType, optional=False):
@@ -266,7 +268,7 @@ concerned what the filename should be. The Filename DataType should NOT be used
     def schema(cls) -> Dict:
         pass
 
-    def map_cwl_type(self, parameter: cwlgen.Parameter):
+    def map_cwl_type(self, parameter: "cwlgen.Parameter"):
         super().map_cwl_type(parameter)
         parameter.default = self.generated_filenamecwl()
 
@@ -657,6 +659,7 @@ class Array(DataType):
         return {"type": "array"}
 
     def cwl_type(self, has_default=False):
+        import cwl_utils.parser.cwl_v1_2 as cwlgen
         inp = cwlgen.CommandInputArraySchema(
             items=self._t.cwl_type(),
             type="array"
@@ -665,7 +668,8 @@ class Array(DataType):
         )
         return [inp, "null"] if self.optional and not has_default else inp
 
-    def map_cwl_type(self, parameter: cwlgen.Parameter) -> cwlgen.Parameter:
+    def map_cwl_type(self, parameter: "cwlgen.Parameter") -> "cwlgen.Parameter":
+        import cwl_utils.parser.cwl_v1_2 as cwlgen
         parameter.type = cwlgen.CommandInputArraySchema(items=None, type="array")
         return parameter
 
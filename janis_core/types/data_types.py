@@ -12,12 +12,15 @@
 
 """
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Union, Type
+from typing import Any, List, Optional, Union, Type, TYPE_CHECKING
 
-import cwl_utils.parser.cwl_v1_2 as cwlgen
 import wdlgen
 from janis_core.utils.logger import Logger
 
+if TYPE_CHECKING:
+    # cwl_utils is slow to import: only needed when translating to / from CWL
+    import cwl_utils.parser.cwl_v1_2 as cwlgen
+
 NativeType = str
 PythonPrimitive = Union[str, float, int, bool]
 
@@ -275,13 +278,13 @@ class DataType(ABC):
 
     def cwl_type(
         self, has_default=False
-    ) -> Union[str, cwlgen.Type, List[Union[str, cwlgen.Type]]]:
+    ) -> Union[str, "cwlgen.Type", List[Union[str, "cwlgen.Type"]]]:
         tp = NativeTypes.map_to_cwl(self.primitive())
         return (
             [tp, "null"] if self.optional and not has_default else tp
         )  # and not has_default
 
-    def map_cwl_type(self, parameter: cwlgen.Parameter) -> cwlgen.Parameter:
+    def map_cwl_type(self, parameter: "cwlgen.Parameter") -> "cwlgen.Parameter":
         if not NativeTypes.is_valid(self.primitive()):
             raise Exception(
                 f"{self.id()} must declare its primitive as one of the NativeTypes "
@@ -16,6 +16,21 @@ def first_value(d: Dict[Any, T]) -> T:
     return next(iter(d.values()))
 
 
+def nottest(func):
+    # same as nose.tools.nottest, without importing nose (slow: loads pkg_resources)
+    func.__test__ = False
+    return func
+
+
+def get_mp_context():
+    # worker processes are forked where available: much cheaper than spawn (no re-import),
+    # and workers inherit the parent's settings & already imported modules
+    import multiprocessing
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
 def get_value_for_hints_and_ordered_resource_tuple(
     hints: Dict[str, Any], tuples: List[Tuple[str, Dict[str, int]]]
 ):
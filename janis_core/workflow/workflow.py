@@ -196,6 +196,10 @@ class StepNode(Node):
         if item in self.__dict__:
             return self.__dict__[item]
 
+        if item.startswith("__"):
+            # protocol lookups (eg copy.deepcopy) aren't step identifiers
+            raise AttributeError(item)
+
         return self.get_item(item)
 
     def __getitem__(self, item) -> StepOutputSelector: